@@ -0,0 +1,20 @@
+from django.contrib import admin
+
+from .models import AuthorActivity
+
+
+class AuthorActivityAdmin(admin.ModelAdmin):
+    list_display = (
+        "author",
+        "period",
+        "start",
+        "posts",
+        "comments",
+        "followers",
+    )
+    list_filter = ("period",)
+    search_fields = ("author__username",)
+    empty_value_display = "-пусто-"
+
+
+admin.site.register(AuthorActivity, AuthorActivityAdmin)
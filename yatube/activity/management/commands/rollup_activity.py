@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from activity.rollups import update_rollups
+
+
+class Command(BaseCommand):
+    help = "Дополняет сводки активности авторов (запускать по cron)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch", type=int, default=10000,
+            help="Сколько событий учитывать за одну транзакцию.",
+        )
+
+    def handle(self, *args, **options):
+        counts = update_rollups(options["batch"])
+        self.stdout.write(
+            "Учтено постов: {posts}, комментариев: {comments}, "
+            "подписок: {followers}".format(**counts)
+        )
@@ -0,0 +1,38 @@
+# Generated by Django 2.2.16 on 2026-10-19 08:33
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuthorActivity',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.CharField(choices=[('hour', 'Час'), ('day', 'День')], max_length=4, verbose_name='Период')),
+                ('start', models.DateTimeField(verbose_name='Начало периода')),
+                ('posts', models.PositiveIntegerField(default=0, verbose_name='Постов')),
+                ('comments', models.PositiveIntegerField(default=0, verbose_name='Получено комментариев')),
+                ('followers', models.PositiveIntegerField(default=0, verbose_name='Новых подписчиков')),
+                ('author', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='activity', to=settings.AUTH_USER_MODEL, verbose_name='Автор')),
+            ],
+            options={
+                'verbose_name': 'Активность автора',
+                'verbose_name_plural': 'Активность авторов',
+                'ordering': ['author', 'period', '-start'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='authoractivity',
+            constraint=models.UniqueConstraint(fields=('author', 'period', 'start'), name='unique_author_activity'),
+        ),
+    ]
@@ -0,0 +1,45 @@
+from django.contrib.auth import get_user_model
+from django.db import models
+
+User = get_user_model()
+
+
+class AuthorActivity(models.Model):
+    """Счетчики событий автора за час или за день.
+
+    Строки дополняются командой rollup_activity по новым постам,
+    комментариям и подпискам; страница статистики читает только их.
+    """
+
+    HOUR = "hour"
+    DAY = "day"
+    PERIOD_CHOICES = (
+        (HOUR, "Час"),
+        (DAY, "День"),
+    )
+
+    author = models.ForeignKey(
+        User,
+        related_name="activity",
+        on_delete=models.CASCADE,
+        verbose_name='Автор',
+    )
+    period = models.CharField('Период', max_length=4, choices=PERIOD_CHOICES)
+    start = models.DateTimeField('Начало периода')
+    posts = models.PositiveIntegerField('Постов', default=0)
+    comments = models.PositiveIntegerField('Получено комментариев', default=0)
+    followers = models.PositiveIntegerField('Новых подписчиков', default=0)
+
+    class Meta:
+        ordering = ["author", "period", "-start"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["author", "period", "start"],
+                name="unique_author_activity"
+            ),
+        ]
+        verbose_name = 'Активность автора'
+        verbose_name_plural = 'Активность авторов'
+
+    def __str__(self):
+        return f"{self.author_id} {self.period} {self.start:%Y-%m-%d %H:%M}"
@@ -0,0 +1,100 @@
+"""Инкрементальные сводки активности авторов.
+
+Команда rollup_activity читает только посты, комментарии и подписки новее
+своих курсоров, группирует их в базе по автору и часу (дню) и прибавляет
+к счетчикам AuthorActivity. Удаленные посты и отписки счетчики не
+уменьшают: сводки считают события, а не текущее состояние. Подписки без
+даты (оформленные до появления Follow.created) не учитываются вовсе.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+from django.db.models.functions import TruncDay, TruncHour
+from django.utils import timezone
+
+from core.models import Cursor
+from posts.models import Comment, Follow, Post
+from .models import AuthorActivity
+
+# Счетчик: (модель события, путь к автору, поле времени события)
+SOURCES = {
+    "posts": (Post, "author", "pub_date"),
+    "comments": (Comment, "post__author", "created"),
+    "followers": (Follow, "author", "created"),
+}
+PERIODS = {
+    AuthorActivity.HOUR: TruncHour,
+    AuthorActivity.DAY: TruncDay,
+}
+
+
+def add(author_id, period, start, counter, count):
+    rows = AuthorActivity.objects.filter(
+        author_id=author_id, period=period, start=start
+    )
+    if rows.update(**{counter: F(counter) + count}):
+        return
+    try:
+        with transaction.atomic():
+            AuthorActivity.objects.create(
+                author_id=author_id, period=period, start=start,
+                **{counter: count}
+            )
+    except IntegrityError:
+        rows.update(**{counter: F(counter) + count})
+
+
+def roll_up(counter, batch):
+    """Учитывает до batch новых событий. Возвращает их число."""
+    model, author, moment = SOURCES[counter]
+    with transaction.atomic():
+        cursor = Cursor.acquire(f"activity:{counter}")
+        ids = list(
+            model.objects.filter(pk__gt=cursor.position)
+            .order_by("pk")
+            .values_list("pk", flat=True)[:batch]
+        )
+        if not ids:
+            return 0
+        events = model.objects.filter(
+            pk__gt=cursor.position,
+            pk__lte=ids[-1],
+            **{f"{author}__isnull": False, f"{moment}__isnull": False},
+        )
+        for period, truncate in PERIODS.items():
+            rows = (
+                events.annotate(period_start=truncate(moment))
+                .values(author, "period_start")
+                .annotate(count=Count("pk"))
+                .order_by()
+            )
+            for row in rows:
+                add(row[author], period, row["period_start"], counter,
+                    row["count"])
+        cursor.position = ids[-1]
+        cursor.save(update_fields=["position"])
+    return len(ids)
+
+
+def update_rollups(batch=10000):
+    """Учитывает все новые события и удаляет устаревшие часовые сводки.
+
+    Возвращает словарь: счетчик -> число учтенных событий.
+    """
+    counts = {}
+    for counter in SOURCES:
+        counts[counter] = 0
+        while True:
+            done = roll_up(counter, batch)
+            if not done:
+                break
+            counts[counter] += done
+    expired = timezone.now() - timedelta(
+        days=settings.ACTIVITY_HOURLY_RETENTION_DAYS
+    )
+    AuthorActivity.objects.filter(
+        period=AuthorActivity.HOUR, start__lt=expired
+    ).delete()
+    return counts
@@ -0,0 +1,95 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from posts.models import Comment, Follow, Post
+from ..models import AuthorActivity
+from ..rollups import update_rollups
+
+User = get_user_model()
+
+
+class RollupTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='author')
+        cls.reader = User.objects.create_user(username='reader')
+
+    def publish(self, moment):
+        post = Post.objects.create(author=self.author, text='Пост')
+        Post.objects.filter(pk=post.pk).update(pub_date=moment)
+        return post
+
+    def day(self):
+        return AuthorActivity.objects.get(
+            author=self.author, period=AuthorActivity.DAY
+        )
+
+    def test_events_grouped_by_hour_and_day(self):
+        """События одного часа попадают в одну часовую строку."""
+        morning = (timezone.now() - timedelta(days=1)).replace(
+            hour=9, minute=15, second=0, microsecond=0
+        )
+        self.publish(morning)
+        self.publish(morning + timedelta(minutes=30))
+        self.publish(morning + timedelta(hours=2))
+        update_rollups()
+        hours = AuthorActivity.objects.filter(period=AuthorActivity.HOUR)
+        self.assertEqual(
+            list(hours.order_by('start').values_list('start', 'posts')),
+            [(morning.replace(minute=0), 2),
+             (morning.replace(hour=11, minute=0), 1)],
+        )
+        self.assertEqual(self.day().posts, 3)
+
+    def test_incremental_update(self):
+        """Повторный запуск добавляет только новые события."""
+        post = self.publish(timezone.now())
+        Comment.objects.create(post=post, author=self.reader, text='!')
+        Follow.objects.create(user=self.reader, author=self.author)
+        self.assertEqual(
+            update_rollups(), {'posts': 1, 'comments': 1, 'followers': 1}
+        )
+        Comment.objects.create(post=post, author=self.reader, text='!')
+        self.assertEqual(
+            update_rollups(), {'posts': 0, 'comments': 1, 'followers': 0}
+        )
+        day = self.day()
+        self.assertEqual((day.posts, day.comments, day.followers), (1, 2, 1))
+
+    def test_follows_without_date_not_counted(self):
+        """Подписки, оформленные до появления даты подписки, не считаются
+        новыми подписчиками в день запуска сводок."""
+        old = Follow.objects.create(user=self.reader, author=self.author)
+        Follow.objects.filter(pk=old.pk).update(created=None)
+        other = User.objects.create_user(username='other')
+        Follow.objects.create(user=other, author=self.author)
+        self.assertEqual(update_rollups()['followers'], 2)
+        self.assertEqual(self.day().followers, 1)
+
+    def test_old_hourly_rollups_expire(self):
+        """Часовые сводки старше срока хранения удаляются, дневные нет."""
+        self.publish(timezone.now() - timedelta(days=30))
+        update_rollups()
+        self.assertFalse(
+            AuthorActivity.objects.filter(period=AuthorActivity.HOUR).exists()
+        )
+        self.assertEqual(self.day().posts, 1)
+
+    def test_stats_page_reads_rollups(self):
+        """Страница статистики доступна только автору."""
+        self.publish(timezone.now())
+        update_rollups()
+        url = reverse('activity:author_stats', args=('author',))
+        self.client.force_login(self.reader)
+        self.assertRedirects(
+            self.client.get(url), reverse('posts:profile', args=('author',))
+        )
+        self.client.force_login(self.author)
+        response = self.client.get(url)
+        self.assertEqual(response.context['totals']['posts'], 1)
+        self.assertEqual(len(response.context['hours']), 1)
@@ -0,0 +1,13 @@
+from django.urls import path
+
+from . import views
+
+app_name = "activity"
+
+urlpatterns = [
+    path(
+        "profile/<str:username>/stats/",
+        views.author_stats,
+        name="author_stats",
+    ),
+]
@@ -0,0 +1,44 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.decorators import login_required
+from django.db.models import Sum
+from django.shortcuts import get_object_or_404, redirect, render
+from django.utils import timezone
+
+from core.routers import read_only
+from .models import AuthorActivity
+
+User = get_user_model()
+
+
+@read_only
+@login_required
+def author_stats(request, username):
+    author = get_object_or_404(User, username=username)
+    if request.user != author:
+        return redirect("posts:profile", username)
+    now = timezone.now()
+    activity = AuthorActivity.objects.filter(author=author)
+    days = activity.filter(
+        period=AuthorActivity.DAY,
+        start__gte=now - timedelta(days=settings.ACTIVITY_STATS_DAYS),
+    )
+    hours = activity.filter(
+        period=AuthorActivity.HOUR,
+        start__gte=now - timedelta(hours=24),
+    )
+    totals = activity.filter(period=AuthorActivity.DAY).aggregate(
+        posts=Sum("posts"),
+        comments=Sum("comments"),
+        followers=Sum("followers"),
+    )
+    context = {
+        "author": author,
+        "days": days,
+        "hours": hours,
+        "totals": totals,
+    }
+    template = "activity/author_stats.html"
+    return render(request, template, context)
@@ -0,0 +1,216 @@
+"""ASGI-обработчик поверх WSGI-приложения Django.
+
+Django 2.2 не умеет асинхронные представления, поэтому каждый запрос
+выполняется синхронно в пуле потоков, а цикл событий сервера тем временем
+принимает другие запросы. Запросы к разным страницам перекрывают ожидание
+базы и диска, как при потоковом WSGI-сервере. Ответ отдается по частям,
+так что потоковые ответы (StreamingHttpResponse) не буферизуются целиком.
+
+Тело запроса ограничено тем же размером, что и при WSGI (поля формы плюс
+файл до FILE_UPLOAD_MAX_SIZE), и сверх DATA_UPLOAD_MAX_MEMORY_SIZE
+хранится во временном файле, а не в памяти.
+"""
+import asyncio
+import sys
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+
+from .uploads import max_body_size
+
+REQUEST_TOO_LARGE = object()
+
+
+def content_length(scope):
+    for name, value in scope.get("headers", []):
+        if name.lower() == b"content-length":
+            try:
+                return int(value)
+            except ValueError:
+                return 0
+    return 0
+
+
+async def send_error(send, status, message):
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-type", b"text/plain; charset=utf-8")],
+    })
+    await send({"type": "http.response.body", "body": message})
+
+
+def build_environ(scope, body):
+    """Собирает WSGI environ из ASGI scope и файла с телом запроса."""
+    server = scope.get("server") or ("localhost", 80)
+    client = scope.get("client") or ("", 0)
+    environ = {
+        "REQUEST_METHOD": scope["method"],
+        "SCRIPT_NAME": scope.get("root_path", ""),
+        "PATH_INFO": scope["path"].encode("utf-8").decode("latin-1"),
+        "QUERY_STRING": scope.get("query_string", b"").decode("ascii"),
+        "SERVER_NAME": server[0],
+        "SERVER_PORT": str(server[1]),
+        "SERVER_PROTOCOL": f"HTTP/{scope.get('http_version', '1.1')}",
+        "REMOTE_ADDR": client[0],
+        "REMOTE_PORT": str(client[1]),
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.input": body,
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": True,
+        "wsgi.run_once": False,
+    }
+    for name, value in scope.get("headers", []):
+        name = name.decode("latin-1").upper().replace("-", "_")
+        value = value.decode("latin-1")
+        if name in ("CONTENT_TYPE", "CONTENT_LENGTH"):
+            key = name
+        else:
+            key = f"HTTP_{name}"
+        if key in environ:
+            value = f"{environ[key]},{value}"
+        environ[key] = value
+    return environ
+
+
+class AsgiHandler:
+    """ASGI-приложение, выполняющее WSGI-приложение в пуле потоков.
+
+    Размер пула по умолчанию равен DB_POOL_SIZE: каждый поток держит свое
+    постоянное соединение с базой.
+    """
+
+    def __init__(self, wsgi_application, max_workers=None):
+        self.wsgi_application = wsgi_application
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers or settings.DB_POOL_SIZE,
+            thread_name_prefix="asgi",
+        )
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self.lifespan(receive, send)
+        elif scope["type"] == "http":
+            await self.http(scope, receive, send)
+        else:
+            raise ValueError(f"Неподдерживаемый тип {scope['type']}")
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                self.executor.shutdown(wait=False)
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def read_body(self, scope, receive):
+        """Читает тело запроса во временный файл.
+
+        Тело до DATA_UPLOAD_MAX_MEMORY_SIZE байт остается в памяти, больше —
+        уходит на диск. None — клиент отключился, REQUEST_TOO_LARGE — тело
+        больше max_body_size().
+        """
+        limit = max_body_size()
+        if limit is not None and content_length(scope) > limit:
+            return REQUEST_TOO_LARGE
+        body = tempfile.SpooledTemporaryFile(
+            max_size=settings.DATA_UPLOAD_MAX_MEMORY_SIZE or 0
+        )
+        received = 0
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                body.close()
+                return None
+            chunk = message.get("body", b"")
+            received += len(chunk)
+            if limit is not None and received > limit:
+                body.close()
+                return REQUEST_TOO_LARGE
+            body.write(chunk)
+            if not message.get("more_body", False):
+                body.seek(0)
+                return body
+
+    async def http(self, scope, receive, send):
+        body = await self.read_body(scope, receive)
+        if body is None:
+            return
+        if body is REQUEST_TOO_LARGE:
+            await send_error(send, 413, b"Request body too large")
+            return
+        loop = asyncio.get_running_loop()
+        disconnected = threading.Event()
+
+        async def watch_disconnect():
+            while (await receive())["type"] != "http.disconnect":
+                pass
+            disconnected.set()
+
+        watcher = loop.create_task(watch_disconnect())
+        try:
+            with body:
+                await loop.run_in_executor(
+                    self.executor,
+                    self.run_application,
+                    build_environ(scope, body),
+                    lambda message: asyncio.run_coroutine_threadsafe(
+                        send(message), loop
+                    ).result(),
+                    disconnected,
+                )
+        finally:
+            watcher.cancel()
+
+    def run_application(self, environ, send, disconnected):
+        """Выполняет приложение и отдает ответ из одного потока пула.
+
+        Представление, перебор потокового ответа и close() (сигнал
+        request_finished, закрытие соединений с базой) идут в одном потоке:
+        маршрутизация по репликам и открытые курсоры .iterator() привязаны
+        к потоку. Перебор прекращается, когда клиент отключился.
+        """
+        started = {}
+
+        def start_response(status, headers, exc_info=None):
+            started["status"] = int(status.split(" ", 1)[0])
+            started["headers"] = [
+                (name.lower().encode("latin-1"), value.encode("latin-1"))
+                for name, value in headers
+            ]
+
+        def send_start():
+            send({
+                "type": "http.response.start",
+                "status": started.pop("status"),
+                "headers": started.pop("headers"),
+            })
+
+        response = self.wsgi_application(environ, start_response)
+        try:
+            # Приложение-генератор вызывает start_response только при
+            # получении первой части ответа
+            for chunk in response:
+                if disconnected.is_set():
+                    return
+                if "status" in started:
+                    send_start()
+                if chunk:
+                    send({
+                        "type": "http.response.body",
+                        "body": chunk,
+                        "more_body": True,
+                    })
+            if "status" in started:
+                send_start()
+            send({"type": "http.response.body", "body": b""})
+        finally:
+            close = getattr(response, "close", None)
+            if close is not None:
+                close()
@@ -0,0 +1,211 @@
+"""Нагрузочный стенд для сравнительных замеров.
+
+Сценарии регистрируются декоратором scenario в модулях benchmarks.py
+приложений и запускаются командой ``python manage.py benchmark <сценарий>``
+на временной базе с тестовыми данными.
+"""
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from django.contrib.auth import get_user_model
+from django.core.handlers.wsgi import WSGIHandler
+from django.db import connections
+from django.test import RequestFactory
+from django.urls import reverse
+
+from posts.models import Group, Post
+
+SCENARIOS = {}
+
+User = get_user_model()
+
+
+def scenario(name):
+    """Регистрирует функцию сценария под именем name.
+
+    Сценарий принимает опции команды и возвращает пары
+    (подпись, BenchmarkResult).
+    """
+    def decorator(func):
+        SCENARIOS[name] = func
+        return func
+    return decorator
+
+
+class BenchmarkResult:
+    def __init__(self, timings, elapsed, extra=None):
+        self.timings = timings
+        self.elapsed = elapsed
+        self.extra = extra or {}
+
+    @property
+    def mean_ms(self):
+        return statistics.mean(self.timings) * 1000
+
+    @property
+    def p95_ms(self):
+        timings = sorted(self.timings)
+        return timings[int(len(timings) * 0.95) - 1] * 1000
+
+    @property
+    def rps(self):
+        return len(self.timings) / self.elapsed
+
+    def __str__(self):
+        extra = " ".join(f"{key}={value}" for key, value in self.extra.items())
+        return (
+            f"{len(self.timings):>6} запр. "
+            f"среднее {self.mean_ms:8.2f} мс  p95 {self.p95_ms:8.2f} мс  "
+            f"{self.rps:8.1f} запр/с  {extra}"
+        )
+
+
+class LoadHarness:
+    """Гоняет GET-запросы через WSGI-обработчик Django.
+
+    В отличие от тестового клиента, обработчик отправляет сигналы начала и
+    конца запроса как настоящий сервер, поэтому соединения с базой
+    закрываются и открываются так же, как в бою.
+    """
+
+    def __init__(self, application=None):
+        self.application = application or WSGIHandler()
+        self.factory = RequestFactory()
+
+    def request(self, path):
+        environ = self.factory.get(path).environ
+        started = time.perf_counter()
+        response = self.application(environ, lambda status, headers: None)
+        for chunk in response:
+            pass
+        response.close()
+        return time.perf_counter() - started
+
+    def _worker(self, paths):
+        try:
+            return [self.request(path) for path in paths]
+        finally:
+            connections.close_all()
+
+    def run(self, urls, requests, concurrency=1):
+        """Выполняет requests запросов по кругу по списку urls."""
+        paths = [urls[number % len(urls)] for number in range(requests)]
+        chunks = [paths[start::concurrency] for start in range(concurrency)]
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            results = executor.map(self._worker, chunks)
+            timings = [timing for chunk in results for timing in chunk]
+        return BenchmarkResult(timings, time.perf_counter() - started)
+
+
+class AsgiLoadHarness:
+    """Гоняет GET-запросы через ASGI-приложение, держа до concurrency
+    запросов в обработке одновременно."""
+
+    def __init__(self, application):
+        self.application = application
+
+    async def request(self, path):
+        messages = [{"type": "http.request", "body": b""}]
+
+        async def receive():
+            return messages.pop() if messages else {"type": "http.disconnect"}
+
+        async def send(message):
+            pass
+
+        scope = {
+            "type": "http",
+            "method": "GET",
+            "path": path,
+            "query_string": b"",
+            "headers": [(b"host", b"testserver")],
+        }
+        started = time.perf_counter()
+        await self.application(scope, receive, send)
+        return time.perf_counter() - started
+
+    async def _run(self, paths, concurrency):
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def limited(path):
+            async with semaphore:
+                return await self.request(path)
+
+        return await asyncio.gather(*(limited(path) for path in paths))
+
+    def run(self, urls, requests, concurrency=1):
+        paths = [urls[number % len(urls)] for number in range(requests)]
+        started = time.perf_counter()
+        timings = asyncio.run(self._run(paths, concurrency))
+        return BenchmarkResult(timings, time.perf_counter() - started)
+
+
+@contextmanager
+def benchmark_database(alias="default"):
+    """Создает временную базу с миграциями и удаляет ее после замера.
+
+    Для SQLite база создается в файле: in-memory база не закрывает
+    соединения и не показала бы стоимость их открытия.
+    """
+    connection = connections[alias]
+    with tempfile.TemporaryDirectory() as directory:
+        if connection.vendor == "sqlite":
+            connection.settings_dict["TEST"] = {
+                **connection.settings_dict.get("TEST", {}),
+                "NAME": os.path.join(directory, "benchmark.sqlite3"),
+            }
+        old_name = connection.creation.create_test_db(
+            verbosity=0, autoclobber=True
+        )
+        try:
+            yield
+        finally:
+            connections.close_all()
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+def seed_database(users=20, groups=5, posts=300):
+    """Наполняет базу авторами, группами и постами для замеров."""
+    User.objects.bulk_create(
+        [User(username=f"author{number}") for number in range(users)]
+    )
+    authors = list(User.objects.all())
+    Group.objects.bulk_create(
+        [Group(
+            title=f"Группа {number}",
+            slug=f"group-{number}",
+            description="Описание группы",
+        ) for number in range(groups)]
+    )
+    groups = list(Group.objects.all())
+    Post.objects.bulk_create(
+        [Post(
+            author=authors[number % len(authors)],
+            group=groups[number % len(groups)],
+            text=f"Тестовая запись {number} " * 20,
+        ) for number in range(posts)]
+    )
+    return authors
+
+
+def feed_urls():
+    """Адреса страниц ленты без кэша страницы целиком."""
+    urls = [
+        reverse("posts:profile", args=(user.username,))
+        for user in User.objects.all()[:10]
+    ]
+    urls += [
+        reverse("posts:group_list", args=(group.slug,))
+        for group in Group.objects.all()
+    ]
+    urls += [
+        reverse("posts:post_detail", args=(pk,))
+        for pk in Post.objects.values_list("pk", flat=True)[:10]
+    ]
+    return urls
@@ -0,0 +1,171 @@
+import copy
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.db import connections
+from django.template import engines
+from django.template.loader import get_template
+from django.test import RequestFactory, override_settings
+from django.urls import resolve
+
+from posts.models import Post
+
+from .asgi import AsgiHandler
+from .benchmark import (AsgiLoadHarness, BenchmarkResult, LoadHarness,
+                        feed_urls, scenario)
+from .db import pool_stats
+from .warmup import warm_templates
+
+TEMPLATE_LOADERS = [
+    "django.template.loaders.filesystem.Loader",
+    "django.template.loaders.app_directories.Loader",
+]
+DUMMY_CACHE = {
+    "default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}
+}
+CACHED_LOADERS = [("django.template.loaders.cached.Loader", TEMPLATE_LOADERS)]
+
+
+def templates_with_loaders(loaders):
+    templates = copy.deepcopy(settings.TEMPLATES)
+    templates[0]["APP_DIRS"] = False
+    templates[0]["OPTIONS"]["loaders"] = loaders
+    return templates
+
+
+@scenario("connections")
+def connection_overhead(options):
+    """Новое соединение на каждый запрос против постоянных соединений."""
+    harness = LoadHarness()
+    urls = feed_urls()
+    database = connections["default"].settings_dict
+    for max_age in (0, 600):
+        database["CONN_MAX_AGE"] = max_age
+        connections.close_all()
+        pool_stats.reset()
+        result = harness.run(
+            urls, options["requests"], options["concurrency"]
+        )
+        stats = pool_stats.snapshot()
+        result.extra = {
+            "соединений": stats["opened"],
+            "пик_пула": f"{stats['peak_saturation']:.0%}",
+        }
+        yield f"CONN_MAX_AGE={max_age}", result
+
+
+@scenario("templates")
+def template_render(options):
+    """Рендер страниц ленты: разбор шаблонов с диска на каждый запрос,
+    кэширующий загрузчик без прогрева и с прогревом при старте."""
+    urls = feed_urls()
+    variants = (
+        ("без кэша шаблонов", TEMPLATE_LOADERS, False),
+        ("кэш, холодный старт", CACHED_LOADERS, False),
+        ("кэш + прогрев", CACHED_LOADERS, True),
+    )
+    for label, loaders, warm in variants:
+        templates = templates_with_loaders(loaders)
+        with override_settings(TEMPLATES=templates, CACHES=DUMMY_CACHE):
+            harness = LoadHarness()
+            compiled = warm_templates() if warm else 0
+            first = harness.request(urls[0]) * 1000
+            result = harness.run(
+                urls, options["requests"], options["concurrency"]
+            )
+        result.extra = {
+            "первый_запрос": f"{first:.1f}мс",
+            "прогрето": compiled,
+        }
+        yield label, result
+
+
+@scenario("concurrency")
+def asgi_concurrency(options):
+    """Синхронный WSGI-воркер, WSGI-воркер с потоками и ASGI-обработчик
+    при одинаковом числе одновременных запросов (--concurrency)."""
+    urls = feed_urls()
+    requests = options["requests"]
+    concurrency = max(options["concurrency"], 4)
+    harness = LoadHarness()
+    yield "WSGI, 1 поток", harness.run(urls, requests)
+    yield (
+        f"WSGI, потоков: {concurrency}",
+        harness.run(urls, requests, concurrency),
+    )
+    application = AsgiHandler(harness.application, max_workers=concurrency)
+    yield (
+        f"ASGI, одновременно: {concurrency}",
+        AsgiLoadHarness(application).run(urls, requests, concurrency),
+    )
+    application.executor.shutdown()
+
+
+def timed(render, repeat):
+    timings = []
+    started = time.perf_counter()
+    for _ in range(repeat):
+        before = time.perf_counter()
+        render()
+        timings.append(time.perf_counter() - before)
+    return BenchmarkResult(timings, time.perf_counter() - started)
+
+
+def chrome_requests():
+    """Запросы к страницам ленты от гостя и от вошедшего пользователя."""
+    factory = RequestFactory()
+    author = get_user_model().objects.first()
+    requests = []
+    for url in feed_urls():
+        for user in (AnonymousUser(), author):
+            request = factory.get(url)
+            request.user = user
+            request.resolver_match = resolve(url)
+            requests.append(request)
+    return requests
+
+
+@scenario("chrome")
+def chrome_render(options):
+    """Стоимость общих частей страницы на запрос: шапка и подвал без кэша
+    фрагментов и с ним, карточки ленты с {% url %} и с {% cached_url %}."""
+    repeat = options["requests"]
+    requests = chrome_requests()
+    parts = ("includes/header.html", "includes/footer.html")
+    fragments = {
+        "без кэша фрагментов": "django.core.cache.backends.dummy.DummyCache",
+        "кэш фрагментов": "django.core.cache.backends.locmem.LocMemCache",
+    }
+    for label, backend in fragments.items():
+        caches = {**settings.CACHES, "chrome": {
+            "BACKEND": backend, "LOCATION": "benchmark",
+        }}
+        templates = templates_with_loaders(CACHED_LOADERS)
+        with override_settings(TEMPLATES=templates, CACHES=caches):
+            chrome = [get_template(name) for name in parts]
+            counter = iter(range(10 ** 9))
+
+            def render():
+                request = requests[next(counter) % len(requests)]
+                for template in chrome:
+                    template.render(request=request)
+
+            yield label, timed(render, repeat)
+
+    posts = list(Post.objects.select_related("author", "group")[:10])
+    source = open(get_template("posts/includes/post_list.html").origin.name,
+                  encoding="utf-8").read()
+    cards = {
+        "карточки, {% url %}": source.replace("{% cached_url ", "{% url "),
+        "карточки, {% cached_url %}": source,
+    }
+    for label, card_source in cards.items():
+        card = engines["django"].from_string(card_source)
+
+        def render():
+            for post in posts:
+                card.render({"post": post, "display_group_link": True})
+
+        yield label, timed(render, repeat)
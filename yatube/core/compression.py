@@ -0,0 +1,96 @@
+"""Сжатие ответов gzip.
+
+В отличие от django.middleware.gzip.GZipMiddleware:
+- не сжимаются страницы с CSRF-токеном. Сжатая страница, в которой рядом
+  лежат секрет и отраженный ввод пользователя, уязвима для атаки BREACH:
+  по длине ответа можно подобрать секрет;
+- сжимаются только текстовые типы и ответы от GZIP_MIN_LENGTH байт:
+  короткие ответы и картинки от сжатия только растут;
+- части потокового ответа сжимаются с Z_SYNC_FLUSH и уходят клиенту
+  сразу, а не копятся в буфере компрессора. Потоки событий
+  (text/event-stream) не сжимаются вовсе.
+"""
+import re
+import zlib
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+re_accepts_gzip = re.compile(r"\bgzip\b")
+
+COMPRESSIBLE_TYPES = (
+    "text/html",
+    "text/plain",
+    "text/css",
+    "text/xml",
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+)
+
+
+def gzip_compressor():
+    # wbits=31 — поток в формате gzip (с заголовком и контрольной суммой)
+    return zlib.compressobj(settings.GZIP_LEVEL, zlib.DEFLATED, 31)
+
+
+def compress_string(data):
+    compressor = gzip_compressor()
+    return compressor.compress(data) + compressor.flush()
+
+
+def compress_sequence(sequence):
+    """Сжимает части ответа, отдавая каждую без задержки."""
+    compressor = gzip_compressor()
+    for item in sequence:
+        data = compressor.compress(item) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def is_compressible(request, response):
+    content_type = response.get("Content-Type", "").split(";", 1)[0]
+    return (
+        content_type.strip().lower() in COMPRESSIBLE_TYPES
+        and not response.has_header("Content-Encoding")
+        and not request.META.get("CSRF_COOKIE_USED")
+        and (
+            response.streaming
+            or len(response.content) >= settings.GZIP_MIN_LENGTH
+        )
+    )
+
+
+class CompressionMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if not is_compressible(request, response):
+            return response
+        patch_vary_headers(response, ("Accept-Encoding",))
+        if not re_accepts_gzip.search(
+            request.META.get("HTTP_ACCEPT_ENCODING", "")
+        ):
+            return response
+        if response.streaming:
+            response.streaming_content = compress_sequence(
+                response.streaming_content
+            )
+            del response["Content-Length"]
+        else:
+            compressed = compress_string(response.content)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response["Content-Length"] = str(len(compressed))
+        # Сжатый ответ не совпадает побайтно с исходным: сильный ETag
+        # становится слабым (RFC 7232, раздел 2.1)
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response["ETag"] = "W/" + etag
+        response["Content-Encoding"] = "gzip"
+        return response
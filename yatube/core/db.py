@@ -0,0 +1,103 @@
+"""Постоянные соединения с базой данных.
+
+Django держит по одному соединению на поток и алиас базы, поэтому пул
+воркера — это DB_POOL_SIZE потоков с CONN_MAX_AGE > 0. Модуль проверяет
+соединения перед повторным использованием и считает заполненность пула.
+"""
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.signals import request_finished, request_started
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+logger = logging.getLogger(__name__)
+
+
+class PoolStats:
+    """Счетчики соединений и одновременных запросов воркера."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.opened = 0
+            self.requests = 0
+            self.in_use = 0
+            self.peak = 0
+
+    @property
+    def saturation(self):
+        """Доля занятых соединений пула."""
+        return self.in_use / settings.DB_POOL_SIZE
+
+    def connection_opened(self, **kwargs):
+        with self._lock:
+            self.opened += 1
+
+    def request_started(self, **kwargs):
+        with self._lock:
+            self.requests += 1
+            self.in_use += 1
+            self.peak = max(self.peak, self.in_use)
+            saturation = self.saturation
+        if saturation >= settings.DB_POOL_WARN_SATURATION:
+            logger.warning(
+                "Пул соединений с базой заполнен на %.0f%%", saturation * 100
+            )
+
+    def request_finished(self, **kwargs):
+        with self._lock:
+            self.in_use = max(self.in_use - 1, 0)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "opened": self.opened,
+                "requests": self.requests,
+                "in_use": self.in_use,
+                "peak": self.peak,
+                "peak_saturation": self.peak / settings.DB_POOL_SIZE,
+            }
+
+
+pool_stats = PoolStats()
+
+
+def check_connections(**kwargs):
+    """Закрывает постоянные соединения, которые перестали отвечать.
+
+    Проверка выполняется не чаще раза в DB_HEALTH_CHECK_INTERVAL секунд,
+    чтобы не добавлять лишний запрос к каждому запросу пользователя.
+    """
+    now = time.monotonic()
+    for connection in connections.all():
+        if connection.connection is None:
+            continue
+        checked_at = getattr(connection, "health_checked_at", 0)
+        if now - checked_at < settings.DB_HEALTH_CHECK_INTERVAL:
+            continue
+        connection.health_checked_at = now
+        if not connection.is_usable():
+            connection.close()
+
+
+def install():
+    """Подключает счетчики и проверку соединений к сигналам Django."""
+    connection_created.connect(
+        pool_stats.connection_opened, dispatch_uid="pool_stats_opened"
+    )
+    request_started.connect(
+        pool_stats.request_started, dispatch_uid="pool_stats_started"
+    )
+    request_finished.connect(
+        pool_stats.request_finished, dispatch_uid="pool_stats_finished"
+    )
+    if settings.DB_HEALTH_CHECKS:
+        request_started.connect(
+            check_connections, dispatch_uid="check_connections"
+        )
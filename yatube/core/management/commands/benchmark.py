@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+from django.utils.module_loading import autodiscover_modules
+
+from core.benchmark import (SCENARIOS, benchmark_database,
+                            seed_database)
+
+
+class Command(BaseCommand):
+    help = "Сравнительные замеры производительности на временной базе."
+
+    def add_arguments(self, parser):
+        autodiscover_modules("benchmarks")
+        parser.add_argument("scenario", choices=sorted(SCENARIOS))
+        parser.add_argument(
+            "--requests", type=int, default=300,
+            help="Число запросов в каждом прогоне.",
+        )
+        parser.add_argument(
+            "--concurrency", type=int, default=1,
+            help="Число параллельных потоков.",
+        )
+
+    def handle(self, *args, **options):
+        run = SCENARIOS[options["scenario"]]
+        self.stdout.write(run.__doc__)
+        with benchmark_database():
+            seed_database()
+            for label, result in run(options):
+                self.stdout.write(f"{label:<28} {result}")
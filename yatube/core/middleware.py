@@ -0,0 +1,42 @@
+from django.conf import settings
+
+from . import routers
+
+PRIMARY_PIN_COOKIE = "primary_pin"
+SAFE_METHODS = ("GET", "HEAD")
+
+
+class ReplicaRoutingMiddleware:
+    """Включает чтение из реплик для представлений с декоратором read_only.
+
+    После любой записи пользователь получает cookie и следующие
+    PRIMARY_PIN_SECONDS секунд читает из основной базы, чтобы сразу видеть
+    свои посты и комментарии, даже если реплика отстает.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        routers.reset()
+        try:
+            response = self.get_response(request)
+            written = routers.has_written()
+        finally:
+            routers.reset()
+        if written:
+            response.set_cookie(
+                PRIMARY_PIN_COOKIE,
+                "1",
+                max_age=settings.PRIMARY_PIN_SECONDS,
+                httponly=True,
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if (
+            getattr(view_func, "read_only", False)
+            and request.method in SAFE_METHODS
+            and PRIMARY_PIN_COOKIE not in request.COOKIES
+        ):
+            routers.choose_replica()
@@ -0,0 +1,26 @@
+# Generated by Django 2.2.16 on 2026-10-19 08:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Cursor',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True, verbose_name='Имя')),
+                ('position', models.BigIntegerField(default=0, verbose_name='Последний обработанный id')),
+            ],
+            options={
+                'verbose_name': 'Курсор',
+                'verbose_name_plural': 'Курсоры',
+            },
+        ),
+    ]
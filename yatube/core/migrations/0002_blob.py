@@ -0,0 +1,27 @@
+# Generated by Django 2.2.16 on 2026-10-19 08:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Blob',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True, verbose_name='Имя')),
+                ('size', models.PositiveIntegerField(verbose_name='Размер, байт')),
+                ('refs', models.PositiveIntegerField(default=1, verbose_name='Ссылок')),
+                ('created', models.DateTimeField(auto_now_add=True, verbose_name='Загружен')),
+            ],
+            options={
+                'verbose_name': 'Файл',
+                'verbose_name_plural': 'Файлы',
+            },
+        ),
+    ]
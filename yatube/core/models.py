@@ -0,0 +1,58 @@
+from django.db import IntegrityError, models, transaction
+from django.db.models import F
+
+
+class Cursor(models.Model):
+    """Позиция инкрементальной обработки: до какого id строки уже учтены.
+
+    Пересчеты по расписанию (рейтинг, статистика) читают только строки
+    новее курсора и сдвигают его в той же транзакции, что и результат.
+    """
+
+    name = models.CharField('Имя', max_length=100, unique=True)
+    position = models.BigIntegerField('Последний обработанный id', default=0)
+
+    class Meta:
+        verbose_name = 'Курсор'
+        verbose_name_plural = 'Курсоры'
+
+    def __str__(self):
+        return f"{self.name}: {self.position}"
+
+    @classmethod
+    def acquire(cls, name):
+        """Курсор, заблокированный до конца текущей транзакции."""
+        cls.objects.get_or_create(name=name)
+        return cls.objects.select_for_update().get(name=name)
+
+
+class Blob(models.Model):
+    """Файл в хранилище с адресацией по содержимому (core/storage.py).
+
+    refs — сколько записей ссылается на файл; файл удаляется, когда
+    ссылок не остается.
+    """
+
+    name = models.CharField('Имя', max_length=255, unique=True)
+    size = models.PositiveIntegerField('Размер, байт')
+    refs = models.PositiveIntegerField('Ссылок', default=1)
+    created = models.DateTimeField('Загружен', auto_now_add=True)
+
+    class Meta:
+        verbose_name = 'Файл'
+        verbose_name_plural = 'Файлы'
+
+    def __str__(self):
+        return f"{self.name} ({self.refs})"
+
+    @classmethod
+    def acquire(cls, name, size):
+        """Добавляет ссылку на файл, при необходимости создавая запись."""
+        blobs = cls.objects.filter(name=name)
+        if blobs.update(refs=F("refs") + 1):
+            return
+        try:
+            with transaction.atomic():
+                cls.objects.create(name=name, size=size)
+        except IntegrityError:
+            blobs.update(refs=F("refs") + 1)
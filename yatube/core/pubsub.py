@@ -0,0 +1,102 @@
+"""Публикация событий и подписка на них.
+
+Брокер выбирается настройкой PUBSUB_BACKEND. LocalBroker доставляет
+сообщения только внутри процесса; для нескольких воркеров нужен брокер с
+общим хранилищем (например, Redis), реализующий тот же интерфейс.
+"""
+import queue
+import threading
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+
+class Subscription:
+    """Подписка на набор каналов. Сообщения читаются методом get."""
+
+    def __init__(self, broker, channels, maxsize=100):
+        self.broker = broker
+        self.channels = frozenset(channels)
+        self.messages = queue.Queue(maxsize=maxsize)
+
+    def deliver(self, channel, message):
+        try:
+            self.messages.put_nowait((channel, message))
+        except queue.Full:
+            # Медленный подписчик не должен тормозить публикацию
+            pass
+
+    def get(self, timeout=None):
+        """Пара (канал, сообщение) или None, если за timeout ничего нет."""
+        try:
+            return self.messages.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class BaseBroker:
+    def publish(self, channel, message):
+        raise NotImplementedError
+
+    def subscribe(self, channels):
+        raise NotImplementedError
+
+    def unsubscribe(self, subscription):
+        raise NotImplementedError
+
+
+class LocalBroker(BaseBroker):
+    """Брокер в памяти процесса."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscriptions = {}
+
+    def publish(self, channel, message):
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(channel, ()))
+        for subscription in subscriptions:
+            subscription.deliver(channel, message)
+        return len(subscriptions)
+
+    def subscribe(self, channels):
+        subscription = Subscription(self, channels)
+        with self._lock:
+            for channel in subscription.channels:
+                self._subscriptions.setdefault(channel, set()).add(
+                    subscription
+                )
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            for channel in subscription.channels:
+                subscribers = self._subscriptions.get(channel)
+                if subscribers is None:
+                    continue
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscriptions[channel]
+
+
+@lru_cache(maxsize=None)
+def get_broker():
+    return import_string(settings.PUBSUB_BACKEND)()
+
+
+@receiver(setting_changed)
+def reset_broker(setting, **kwargs):
+    if setting == "PUBSUB_BACKEND":
+        get_broker.cache_clear()
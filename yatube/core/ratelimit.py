@@ -0,0 +1,205 @@
+"""Ограничение частоты запросов на запись.
+
+Каждому пользователю (анониму — каждому IP) на каждое представление
+выделяется ведро токенов: rate="10/m" означает ведро на 10 токенов,
+которое полностью наполняется за минуту. Запрос забирает токен; если
+токенов нет, ответ 429 отдается до обращения к базе и шаблонам.
+
+Хранилище выбирается настройкой RATELIMIT_STORE. По умолчанию запросы
+считаются в кэше default (счетчиками за окно, см. CacheBucketStore), а при
+недоступности кэша — ведрами в памяти процесса.
+"""
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+
+from django.conf import settings
+from django.contrib.auth import SESSION_KEY
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.http import HttpResponse
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+PERIODS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_rate(rate):
+    """'10/m' -> (10, 60): емкость ведра и время его наполнения."""
+    count, period = rate.split("/")
+    return int(count), PERIODS[period]
+
+
+def take(state, capacity, period, now):
+    """Забирает токен из ведра.
+
+    Возвращает новое состояние ведра и число секунд до появления
+    следующего токена (0, если токен получен).
+    """
+    tokens, updated = state or (capacity, now)
+    tokens = min(capacity, tokens + (now - updated) * capacity / period)
+    if tokens >= 1:
+        return (tokens - 1, now), 0
+    return (tokens, now), (1 - tokens) * period / capacity
+
+
+class BaseBucketStore:
+    def consume(self, key, capacity, period):
+        """Пара (разрешено, секунд до следующего токена)."""
+        raise NotImplementedError
+
+
+class MemoryBucketStore(BaseBucketStore):
+    """Ведра в памяти процесса; хранит не больше maxsize ключей."""
+
+    def __init__(self, maxsize=10000):
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._buckets = OrderedDict()
+
+    def consume(self, key, capacity, period):
+        with self._lock:
+            state, retry_after = take(
+                self._buckets.pop(key, None), capacity, period, time.time()
+            )
+            self._buckets[key] = state
+            if len(self._buckets) > self.maxsize:
+                self._buckets.popitem(last=False)
+        return not retry_after, retry_after
+
+
+class CacheBucketStore(BaseBucketStore):
+    """Счетчики в кэше, общие для всех воркеров.
+
+    Вместо ведра токенов — счетчик запросов за окно в period секунд:
+    cache.add создает его, cache.incr атомарно увеличивает, поэтому
+    одновременные запросы не проходят сверх лимита. На стыке двух окон
+    может пройти до 2 * capacity запросов. Счетчики лежат в кэше
+    RATELIMIT_CACHE; incr атомарен в locmem, memcached и redis, но не в
+    файловом кэше (боевые настройки такой кэш для лимитов не допускают).
+    """
+
+    def __init__(self, alias=None):
+        self.alias = alias or settings.RATELIMIT_CACHE
+        self.fallback = MemoryBucketStore()
+
+    def consume(self, key, capacity, period):
+        now = time.time()
+        window = int(now // period)
+        counter = f"{key}:{window}"
+        try:
+            cache = caches[self.alias]
+            cache.add(counter, 0, timeout=math.ceil(period))
+            try:
+                count = cache.incr(counter)
+            except ValueError:
+                # Счетчик истек между add и incr
+                cache.add(counter, 1, timeout=math.ceil(period))
+                count = 1
+        except Exception:
+            # Отказ кэша не должен ронять запись на сайт
+            logger.warning("Кэш лимитов недоступен", exc_info=True)
+            return self.fallback.consume(key, capacity, period)
+        if count <= capacity:
+            return True, 0
+        return False, (window + 1) * period - now
+
+
+@lru_cache(maxsize=None)
+def get_store():
+    return import_string(settings.RATELIMIT_STORE)()
+
+
+@receiver(setting_changed)
+def reset_store(setting, **kwargs):
+    if setting in ("RATELIMIT_STORE", "RATELIMIT_CACHE"):
+        get_store.cache_clear()
+
+
+def ratelimit(rate, methods=("POST",)):
+    """Помечает представление лимитом; проверяет его RateLimitMiddleware.
+
+    Лимит можно переопределить (или отключить значением None) в настройке
+    RATELIMITS по имени маршрута, например "posts:post_create".
+    """
+
+    def decorator(view):
+        view.ratelimit = (rate, methods)
+        return view
+
+    return decorator
+
+
+def client_ip(request):
+    """IP клиента с учетом RATELIMIT_PROXY_COUNT доверенных прокси.
+
+    Каждый прокси дописывает в X-Forwarded-For адрес, с которого к нему
+    пришли, поэтому адрес клиента — N-й с конца; что левее, мог подставить
+    сам клиент.
+    """
+    proxies = settings.RATELIMIT_PROXY_COUNT
+    if proxies:
+        forwarded = [
+            address.strip()
+            for address in request.META.get(
+                "HTTP_X_FORWARDED_FOR", ""
+            ).split(",")
+            if address.strip()
+        ]
+        if len(forwarded) >= proxies:
+            return forwarded[-proxies]
+    return request.META.get("REMOTE_ADDR", "")
+
+
+def client_key(request):
+    """Ключ клиента: id вошедшего пользователя или IP.
+
+    id берется из сессии (один запрос к хранилищу сессий, который
+    представление потом не повторит), а сам пользователь не загружается.
+    Все сессии пользователя делят одно ведро, так что повторный вход лимит
+    не увеличивает. Клиент без сессии или с выдуманной cookie считается
+    по IP.
+    """
+    user_id = None
+    if request.COOKIES.get(settings.SESSION_COOKIE_NAME):
+        user_id = request.session.get(SESSION_KEY)
+    if user_id:
+        return f"user:{user_id}"
+    return f"ip:{client_ip(request)}"
+
+
+class RateLimitMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        return self.get_response(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        rule = getattr(view_func, "ratelimit", None)
+        if rule is None:
+            return None
+        rate, methods = rule
+        if request.method not in methods:
+            return None
+        view_name = request.resolver_match.view_name
+        rate = settings.RATELIMITS.get(view_name, rate)
+        if rate is None:
+            return None
+        capacity, period = parse_rate(rate)
+        bucket = f"ratelimit:{view_name}:{client_key(request)}"
+        allowed, retry_after = get_store().consume(bucket, capacity, period)
+        if allowed:
+            return None
+        response = HttpResponse(
+            "Слишком много запросов, попробуйте позже.",
+            status=429,
+            content_type="text/plain; charset=utf-8",
+        )
+        response["Retry-After"] = str(math.ceil(retry_after))
+        return response
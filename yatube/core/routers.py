@@ -0,0 +1,48 @@
+"""Маршрутизация запросов к базе: запись в основную базу, чтение в реплики."""
+import random
+import threading
+
+from django.conf import settings
+
+PRIMARY_DB = "default"
+
+_state = threading.local()
+
+
+def read_only(view):
+    """Помечает представление, которому достаточно данных из реплики."""
+    view.read_only = True
+    return view
+
+
+def choose_replica():
+    """Закрепляет за текущим запросом одну из реплик."""
+    replicas = settings.REPLICA_DATABASES
+    _state.replica = random.choice(replicas) if replicas else None
+    return _state.replica
+
+
+def has_written():
+    """Была ли в текущем запросе запись в основную базу."""
+    return getattr(_state, "written", False)
+
+
+def reset():
+    """Сбрасывает состояние маршрутизации после запроса."""
+    _state.replica = None
+    _state.written = False
+
+
+class PrimaryReplicaRouter:
+    """Отправляет чтение в выбранную для запроса реплику, запись — в основную
+    базу. Без выбранной реплики все запросы идут в основную базу."""
+
+    def db_for_read(self, model, **hints):
+        return getattr(_state, "replica", None) or PRIMARY_DB
+
+    def db_for_write(self, model, **hints):
+        _state.written = True
+        return PRIMARY_DB
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
@@ -0,0 +1,182 @@
+"""Статика с хэшами в именах, сжатыми копиями и раздачей из Django.
+
+CompressedManifestStaticFilesStorage при collectstatic добавляет к имени
+каждого файла хэш содержимого (bootstrap.min.css ->
+bootstrap.min.3f2a….css) и рядом кладет сжатые копии .gz и, если
+установлен пакет brotli, .br. Тег {% static %} выдает имена с хэшем, так
+что браузер может кэшировать их бессрочно: новая версия файла получит
+новое имя.
+
+StaticFilesMiddleware отдает собранные файлы из STATIC_ROOT без
+отдельного веб-сервера: индекс файлов строится один раз, из сжатых копий
+выбирается та, что поддерживает клиент, а имена с хэшем получают
+заголовок Cache-Control на STATIC_MAX_AGE секунд с immutable.
+"""
+import gzip
+import json
+import mimetypes
+import os
+import posixpath
+from functools import lru_cache
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.http import FileResponse, HttpResponseNotModified
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE = (
+    ".css", ".js", ".map", ".svg", ".ico", ".txt", ".html", ".json", ".xml",
+)
+# Сжатая копия сохраняется, только если она меньше оригинала хотя бы на 5%
+MIN_RATIO = 0.95
+# Сначала brotli: он сжимает текст лучше gzip
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+
+def compress(data):
+    """Сжатые варианты данных: словарь суффикс -> байты."""
+    variants = {".gz": gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants[".br"] = brotli.compress(data, mode=brotli.MODE_TEXT)
+    return {
+        suffix: compressed for suffix, compressed in variants.items()
+        if len(compressed) < len(data) * MIN_RATIO
+    }
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        names = set(paths) | set(self.hashed_files.values())
+        for name in sorted(names):
+            if name.lower().endswith(COMPRESSIBLE) and self.exists(name):
+                self.compress_file(name)
+
+    def compress_file(self, name):
+        with self.open(name) as original:
+            data = original.read()
+        path = self.path(name)
+        for suffix, compressed in compress(data).items():
+            with open(path + suffix, "wb") as variant:
+                variant.write(compressed)
+
+
+class StaticFile:
+    def __init__(self, path, immutable):
+        stat = os.stat(path)
+        self.path = path
+        self.size = stat.st_size
+        self.mtime = stat.st_mtime
+        self.immutable = immutable
+        self.content_type = (
+            mimetypes.guess_type(path)[0] or "application/octet-stream"
+        )
+        self.variants = {
+            encoding: path + suffix
+            for encoding, suffix in ENCODINGS
+            if os.path.exists(path + suffix)
+        }
+
+    def choose(self, accept_encoding):
+        """Путь к файлу и Content-Encoding под заголовок Accept-Encoding."""
+        accepted = {
+            part.split(";", 1)[0].strip().lower()
+            for part in accept_encoding.split(",")
+        }
+        for encoding, _ in ENCODINGS:
+            if encoding in accepted and encoding in self.variants:
+                return self.variants[encoding], encoding
+        return self.path, None
+
+
+def read_manifest(root):
+    try:
+        with open(os.path.join(root, "staticfiles.json")) as manifest:
+            return set(json.load(manifest).get("paths", {}).values())
+    except (OSError, ValueError):
+        return set()
+
+
+@lru_cache(maxsize=None)
+def static_index():
+    """Файлы из STATIC_ROOT: словарь имя -> StaticFile.
+
+    Строится при первом запросе; после collectstatic воркеры нужно
+    перезапустить.
+    """
+    root = settings.STATIC_ROOT
+    if not root or not os.path.isdir(root):
+        return {}
+    hashed = read_manifest(root)
+    index = {}
+    for directory, _, filenames in os.walk(root):
+        for filename in filenames:
+            path = os.path.join(directory, filename)
+            name = os.path.relpath(path, root).replace(os.sep, "/")
+            base, extension = os.path.splitext(path)
+            if extension in (".gz", ".br") and os.path.exists(base):
+                continue
+            index[name] = StaticFile(path, name in hashed)
+    return index
+
+
+@receiver(setting_changed)
+def reset_static_index(setting, **kwargs):
+    if setting in ("STATIC_ROOT", "STATIC_URL"):
+        static_index.cache_clear()
+
+
+class StaticFilesMiddleware:
+    """Отдает собранную статику до остальной обработки запроса."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        prefix = settings.STATIC_URL
+        if (
+            request.method in ("GET", "HEAD")
+            and prefix and prefix.startswith("/")
+            and request.path_info.startswith(prefix)
+        ):
+            name = posixpath.normpath(request.path_info[len(prefix):])
+            static_file = static_index().get(name)
+            if static_file is not None:
+                return self.serve(request, static_file)
+        return self.get_response(request)
+
+    def serve(self, request, static_file):
+        if not was_modified_since(
+            request.META.get("HTTP_IF_MODIFIED_SINCE"),
+            static_file.mtime,
+            static_file.size,
+        ):
+            return HttpResponseNotModified()
+        path, encoding = static_file.choose(
+            request.META.get("HTTP_ACCEPT_ENCODING", "")
+        )
+        response = FileResponse(
+            open(path, "rb"), content_type=static_file.content_type
+        )
+        response["Last-Modified"] = http_date(static_file.mtime)
+        if encoding:
+            response["Content-Encoding"] = encoding
+        if static_file.variants:
+            response["Vary"] = "Accept-Encoding"
+        if static_file.immutable:
+            response["Cache-Control"] = (
+                f"public, max-age={settings.STATIC_MAX_AGE}, immutable"
+            )
+        else:
+            response["Cache-Control"] = "public, max-age=60"
+        return response
@@ -0,0 +1,273 @@
+"""Хранилище загрузок с адресацией по содержимому.
+
+Файл хэшируется (SHA-256) по мере записи во временный файл и сохраняется
+под именем из хэша: posts/ab/cd/abcd…ef.jpg. Повторная загрузка того же
+файла не занимает места, а одинаковые имена файлов у разных
+пользователей больше не переименовываются.
+
+Сколько записей ссылается на файл, считает модель Blob: каждое сохранение
+увеличивает счетчик, delete уменьшает, а сам файл удаляется вместе с
+последней ссылкой. Ссылка берется в транзакции сохранения модели (см.
+Post.save), поэтому при ошибке записи модели откатывается вместе с ней.
+Файлы, загруженные до включения хранилища, в Blob не записаны, и delete
+их не трогает.
+
+Где лежат байты, решает бэкенд (MEDIA_BLOB_BACKEND): локальный каталог
+MEDIA_ROOT или S3-совместимое хранилище.
+"""
+import hashlib
+import os
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files import File
+from django.core.files.storage import Storage
+from django.db import transaction
+from django.db.models import F
+from django.utils.deconstruct import deconstructible
+from django.utils.encoding import filepath_to_uri
+from django.utils.module_loading import import_string
+
+CHUNK_SIZE = 64 * 1024
+
+
+class FileSystemBackend:
+    """Блобы в каталоге MEDIA_ROOT (по умолчанию)."""
+
+    def __init__(self, location=None, base_url=None):
+        self._location = location
+        self._base_url = base_url
+
+    @property
+    def location(self):
+        return os.path.abspath(self._location or settings.MEDIA_ROOT)
+
+    @property
+    def base_url(self):
+        return self._base_url or settings.MEDIA_URL
+
+    @property
+    def staging_dir(self):
+        # Временный файл в том же разделе: перенос — атомарный rename
+        path = os.path.join(self.location, ".staging")
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    def path(self, key):
+        return os.path.join(self.location, key)
+
+    def exists(self, key):
+        return os.path.exists(self.path(key))
+
+    def put(self, key, filename):
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.replace(filename, path)
+
+    def open(self, key, mode="rb"):
+        return open(self.path(key), mode)
+
+    def delete(self, key):
+        try:
+            os.remove(self.path(key))
+        except FileNotFoundError:
+            pass
+
+    def size(self, key):
+        return os.path.getsize(self.path(key))
+
+    def url(self, key):
+        return self.base_url + filepath_to_uri(key)
+
+
+class S3Backend:
+    """Блобы в S3-совместимом хранилище.
+
+    client — объект с интерфейсом клиента boto3 (upload_file,
+    head_object, download_fileobj, delete_object). По умолчанию создается
+    boto3.client("s3", endpoint_url=endpoint_url).
+    """
+
+    staging_dir = None
+
+    def __init__(self, bucket, base_url, endpoint_url=None, client=None):
+        self.bucket = bucket
+        self.base_url = base_url
+        if client is None:
+            try:
+                import boto3
+            except ImportError:
+                raise ImproperlyConfigured(
+                    "Для S3Backend нужен пакет boto3"
+                )
+            client = boto3.client("s3", endpoint_url=endpoint_url)
+        self.client = client
+
+    def head(self, key):
+        try:
+            return self.client.head_object(Bucket=self.bucket, Key=key)
+        except Exception as error:
+            status = getattr(error, "response", {}).get(
+                "ResponseMetadata", {}
+            ).get("HTTPStatusCode")
+            if status == 404:
+                return None
+            raise
+
+    def exists(self, key):
+        return self.head(key) is not None
+
+    def put(self, key, filename):
+        self.client.upload_file(filename, self.bucket, key)
+        os.remove(filename)
+
+    def open(self, key, mode="rb"):
+        stream = tempfile.SpooledTemporaryFile(max_size=CHUNK_SIZE * 16)
+        self.client.download_fileobj(self.bucket, key, stream)
+        stream.seek(0)
+        return stream
+
+    def delete(self, key):
+        self.client.delete_object(Bucket=self.bucket, Key=key)
+
+    def size(self, key):
+        return self.head(key)["ContentLength"]
+
+    def url(self, key):
+        return self.base_url + filepath_to_uri(key)
+
+
+def blob_name(directory, digest, extension):
+    return os.path.join(
+        directory, digest[:2], digest[2:4], digest + extension
+    ).replace(os.sep, "/")
+
+
+@deconstructible
+class ContentAddressedStorage(Storage):
+    def __init__(self, backend=None):
+        self._backend = backend
+
+    @property
+    def backend(self):
+        if self._backend is None:
+            self._backend = import_string(settings.MEDIA_BLOB_BACKEND)(
+                **settings.MEDIA_BLOB_OPTIONS
+            )
+        return self._backend
+
+    def get_available_name(self, name, max_length=None):
+        # Имя все равно заменит хэш содержимого
+        return name
+
+    def _save(self, name, content):
+        from .models import Blob
+
+        digest = hashlib.sha256()
+        size = 0
+        staged = tempfile.NamedTemporaryFile(
+            dir=self.backend.staging_dir, delete=False
+        )
+        try:
+            with staged:
+                if hasattr(content, "seek"):
+                    content.seek(0)
+                for chunk in content.chunks(CHUNK_SIZE):
+                    digest.update(chunk)
+                    size += len(chunk)
+                    staged.write(chunk)
+            directory, filename = os.path.split(name)
+            extension = os.path.splitext(filename)[1].lower()
+            key = blob_name(directory, digest.hexdigest(), extension)
+            with transaction.atomic():
+                Blob.acquire(key, size)
+                if not self.backend.exists(key):
+                    self.backend.put(key, staged.name)
+        finally:
+            if os.path.exists(staged.name):
+                os.remove(staged.name)
+        return key
+
+    def retain(self, name):
+        """Добавляет ссылку на уже сохраненный файл."""
+        from .models import Blob
+
+        Blob.objects.filter(name=name).update(refs=F("refs") + 1)
+
+    def delete(self, name):
+        """Убирает ссылку на файл; файл удаляется с последней ссылкой.
+
+        Запись Blob удаляется условным DELETE (refs=1), а файл — до
+        коммита, пока строка заблокирована: параллельный _save того же
+        содержимого дождется коммита в Blob.acquire, создаст запись заново
+        и загрузит файл, а не сошлется на удаляемый.
+        """
+        from .models import Blob
+
+        blobs = Blob.objects.filter(name=name)
+        while True:
+            with transaction.atomic():
+                if blobs.filter(refs__gt=1).update(refs=F("refs") - 1):
+                    return
+                deleted, _ = blobs.filter(refs=1).delete()
+                if deleted:
+                    self.backend.delete(name)
+                    return
+                if not blobs.exists():
+                    return
+            # Между запросами ссылок стало больше одной — повторяем
+
+    def _open(self, name, mode="rb"):
+        return File(self.backend.open(name, mode), name)
+
+    def exists(self, name):
+        return self.backend.exists(name)
+
+    def size(self, name):
+        return self.backend.size(name)
+
+    def url(self, name):
+        return self.backend.url(name)
+
+    def path(self, name):
+        if not isinstance(self.backend, FileSystemBackend):
+            return super().path(name)
+        return self.backend.path(name)
+
+
+class LocalS3Client:
+    """Заменитель клиента S3 на локальном каталоге для тестов и разработки.
+
+    Реализует только методы, которые вызывает S3Backend.
+    """
+
+    class NotFound(Exception):
+        response = {"ResponseMetadata": {"HTTPStatusCode": 404}}
+
+    def __init__(self, root):
+        self.root = root
+
+    def _path(self, bucket, key):
+        return os.path.join(self.root, bucket, key)
+
+    def upload_file(self, filename, bucket, key):
+        path = self._path(bucket, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        shutil.copyfile(filename, path)
+
+    def head_object(self, Bucket, Key):
+        path = self._path(Bucket, Key)
+        if not os.path.exists(path):
+            raise self.NotFound(Key)
+        return {"ContentLength": os.path.getsize(path)}
+
+    def download_fileobj(self, bucket, key, stream):
+        with open(self._path(bucket, key), "rb") as source:
+            shutil.copyfileobj(source, stream)
+
+    def delete_object(self, Bucket, Key):
+        path = self._path(Bucket, Key)
+        if os.path.exists(path):
+            os.remove(path)
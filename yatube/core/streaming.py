@@ -0,0 +1,101 @@
+"""Потоковый рендер страниц с длинными списками.
+
+Шаблон Django рендерится в строку целиком, поэтому страница с тысячей
+комментариев уходит клиенту только после того, как отрисован последний.
+stream_render рендерит страницу с меткой на месте списка, сразу отдает
+все до метки (шапку, стили, сам пост), а затем — список порциями по
+batch элементов и остаток страницы. Браузер начинает загружать стили и
+показывать страницу, пока сервер еще читает список из базы.
+
+StreamSlots ограничивает число долгих потоков (server-sent events) в
+процессе: каждый держит поток воркера, и без предела несколько открытых
+страниц заняли бы весь пул.
+"""
+import threading
+from itertools import islice
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from django.template.loader import get_template, render_to_string
+from django.utils.safestring import mark_safe
+
+SLOT = "<!-- stream-slot -->"
+
+
+def stream_render(request, template_name, context, slot, items,
+                  item_template, item_name, batch=50):
+    """Потоковый ответ: шаблон template_name, в котором переменная slot
+    заменена элементами items, отрисованными шаблоном item_template.
+
+    item_template видит context и элемент под именем item_name, но не
+    переменные контекстных процессоров: они считаются один раз для
+    страницы, а не для каждого элемента.
+    """
+    page = render_to_string(
+        template_name, {**context, slot: mark_safe(SLOT)}, request
+    )
+    head, tail = page.split(SLOT, 1)
+    item_template = get_template(item_template)
+    items = iter(items)
+
+    def content():
+        yield head
+        while True:
+            chunk = list(islice(items, batch))
+            if not chunk:
+                break
+            yield "".join(
+                item_template.render({**context, item_name: item})
+                for item in chunk
+            )
+        yield tail
+
+    return StreamingHttpResponse(content())
+
+
+class StreamSlots:
+    """Не больше, чем указано в настройке setting, потоков на процесс."""
+
+    def __init__(self, setting):
+        self.setting = setting
+        self.active = 0
+        self._lock = threading.Lock()
+
+    def open(self, iterable):
+        """Поток, занимающий слот до close(); None, если слотов нет."""
+        with self._lock:
+            if self.active >= getattr(settings, self.setting):
+                return None
+            self.active += 1
+        return SlotStream(self, iterable)
+
+    def release(self):
+        with self._lock:
+            self.active -= 1
+
+
+class SlotStream:
+    """Итерируемое содержимое ответа, которое освобождает слот в close().
+
+    Ответ закрывает свое содержимое, даже если его не начали перебирать,
+    а finally в так и не запущенном генераторе не выполнится.
+    """
+
+    def __init__(self, slots, iterable):
+        self.slots = slots
+        self.iterable = iterable
+        self.closed = False
+
+    def __iter__(self):
+        return iter(self.iterable)
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            close = getattr(self.iterable, "close", None)
+            if close is not None:
+                close()
+        finally:
+            self.slots.release()
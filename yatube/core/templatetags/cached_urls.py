@@ -0,0 +1,42 @@
+"""Тег cached_url — {% url %} с запоминанием результата.
+
+reverse перебирает шаблоны маршрута и собирает строку при каждом вызове,
+а карточка поста в ленте вызывает его по нескольку раз. Результат зависит
+только от имени маршрута, аргументов, URLconf и префикса скрипта, поэтому
+его можно запомнить в памяти процесса.
+"""
+from functools import lru_cache
+
+from django import template
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.urls import get_script_prefix, get_urlconf, reverse
+
+register = template.Library()
+
+CHROME_SETTINGS = (
+    "ROOT_URLCONF", "STATIC_URL", "STATICFILES_STORAGE", "TEMPLATES",
+)
+
+
+@lru_cache(maxsize=4096)
+def memoized_reverse(viewname, args, urlconf, prefix):
+    return reverse(viewname, args=args, urlconf=urlconf)
+
+
+@register.simple_tag
+def cached_url(viewname, *args):
+    """Как {% url %}, но только с позиционными аргументами."""
+    return memoized_reverse(
+        viewname, tuple(str(arg) for arg in args),
+        get_urlconf(), get_script_prefix(),
+    )
+
+
+@receiver(setting_changed)
+def reset_url_caches(setting, **kwargs):
+    # Фрагменты шапки хранят ссылки и адреса статики (см. includes/header.html)
+    if setting in CHROME_SETTINGS:
+        memoized_reverse.cache_clear()
+        caches["chrome"].clear()
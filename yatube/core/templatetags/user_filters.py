@@ -1,9 +1,64 @@
-from django import template
+from uuid import uuid4
 
+from django import forms, template
+from django.utils.html import conditional_escape
+from django.utils.safestring import mark_safe
 
 register = template.Library()
 
+# Виджеты, разметка которых зависит только от атрибутов и значения.
+# Списки выбора (варианты из базы) и файлы рендерятся как обычно
+MEMOIZED_WIDGETS = (
+    forms.TextInput,
+    forms.EmailInput,
+    forms.URLInput,
+    forms.NumberInput,
+    forms.PasswordInput,
+    forms.Textarea,
+)
+VALUE_SLOT = f"value-{uuid4().hex}"
+
+# (виджет, атрибуты, имя) -> (разметка без значения, части вокруг значения)
+_markup = {}
+
+
+def render_markup(field, widget, attrs):
+    """Отрисовывает виджет без значения и с меткой на месте значения."""
+    empty, slotted = (
+        widget.render(field.html_name, value, attrs, field.form.renderer)
+        for value in (None, VALUE_SLOT)
+    )
+    # Если значение не выводится (PasswordInput), частей будет одна и
+    # join вернет ее без значения
+    return empty, tuple(slotted.split(VALUE_SLOT))
+
 
 @register.filter
 def addclass(field, css):
-    return field.as_widget(attrs={"class": css})
+    """Отрисовывает поле формы с CSS-классом css.
+
+    Разметка простых виджетов отрисовывается шаблоном один раз на процесс,
+    а при каждом вызове в нее подставляется только значение поля.
+    """
+    widget = field.field.widget
+    if type(widget) not in MEMOIZED_WIDGETS or field.field.localize:
+        return field.as_widget(attrs={"class": css})
+    attrs = field.build_widget_attrs({"class": css})
+    if field.auto_id and "id" not in widget.attrs:
+        attrs.setdefault("id", field.auto_id)
+    try:
+        key = (
+            type(widget),
+            frozenset(widget.attrs.items()),
+            frozenset(attrs.items()),
+            field.html_name,
+        )
+        markup = _markup.get(key)
+    except TypeError:
+        return field.as_widget(attrs={"class": css})
+    if markup is None:
+        markup = _markup[key] = render_markup(field, widget, attrs)
+    value = widget.format_value(field.value())
+    if value is None:
+        return mark_safe(markup[0])
+    return mark_safe(conditional_escape(value).join(markup[1]))
@@ -0,0 +1,138 @@
+import asyncio
+import threading
+
+from django.core.wsgi import get_wsgi_application
+from django.test import SimpleTestCase, override_settings
+
+from ..asgi import AsgiHandler
+
+
+def echo_application(environ, start_response):
+    """WSGI-приложение, возвращающее часть окружения запроса."""
+    start_response('201 Created', [('Content-Type', 'text/plain')])
+    body = environ['wsgi.input'].read()
+    yield environ['PATH_INFO'].encode('latin-1')
+    yield f"?{environ['QUERY_STRING']} ".encode()
+    yield environ['HTTP_X_TEST'].encode() + b' ' + body
+
+
+class StreamingApplication:
+    """Бесконечный поток; запоминает потоки, в которых его перебирали."""
+
+    def __init__(self):
+        self.threads = set()
+        self.closed = False
+
+    def __call__(self, environ, start_response):
+        self.threads.add(threading.get_ident())
+        start_response('200 OK', [('Content-Type', 'text/event-stream')])
+        return self
+
+    def __iter__(self):
+        while True:
+            self.threads.add(threading.get_ident())
+            yield b'data: ping\n\n'
+
+    def close(self):
+        self.threads.add(threading.get_ident())
+        self.closed = True
+
+
+def call(application, path, body=b'', query_string=b'', headers=(),
+         disconnect=False):
+    messages = [
+        {'type': 'http.request', 'body': body[:2], 'more_body': True},
+        {'type': 'http.request', 'body': body[2:]},
+    ]
+    if disconnect:
+        messages.append({'type': 'http.disconnect'})
+    sent = []
+
+    async def receive():
+        if messages:
+            return messages.pop(0)
+        # Клиент на связи, пока ответ не отдан
+        await asyncio.Event().wait()
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {
+        'type': 'http',
+        'method': 'POST' if body else 'GET',
+        'path': path,
+        'query_string': query_string,
+        'headers': [(b'host', b'testserver'), *headers],
+    }
+    asyncio.run(application(scope, receive, send))
+    return sent
+
+
+class AsgiHandlerTests(SimpleTestCase):
+    def test_request_passed_to_wsgi(self):
+        """Путь, параметры, заголовки и тело доходят до приложения."""
+        sent = call(
+            AsgiHandler(echo_application, max_workers=1),
+            '/путь/',
+            body=b'body',
+            query_string=b'a=1',
+            headers=[(b'x-test', b'header')],
+        )
+        self.assertEqual(sent[0]['status'], 201)
+        self.assertIn((b'content-type', b'text/plain'), sent[0]['headers'])
+        body = b''.join(message.get('body', b'') for message in sent[1:])
+        self.assertEqual(body.decode(), '/путь/?a=1 header body')
+        self.assertFalse(sent[-1].get('more_body', False))
+
+    def test_django_page(self):
+        """Страница Django отдается через ASGI-обработчик."""
+        sent = call(
+            AsgiHandler(get_wsgi_application(), max_workers=1),
+            '/about/tech/',
+        )
+        self.assertEqual(sent[0]['status'], 200)
+        body = b''.join(message.get('body', b'') for message in sent[1:])
+        self.assertIn('Технологии', body.decode())
+
+    @override_settings(
+        DATA_UPLOAD_MAX_MEMORY_SIZE=10, FILE_UPLOAD_MAX_SIZE=10
+    )
+    def test_large_body_rejected(self):
+        """Тело больше полей формы и файла отклоняется, не доходя до
+        приложения."""
+        application = StreamingApplication()
+        sent = call(
+            AsgiHandler(application, max_workers=1), '/', body=b'x' * 21
+        )
+        self.assertEqual(sent[0]['status'], 413)
+        self.assertFalse(application.threads)
+
+        sent = call(
+            AsgiHandler(application, max_workers=1),
+            '/',
+            body=b'x',
+            headers=[(b'content-length', b'21')],
+        )
+        self.assertEqual(sent[0]['status'], 413)
+
+    @override_settings(DATA_UPLOAD_MAX_MEMORY_SIZE=2)
+    def test_body_spooled_to_file(self):
+        """Тело больше DATA_UPLOAD_MAX_MEMORY_SIZE читается из файла."""
+        sent = call(
+            AsgiHandler(echo_application, max_workers=1),
+            '/',
+            body=b'long body',
+            headers=[(b'x-test', b'header')],
+        )
+        body = b''.join(message.get('body', b'') for message in sent[1:])
+        self.assertTrue(body.endswith(b'long body'))
+
+    def test_stream_stops_on_disconnect(self):
+        """Поток прекращается после отключения клиента, а ответ
+        перебирается и закрывается в одном потоке."""
+        application = StreamingApplication()
+        call(
+            AsgiHandler(application, max_workers=4), '/', disconnect=True
+        )
+        self.assertTrue(application.closed)
+        self.assertEqual(len(application.threads), 1)
@@ -0,0 +1,50 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.template import Context, Template
+from django.test import TestCase
+from django.urls import reverse
+
+from ..templatetags.cached_urls import memoized_reverse
+
+User = get_user_model()
+
+
+class CachedUrlTests(TestCase):
+    def test_same_as_url_tag(self):
+        """cached_url выдает тот же адрес, что и url, и запоминает его."""
+        memoized_reverse.cache_clear()
+        template = Template(
+            "{% load cached_urls %}{% cached_url 'posts:profile' name %}"
+        )
+        for _ in range(2):
+            self.assertEqual(
+                template.render(Context({'name': 'leo'})),
+                reverse('posts:profile', args=['leo']),
+            )
+        self.assertEqual(memoized_reverse.cache_info().hits, 1)
+
+
+class HeaderFragmentTests(TestCase):
+    def setUp(self):
+        caches['chrome'].clear()
+
+    def test_username_not_cached(self):
+        """Кэш шапки общий, но каждый видит в ней свое имя."""
+        for username in ('first', 'second'):
+            self.client.force_login(User.objects.create(username=username))
+            response = self.client.get(reverse('about:author'))
+            self.assertContains(response, f'Пользователь: {username}')
+            self.assertContains(response, 'Выйти')
+
+    def test_keyed_by_page_and_login(self):
+        """Шапка гостя и активная вкладка не берутся из чужого фрагмента."""
+        self.client.force_login(User.objects.create(username='leo'))
+        self.client.get(reverse('about:author'))
+        self.client.logout()
+        response = self.client.get(reverse('about:tech'))
+        self.assertContains(response, 'Войти')
+        self.assertNotContains(response, 'Выйти')
+        self.assertRegex(
+            response.content.decode(),
+            r'active"\s+href="{}"'.format(reverse('about:tech')),
+        )
@@ -0,0 +1,62 @@
+import gzip
+import zlib
+
+from django.http import HttpResponse, StreamingHttpResponse
+from django.middleware.csrf import get_token
+from django.test import RequestFactory, SimpleTestCase
+
+from ..compression import CompressionMiddleware
+
+PAGE = '<p>Лента</p>' * 200
+
+
+class CompressionMiddlewareTests(SimpleTestCase):
+    def respond(self, response, csrf=False, **headers):
+        request = RequestFactory().get(
+            '/', HTTP_ACCEPT_ENCODING='gzip, br', **headers
+        )
+        if csrf:
+            get_token(request)
+        return CompressionMiddleware(lambda request: response)(request)
+
+    def test_html_compressed(self):
+        """Страница сжимается, ETag становится слабым."""
+        page = HttpResponse(PAGE)
+        page['ETag'] = '"abc"'
+        response = self.respond(page)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Vary'], 'Accept-Encoding')
+        self.assertEqual(response['ETag'], 'W/"abc"')
+        self.assertEqual(
+            gzip.decompress(response.content).decode(), PAGE
+        )
+
+    def test_csrf_pages_not_compressed(self):
+        """Страницы с CSRF-токеном не сжимаются (BREACH)."""
+        response = self.respond(HttpResponse(PAGE), csrf=True)
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+    def test_small_and_binary_not_compressed(self):
+        """Короткие ответы и нетекстовые типы отдаются как есть."""
+        for page in (
+            HttpResponse('<p>Лента</p>'),
+            HttpResponse(b'\0' * 4096, content_type='image/png'),
+            StreamingHttpResponse(
+                iter(['data: 1\n\n']), content_type='text/event-stream'
+            ),
+        ):
+            with self.subTest(content_type=page['Content-Type']):
+                response = self.respond(page)
+                self.assertFalse(response.has_header('Content-Encoding'))
+
+    def test_stream_chunks_flushed(self):
+        """Каждая часть потокового ответа сжимается и уходит сразу."""
+        response = self.respond(StreamingHttpResponse(iter(['шапка', PAGE])))
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        decompressor = zlib.decompressobj(31)
+        chunks = iter(response.streaming_content)
+        self.assertEqual(
+            decompressor.decompress(next(chunks)).decode(), 'шапка'
+        )
+        rest = b''.join(decompressor.decompress(chunk) for chunk in chunks)
+        self.assertEqual(rest.decode(), PAGE)
@@ -0,0 +1,46 @@
+from unittest import mock
+
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from ..db import PoolStats, check_connections
+
+
+@override_settings(DB_POOL_SIZE=4, DB_POOL_WARN_SATURATION=0.5)
+class PoolStatsTests(SimpleTestCase):
+    def test_saturation(self):
+        """Заполненность пула считается по одновременным запросам."""
+        stats = PoolStats()
+        stats.request_started()
+        stats.request_started()
+        stats.request_finished()
+        snapshot = stats.snapshot()
+        self.assertEqual(snapshot['requests'], 2)
+        self.assertEqual(snapshot['in_use'], 1)
+        self.assertEqual(snapshot['peak'], 2)
+        self.assertEqual(snapshot['peak_saturation'], 0.5)
+
+    def test_warns_on_saturation(self):
+        """При заполнении пула выше порога пишется предупреждение."""
+        stats = PoolStats()
+        stats.request_started()
+        with self.assertLogs('core.db', 'WARNING'):
+            stats.request_started()
+
+
+@override_settings(DB_HEALTH_CHECK_INTERVAL=0)
+class HealthCheckTests(TestCase):
+    def test_unusable_connection_closed(self):
+        """Неработающее постоянное соединение закрывается до запроса."""
+        connection.ensure_connection()
+        with mock.patch.object(connection, 'is_usable', return_value=False):
+            with mock.patch.object(connection, 'close') as close:
+                check_connections()
+        close.assert_called_once_with()
+
+    def test_usable_connection_kept(self):
+        """Рабочее соединение остается открытым."""
+        connection.ensure_connection()
+        with mock.patch.object(connection, 'close') as close:
+            check_connections()
+        close.assert_not_called()
@@ -0,0 +1,25 @@
+from django.test import SimpleTestCase
+
+from ..pubsub import LocalBroker
+
+
+class LocalBrokerTests(SimpleTestCase):
+    def test_publish_to_subscribers(self):
+        """Сообщение получают только подписчики канала."""
+        broker = LocalBroker()
+        with broker.subscribe(['a', 'b']) as first:
+            with broker.subscribe(['b']) as second:
+                self.assertEqual(broker.publish('a', 1), 1)
+                self.assertEqual(broker.publish('b', 2), 2)
+                self.assertEqual(first.get(timeout=0), ('a', 1))
+                self.assertEqual(first.get(timeout=0), ('b', 2))
+                self.assertEqual(second.get(timeout=0), ('b', 2))
+                self.assertIsNone(second.get(timeout=0))
+
+    def test_closed_subscription(self):
+        """После закрытия подписки сообщения не доставляются."""
+        broker = LocalBroker()
+        subscription = broker.subscribe(['a'])
+        subscription.close()
+        self.assertEqual(broker.publish('a', 1), 0)
+        self.assertIsNone(subscription.get(timeout=0))
@@ -0,0 +1,123 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import (
+    RequestFactory, SimpleTestCase, TestCase, override_settings,
+)
+from django.urls import reverse
+
+from ..ratelimit import CacheBucketStore, client_ip, take
+
+User = get_user_model()
+
+
+class TokenBucketTests(SimpleTestCase):
+    def test_bucket_refills_over_period(self):
+        """Ведро пустеет за capacity запросов и наполняется со временем."""
+        state = None
+        for _ in range(3):
+            state, retry_after = take(state, 3, 60, now=0)
+            self.assertEqual(retry_after, 0)
+        state, retry_after = take(state, 3, 60, now=0)
+        self.assertEqual(retry_after, 20)
+        state, retry_after = take(state, 3, 60, now=20)
+        self.assertEqual(retry_after, 0)
+
+    def test_cache_failure_falls_back_to_memory(self):
+        """При отказе кэша лимит считается в памяти процесса."""
+        store = CacheBucketStore()
+        with mock.patch('django.core.cache.backends.locmem.LocMemCache.add',
+                        side_effect=ConnectionError):
+            self.assertEqual(store.consume('key', 1, 60), (True, 0))
+            self.assertFalse(store.consume('key', 1, 60)[0])
+
+    def test_cache_counter_stops_at_capacity(self):
+        """Счетчик в кэше пропускает ровно capacity запросов за окно."""
+        cache.clear()
+        store = CacheBucketStore()
+        with mock.patch('time.time', return_value=125):
+            allowed = [store.consume('key', 3, 60) for _ in range(5)]
+        self.assertEqual(allowed[:3], [(True, 0)] * 3)
+        self.assertEqual(allowed[3:], [(False, 55)] * 2)
+        with mock.patch('time.time', return_value=180):
+            self.assertEqual(store.consume('key', 3, 60), (True, 0))
+
+    def test_client_ip_behind_proxy(self):
+        """За доверенным прокси IP берется из X-Forwarded-For, а адреса,
+        подставленные клиентом, не учитываются."""
+        request = RequestFactory().get(
+            '/', HTTP_X_FORWARDED_FOR='6.6.6.6, 1.2.3.4',
+            REMOTE_ADDR='10.0.0.1',
+        )
+        self.assertEqual(client_ip(request), '10.0.0.1')
+        with self.settings(RATELIMIT_PROXY_COUNT=1):
+            self.assertEqual(client_ip(request), '1.2.3.4')
+
+
+@override_settings(RATELIMITS={'posts:post_create': '2/m'})
+class RateLimitMiddlewareTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.first = User.objects.create_user(username='first')
+        cls.second = User.objects.create_user(username='second')
+
+    def setUp(self):
+        cache.clear()
+
+    def create_post(self, user):
+        self.client.force_login(user)
+        return self.client.post(reverse('posts:post_create'), {'text': '!'})
+
+    def test_burst_rejected_with_429(self):
+        """Запросы сверх лимита получают 429 и не доходят до базы."""
+        self.create_post(self.first)
+        self.create_post(self.first)
+        with self.assertNumQueries(1):
+            # Только сессия: пользователь не загружается
+            response = self.client.post(
+                reverse('posts:post_create'), {'text': '!'}
+            )
+        self.assertEqual(response.status_code, 429)
+        self.assertIn('Retry-After', response)
+
+    def test_buckets_are_per_user(self):
+        """Лимит одного пользователя не влияет на другого."""
+        self.create_post(self.first)
+        self.create_post(self.first)
+        self.assertEqual(self.create_post(self.second).status_code, 302)
+
+    def test_sessions_of_one_user_share_bucket(self):
+        """Повторный вход не дает пользователю новое ведро."""
+        self.create_post(self.first)
+        self.create_post(self.first)
+        self.client.logout()
+        self.assertEqual(self.create_post(self.first).status_code, 429)
+
+    def test_get_not_limited(self):
+        """Открытие формы не расходует токены."""
+        self.client.force_login(self.first)
+        for _ in range(3):
+            self.client.get(reverse('posts:post_create'))
+        self.assertEqual(self.create_post(self.first).status_code, 302)
+
+    @override_settings(RATELIMITS={'posts:post_create': None})
+    def test_limit_disabled_in_settings(self):
+        """Значение None в RATELIMITS отключает лимит."""
+        for _ in range(3):
+            self.assertEqual(self.create_post(self.first).status_code, 302)
+
+    @override_settings(
+        RATELIMITS={'users:signup': '1/h'}, RATELIMIT_PROXY_COUNT=1
+    )
+    def test_anonymous_limited_per_forwarded_ip(self):
+        """Регистрация считается по IP клиента за прокси, и выдуманная
+        cookie сессии лимит не обходит."""
+        url = reverse('users:signup')
+        self.client.post(url, {}, HTTP_X_FORWARDED_FOR='1.1.1.1')
+        self.client.cookies['sessionid'] = 'made-up'
+        response = self.client.post(url, {}, HTTP_X_FORWARDED_FOR='1.1.1.1')
+        self.assertEqual(response.status_code, 429)
+        response = self.client.post(url, {}, HTTP_X_FORWARDED_FOR='2.2.2.2')
+        self.assertEqual(response.status_code, 200)
@@ -0,0 +1,72 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Post
+
+from ..middleware import PRIMARY_PIN_COOKIE
+
+User = get_user_model()
+
+
+@override_settings(REPLICA_DATABASES=['replica'])
+class ReplicaRoutingTests(TestCase):
+    """Основная база и реплика — два разных файла SQLite, поэтому по
+    содержимому страницы видно, откуда прочитаны данные."""
+
+    databases = {'default', 'replica'}
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='Author')
+        User.objects.using('replica').create(
+            pk=cls.user.pk, username=cls.user.username
+        )
+        Post.objects.create(author=cls.user, text='Пост из основной базы')
+        Post.objects.using('replica').create(
+            author_id=cls.user.pk, text='Пост из реплики'
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_read_only_views_read_replica(self):
+        """Представления read_only читают данные из реплики."""
+        urls = (
+            reverse('posts:index'),
+            reverse('posts:profile', args=(self.user.username,)),
+        )
+        for url in urls:
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertContains(response, 'Пост из реплики')
+                self.assertNotContains(response, 'Пост из основной базы')
+
+    def test_pinned_client_reads_primary(self):
+        """Закрепленный за основной базой клиент читает из нее."""
+        self.client.cookies[PRIMARY_PIN_COOKIE] = '1'
+        response = self.client.get(reverse('posts:index'))
+        self.assertContains(response, 'Пост из основной базы')
+        self.assertNotContains(response, 'Пост из реплики')
+
+    def test_write_pins_client_to_primary(self):
+        """После записи клиент видит свой пост, а не данные реплики."""
+        self.client.force_login(self.user)
+        response = self.client.post(
+            reverse('posts:post_create'), {'text': 'Свежий пост'}
+        )
+        self.assertIn(PRIMARY_PIN_COOKIE, response.cookies)
+        response = self.client.get(
+            reverse('posts:profile', args=(self.user.username,))
+        )
+        self.assertContains(response, 'Свежий пост')
+        self.assertFalse(
+            Post.objects.using('replica').filter(text='Свежий пост').exists()
+        )
+
+    def test_read_does_not_pin_client(self):
+        """Чтение не закрепляет клиента за основной базой."""
+        response = self.client.get(reverse('posts:index'))
+        self.assertNotIn(PRIMARY_PIN_COOKIE, response.cookies)
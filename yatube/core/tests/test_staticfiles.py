@@ -0,0 +1,106 @@
+import gzip
+import os
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from ..staticfiles import brotli
+
+TEMP_STATIC_DIR = tempfile.mkdtemp(dir=settings.BASE_DIR)
+SOURCE_DIR = os.path.join(TEMP_STATIC_DIR, 'source')
+STATIC_ROOT = os.path.join(TEMP_STATIC_DIR, 'collected')
+CSS = b'body { background: url("../img/logo.png"); }\n' * 50
+
+
+@override_settings(
+    STATICFILES_DIRS=[SOURCE_DIR],
+    STATIC_ROOT=STATIC_ROOT,
+    STATICFILES_STORAGE=(
+        'core.staticfiles.CompressedManifestStaticFilesStorage'
+    ),
+)
+class StaticFilesTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        os.makedirs(os.path.join(SOURCE_DIR, 'css'))
+        os.makedirs(os.path.join(SOURCE_DIR, 'img'))
+        with open(os.path.join(SOURCE_DIR, 'css', 'site.css'), 'wb') as css:
+            css.write(CSS)
+        with open(os.path.join(SOURCE_DIR, 'img', 'logo.png'), 'wb') as png:
+            png.write(b'\x89PNG fake')
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_STATIC_DIR, ignore_errors=True)
+
+    def setUp(self):
+        call_command('collectstatic', interactive=False, verbosity=0)
+        self.hashed = staticfiles_storage.url('css/site.css')
+
+    def test_hashed_names_and_variants(self):
+        """collectstatic выдает имена с хэшем и сжатые копии текста."""
+        self.assertRegex(self.hashed, r'^/static/css/site\.[0-9a-f]{12}\.css$')
+        path = os.path.join(STATIC_ROOT, self.hashed[len('/static/'):])
+        with open(path + '.gz', 'rb') as variant:
+            self.assertEqual(
+                gzip.decompress(variant.read()), open(path, 'rb').read()
+            )
+        self.assertEqual(os.path.exists(path + '.br'), brotli is not None)
+        logo = staticfiles_storage.path(
+            staticfiles_storage.stored_name('img/logo.png')
+        )
+        self.assertFalse(os.path.exists(logo + '.gz'))
+
+    def test_hashed_file_cached_forever(self):
+        """Файл с хэшем отдается сжатым и с бессрочным кэшем."""
+        response = self.client.get(self.hashed, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/css')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Vary'], 'Accept-Encoding')
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertEqual(
+            gzip.decompress(b''.join(response.streaming_content))[:4],
+            b'body',
+        )
+
+    def test_plain_without_accept_encoding(self):
+        """Без Accept-Encoding отдается несжатый файл."""
+        response = self.client.get(self.hashed)
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(
+            int(response['Content-Length']),
+            os.path.getsize(os.path.join(
+                STATIC_ROOT, self.hashed[len('/static/'):]
+            )),
+        )
+
+    def test_unhashed_name_short_cache(self):
+        """Имя без хэша кэшируется ненадолго."""
+        response = self.client.get('/static/css/site.css')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Cache-Control'], 'public, max-age=60')
+
+    def test_not_modified(self):
+        """Повторный запрос с If-Modified-Since получает 304."""
+        response = self.client.get(self.hashed)
+        response = self.client.get(
+            self.hashed, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+        )
+        self.assertEqual(response.status_code, 304)
+
+    @override_settings(
+        STATICFILES_STORAGE=(
+            'django.contrib.staticfiles.storage.StaticFilesStorage'
+        ),
+    )
+    def test_unknown_file_passed_through(self):
+        """Запросы мимо собранной статики обрабатывают представления."""
+        response = self.client.get('/static/../manage.py')
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,107 @@
+import os
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.db import IntegrityError
+from django.test import TestCase, TransactionTestCase, override_settings
+
+from posts.models import Post
+from ..models import Blob
+from ..storage import ContentAddressedStorage, LocalS3Client, S3Backend
+
+TEMP_MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+
+User = get_user_model()
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT)
+class ContentAddressedStorageTests(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        self.storage = ContentAddressedStorage()
+
+    def test_same_content_stored_once(self):
+        """Одинаковое содержимое сохраняется одним файлом."""
+        first = self.storage.save('posts/cat.JPG', ContentFile(b'meow'))
+        second = self.storage.save('posts/other.jpg', ContentFile(b'meow'))
+        self.assertEqual(first, second)
+        self.assertRegex(first, r'^posts/[0-9a-f]{2}/[0-9a-f]{2}/'
+                                r'[0-9a-f]{64}\.jpg$')
+        self.assertEqual(Blob.objects.get(name=first).refs, 2)
+        with self.storage.open(first) as stored:
+            self.assertEqual(stored.read(), b'meow')
+
+    def test_same_name_different_content(self):
+        """Одинаковые имена файлов не переименовываются и не путаются."""
+        first = self.storage.save('posts/cat.jpg', ContentFile(b'one'))
+        second = self.storage.save('posts/cat.jpg', ContentFile(b'two'))
+        self.assertNotEqual(first, second)
+
+    def test_file_removed_with_last_reference(self):
+        """Файл удаляется, когда на него не остается ссылок."""
+        name = self.storage.save('posts/cat.jpg', ContentFile(b'meow'))
+        self.storage.save('posts/cat.jpg', ContentFile(b'meow'))
+        self.storage.delete(name)
+        self.assertTrue(self.storage.exists(name))
+        self.storage.delete(name)
+        self.assertFalse(self.storage.exists(name))
+        self.assertFalse(Blob.objects.exists())
+
+    def test_no_staging_leftovers(self):
+        """Временные файлы не остаются после сохранения."""
+        self.storage.save('posts/cat.jpg', ContentFile(b'meow'))
+        self.storage.save('posts/cat.jpg', ContentFile(b'meow'))
+        self.assertEqual(
+            os.listdir(os.path.join(TEMP_MEDIA_ROOT, '.staging')), []
+        )
+
+    def test_s3_backend(self):
+        """S3-бэкенд работает через тот же интерфейс хранилища."""
+        client = LocalS3Client(os.path.join(TEMP_MEDIA_ROOT, 's3'))
+        storage = ContentAddressedStorage(S3Backend(
+            'media', 'https://cdn.example.com/', client=client
+        ))
+        name = storage.save('posts/cat.jpg', ContentFile(b'meow'))
+        self.assertTrue(storage.exists(name))
+        self.assertEqual(storage.size(name), 4)
+        self.assertEqual(storage.url(name), f'https://cdn.example.com/{name}')
+        with storage.open(name) as stored:
+            self.assertEqual(stored.read(), b'meow')
+        storage.delete(name)
+        self.assertFalse(storage.exists(name))
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT)
+class PostImageReferenceTests(TransactionTestCase):
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
+
+    def test_replaced_and_deleted_images_released(self):
+        """Замена и удаление картинки поста отпускают файл."""
+        user = User.objects.create_user(username='author')
+        post = Post(author=user, text='Пост')
+        post.image.save('cat.jpg', ContentFile(b'one'))
+        first = post.image.name
+        post.image.save('cat.jpg', ContentFile(b'two'))
+        self.assertFalse(post.image.storage.exists(first))
+        second = post.image.name
+        post.delete()
+        self.assertFalse(post.image.storage.exists(second))
+        self.assertFalse(Blob.objects.exists())
+
+    def test_failed_save_releases_reference(self):
+        """Ссылка на файл откатывается, если пост не сохранился."""
+        post = Post(author_id=999999, text='Пост')
+        post.image = ContentFile(b'meow', name='cat.jpg')
+        with self.assertRaises(IntegrityError):
+            post.save()
+        self.assertFalse(Blob.objects.exists())
@@ -0,0 +1,51 @@
+from django import forms
+from django.test import TestCase
+
+from posts.forms import CommentForm, PostForm
+from users.forms import CreationForm
+from ..templatetags.user_filters import _markup, addclass
+
+
+class AddclassTests(TestCase):
+    def assertSameMarkup(self, form):
+        for field in form:
+            with self.subTest(field=field.name):
+                self.assertHTMLEqual(
+                    addclass(field, 'form-control'),
+                    field.as_widget(attrs={'class': 'form-control'}),
+                )
+
+    def test_same_markup_as_widget(self):
+        """Разметка совпадает с as_widget для пустых и заполненных форм."""
+        data = {
+            'text': 'Текст <b>с</b> "кавычками" & амперсандом',
+            'username': 'leo', 'email': 'leo@example.com',
+            'first_name': 'Лев', 'password1': 'secret',
+        }
+        for form_class in (PostForm, CommentForm, CreationForm):
+            with self.subTest(form=form_class.__name__):
+                self.assertSameMarkup(form_class())
+                self.assertSameMarkup(form_class(data))
+                self.assertSameMarkup(form_class(data, prefix='other'))
+
+    def test_password_not_rendered(self):
+        """Пароль не попадает в разметку."""
+        form = CreationForm({'password1': 'secret'})
+        self.assertNotIn('secret', addclass(form['password1'], 'x'))
+
+    def test_rendered_once(self):
+        """Шаблон виджета отрисовывается один раз на набор атрибутов."""
+        _markup.clear()
+        for text in ('один', 'два'):
+            form = CommentForm({'text': text})
+            self.assertIn(text, addclass(form['text'], 'form-control'))
+        self.assertEqual(len(_markup), 1)
+
+    def test_choices_rendered_as_usual(self):
+        """Списки выбора не кэшируются."""
+        field = forms.Form()
+        field.fields['kind'] = forms.ChoiceField(choices=[('a', 'A')])
+        self.assertIn('<option value="a">', addclass(field['kind'], 'x'))
+        self.assertFalse(any(
+            key[0] is forms.Select for key in _markup
+        ))
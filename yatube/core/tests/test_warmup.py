@@ -0,0 +1,36 @@
+import copy
+
+from django.conf import settings
+from django.template import engines
+from django.test import SimpleTestCase, override_settings
+
+from ..warmup import warm_templates
+
+
+def cached_templates():
+    templates = copy.deepcopy(settings.TEMPLATES)
+    templates[0]['APP_DIRS'] = False
+    templates[0]['OPTIONS']['loaders'] = [
+        ('django.template.loaders.cached.Loader', [
+            'django.template.loaders.filesystem.Loader',
+            'django.template.loaders.app_directories.Loader',
+        ]),
+    ]
+    return templates
+
+
+class WarmTemplatesTests(SimpleTestCase):
+    @override_settings(TEMPLATES=cached_templates())
+    def test_templates_compiled_into_cache(self):
+        """Шаблоны проекта попадают в кэширующий загрузчик."""
+        self.assertGreater(warm_templates(), 0)
+        loader = engines['django'].engine.template_loaders[0]
+        for name in ('base.html', 'posts/includes/post_list.html',
+                     'posts/includes/paginator.html'):
+            with self.subTest(name=name):
+                self.assertIn(name, loader.get_template_cache)
+
+    @override_settings(DEBUG=True)
+    def test_no_cached_loader(self):
+        """Без кэширующего загрузчика прогрев ничего не делает."""
+        self.assertEqual(warm_templates(), 0)
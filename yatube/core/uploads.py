@@ -0,0 +1,54 @@
+from django.conf import settings
+from django.core.exceptions import RequestDataTooBig
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+
+
+def max_body_size():
+    """Наибольшее тело запроса: поля формы и один файл картинки."""
+    if settings.DATA_UPLOAD_MAX_MEMORY_SIZE is None:
+        return None
+    return settings.DATA_UPLOAD_MAX_MEMORY_SIZE + settings.FILE_UPLOAD_MAX_SIZE
+
+
+class BoundedUploadHandler(TemporaryFileUploadHandler):
+    """Пишет загрузку сразу во временный файл, не держа ее в памяти.
+
+    Запрос длиннее max_body_size() отклоняется ответом 400 до чтения тела.
+    Если файл больше FILE_UPLOAD_MAX_SIZE, но запрос в этих пределах,
+    остаток файла читается из запроса, но не записывается, а у файла
+    выставляется oversized=True: форма отклонит его, не разбирая
+    содержимое (см. posts/forms.py). Остаток дочитывается намеренно: если
+    оборвать чтение (StopUpload(connection_reset=True)), браузер часто
+    показывает обрыв соединения вместо формы с ошибкой.
+    """
+
+    def handle_raw_input(self, input_data, META, content_length, boundary,
+                         encoding=None):
+        limit = max_body_size()
+        if limit is not None and content_length > limit:
+            raise RequestDataTooBig(
+                "Тело запроса больше DATA_UPLOAD_MAX_MEMORY_SIZE и "
+                "FILE_UPLOAD_MAX_SIZE вместе."
+            )
+        return super().handle_raw_input(
+            input_data, META, content_length, boundary, encoding
+        )
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.received = 0
+        self.written = 0
+        self.oversized = False
+
+    def receive_data_chunk(self, raw_data, start):
+        self.received += len(raw_data)
+        if self.received > settings.FILE_UPLOAD_MAX_SIZE:
+            self.oversized = True
+            return None
+        self.written += len(raw_data)
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        file = super().file_complete(self.written)
+        file.oversized = self.oversized
+        return file
@@ -0,0 +1,47 @@
+"""Прогрев воркера перед приемом запросов."""
+import logging
+import os
+
+from django.template import TemplateSyntaxError, engines
+from django.template.backends.django import DjangoTemplates
+from django.template.loaders.cached import Loader as CachedLoader
+
+logger = logging.getLogger(__name__)
+
+
+def project_templates(directory):
+    """Имена всех шаблонов из каталога относительно него."""
+    for root, dirs, files in os.walk(directory):
+        for filename in files:
+            if filename.endswith(".html"):
+                path = os.path.join(root, filename)
+                yield os.path.relpath(path, directory).replace(os.sep, "/")
+
+
+def warm_templates():
+    """Компилирует шаблоны проекта в кэширующий загрузчик.
+
+    Без прогрева первый запрос к каждой странице воркера читает и разбирает
+    base.html, post_list.html и остальные шаблоны с диска. Если кэширующий
+    загрузчик не включен (DEBUG), прогревать нечего.
+    Возвращает число скомпилированных шаблонов.
+    """
+    compiled = 0
+    for backend in engines.all():
+        if not isinstance(backend, DjangoTemplates):
+            continue
+        engine = backend.engine
+        if not any(
+            isinstance(loader, CachedLoader)
+            for loader in engine.template_loaders
+        ):
+            continue
+        for directory in engine.dirs:
+            for name in project_templates(directory):
+                try:
+                    engine.get_template(name)
+                except TemplateSyntaxError:
+                    logger.exception("Не удалось скомпилировать %s", name)
+                else:
+                    compiled += 1
+    return compiled
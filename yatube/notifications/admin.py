@@ -0,0 +1,20 @@
+from django.contrib import admin
+
+from .models import Notification
+
+
+class NotificationAdmin(admin.ModelAdmin):
+    list_display = (
+        "pk",
+        "recipient",
+        "kind",
+        "post",
+        "count",
+        "updated",
+        "sent_at",
+    )
+    list_filter = ("kind", "sent_at")
+    empty_value_display = "-пусто-"
+
+
+admin.site.register(Notification, NotificationAdmin)
@@ -0,0 +1,166 @@
+"""Учет событий и отправка сводных писем.
+
+Новый подписчик увеличивает счетчик в неотправленном уведомлении. Для
+комментариев в базу пишется только первый после письма: остальные строку
+не трогают, а их число и последнего автора send_digests считает по самим
+комментариям. Сотня комментариев к популярному посту — это одна строка,
+ни одной лишней записи и одна строчка в письме. Письмо получателю уходит,
+когда поток событий затих на NOTIFICATIONS_QUIET_SECONDS или первое
+событие ждет дольше NOTIFICATIONS_MAX_DELAY_SECONDS.
+"""
+from datetime import timedelta
+from itertools import groupby
+
+from django.conf import settings
+from django.core.mail import send_mass_mail
+from django.db import IntegrityError, transaction
+from django.db.models import (
+    CharField, Count, DateTimeField, F, IntegerField, OuterRef, Q, Subquery,
+)
+from django.utils import timezone
+
+from posts.models import Comment
+from .models import Notification
+
+SUBJECT = "Новое на Yatube"
+
+
+def record(recipient, kind, actor, post=None):
+    """Учитывает событие в неотправленном уведомлении получателя."""
+    if recipient is None or recipient == actor:
+        return
+    pending = Notification.objects.filter(
+        recipient=recipient, kind=kind, post=post, sent_at__isnull=True
+    )
+    changes = {
+        "count": F("count") + 1,
+        "last_actor": actor,
+        "updated": timezone.now(),
+    }
+    if pending.update(**changes):
+        return
+    try:
+        with transaction.atomic():
+            Notification.objects.create(
+                recipient=recipient, kind=kind, post=post, last_actor=actor
+            )
+    except IntegrityError:
+        # Параллельный запрос успел создать уведомление первым
+        pending.update(**changes)
+
+
+def record_comment(comment):
+    """Отмечает новые комментарии к посту для письма его автору.
+
+    Пишет только первый комментарий после письма; следующие стоят одного
+    чтения и не создают очереди на обновление одной строки.
+    """
+    post = comment.post
+    if post.author_id is None or post.author_id == comment.author_id:
+        return
+    pending = Notification.objects.filter(
+        recipient_id=post.author_id,
+        kind=Notification.COMMENT,
+        post=post,
+        sent_at__isnull=True,
+    )
+    if pending.exists():
+        return
+    try:
+        with transaction.atomic():
+            Notification.objects.create(
+                recipient_id=post.author_id,
+                kind=Notification.COMMENT,
+                post=post,
+                last_actor_id=comment.author_id,
+                created=comment.created,
+            )
+    except IntegrityError:
+        # Параллельный запрос успел создать уведомление первым
+        pass
+
+
+def with_comment_stats(notifications):
+    """Добавляет к уведомлениям о комментариях число комментариев чужих
+    авторов с момента первого события, время и автора последнего."""
+    comments = (
+        Comment.objects.filter(
+            post=OuterRef("post_id"), created__gte=OuterRef("created")
+        )
+        .exclude(author=OuterRef("recipient_id"))
+        .order_by()
+    )
+    latest = comments.order_by("-created", "-pk")
+    return notifications.annotate(
+        comments=Subquery(
+            comments.values("post")
+            .annotate(total=Count("pk"))
+            .values("total"),
+            output_field=IntegerField(),
+        ),
+        last_commenter=Subquery(
+            latest.values("author__username")[:1], output_field=CharField()
+        ),
+        last_comment_at=Subquery(
+            latest.values("created")[:1], output_field=DateTimeField()
+        ),
+    )
+
+
+def describe(notification):
+    """Строчка письма; None, если комментарии с тех пор удалены."""
+    if notification.kind == Notification.COMMENT:
+        if not notification.comments:
+            return None
+        return (
+            f"Пост «{notification.post}»: новых комментариев — "
+            f"{notification.comments}, последний от "
+            f"{notification.last_commenter or 'удаленного пользователя'}."
+        )
+    actor = notification.last_actor or "удаленный пользователь"
+    return f"Новых подписчиков — {notification.count}, последний: {actor}."
+
+
+def send_digests():
+    """Отправляет сводные письма. Возвращает число отправленных писем."""
+    now = timezone.now()
+    quiet = now - timedelta(seconds=settings.NOTIFICATIONS_QUIET_SECONDS)
+    overdue = now - timedelta(
+        seconds=settings.NOTIFICATIONS_MAX_DELAY_SECONDS
+    )
+    # Строка о комментариях не меняется после первого, поэтому затишье
+    # проверяется и по последнему комментарию
+    ready = with_comment_stats(
+        Notification.objects.filter(sent_at__isnull=True)
+    ).filter(
+        Q(updated__lte=quiet)
+        & (Q(last_comment_at__isnull=True) | Q(last_comment_at__lte=quiet))
+        | Q(created__lte=overdue)
+    ).values("recipient")
+    with transaction.atomic():
+        pending = with_comment_stats(
+            Notification.objects.select_for_update()
+            .filter(sent_at__isnull=True, recipient__in=ready)
+            .select_related("recipient", "post", "last_actor")
+            .order_by("recipient_id", "created")
+        )
+        messages = []
+        sent = []
+        for recipient, notifications in groupby(
+            pending, key=lambda notification: notification.recipient
+        ):
+            notifications = list(notifications)
+            sent.extend(notification.pk for notification in notifications)
+            lines = list(filter(None, map(describe, notifications)))
+            if not recipient.email or not lines:
+                continue
+            body = "\n".join(lines)
+            messages.append(
+                (SUBJECT, body, settings.DEFAULT_FROM_EMAIL,
+                 [recipient.email])
+            )
+        Notification.objects.filter(pk__in=sent).update(sent_at=now)
+        # Письма уходят одним соединением; при ошибке транзакция
+        # откатится и уведомления отправятся в следующий раз
+        send_mass_mail(messages)
+    return len(messages)
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from notifications.digest import send_digests
+
+
+class Command(BaseCommand):
+    help = "Отправляет сводные письма с уведомлениями (запускать по cron)."
+
+    def handle(self, *args, **options):
+        sent = send_digests()
+        self.stdout.write(f"Отправлено писем: {sent}")
@@ -0,0 +1,55 @@
+# Generated by Django 2.2.16 on 2026-10-19 09:12
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+def merge_duplicate_pending(apps, schema_editor):
+    """Сводит в одну строку неотправленные уведомления без поста, которые
+    одновременные запросы успели создать дважды."""
+    Notification = apps.get_model('notifications', 'Notification')
+    duplicates = (
+        Notification.objects.filter(sent_at__isnull=True, post__isnull=True)
+        .values('recipient_id', 'kind')
+        .annotate(rows=models.Count('pk'))
+        .filter(rows__gt=1)
+        .order_by()
+    )
+    for duplicate in duplicates:
+        rows = list(
+            Notification.objects.filter(
+                sent_at__isnull=True,
+                post__isnull=True,
+                recipient_id=duplicate['recipient_id'],
+                kind=duplicate['kind'],
+            ).order_by('created')
+        )
+        Notification.objects.filter(
+            pk__in=[row.pk for row in rows[1:]]
+        ).delete()
+        # update, а не save: save перезаписал бы updated (auto_now)
+        Notification.objects.filter(pk=rows[0].pk).update(
+            count=sum(row.count for row in rows),
+            last_actor_id=rows[-1].last_actor_id,
+            updated=max(row.updated for row in rows),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='notification',
+            name='created',
+            field=models.DateTimeField(default=django.utils.timezone.now, verbose_name='Первое событие'),
+        ),
+        migrations.RunPython(merge_duplicate_pending, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='notification',
+            constraint=models.UniqueConstraint(condition=models.Q(('post__isnull', True), ('sent_at__isnull', True)), fields=('recipient', 'kind'), name='unique_pending_notification_without_post'),
+        ),
+    ]
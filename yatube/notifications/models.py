@@ -0,0 +1,74 @@
+from django.contrib.auth import get_user_model
+from django.db import models
+from django.utils import timezone
+
+from posts.models import Post
+
+User = get_user_model()
+
+
+class Notification(models.Model):
+    """Неотправленные события одного вида для одного получателя.
+
+    Пока уведомление не отправлено, новые подписчики увеличивают счетчик
+    в этой же строке, а не создают новые. Комментарии строку не меняют:
+    их число и последнего автора письмо берет из самих комментариев,
+    оставленных начиная с created.
+    """
+
+    COMMENT = "comment"
+    FOLLOW = "follow"
+    KIND_CHOICES = (
+        (COMMENT, "Комментарии"),
+        (FOLLOW, "Подписчики"),
+    )
+
+    recipient = models.ForeignKey(
+        User,
+        related_name="notifications",
+        on_delete=models.CASCADE,
+        verbose_name='Получатель',
+    )
+    kind = models.CharField('Вид', max_length=10, choices=KIND_CHOICES)
+    post = models.ForeignKey(
+        Post,
+        related_name="notifications",
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        verbose_name='Пост',
+    )
+    last_actor = models.ForeignKey(
+        User,
+        related_name="+",
+        on_delete=models.SET_NULL,
+        null=True,
+        verbose_name='Последний автор события',
+    )
+    count = models.PositiveIntegerField('Событий', default=1)
+    created = models.DateTimeField('Первое событие', default=timezone.now)
+    updated = models.DateTimeField('Последнее событие', auto_now=True)
+    sent_at = models.DateTimeField('Отправлено', null=True, blank=True)
+
+    class Meta:
+        ordering = ["created"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["recipient", "kind", "post"],
+                condition=models.Q(sent_at__isnull=True),
+                name="unique_pending_notification",
+            ),
+            # NULL в уникальном индексе не совпадает с другим NULL, поэтому
+            # уведомлениям без поста (о подписчиках) нужен свой индекс
+            models.UniqueConstraint(
+                fields=["recipient", "kind"],
+                condition=models.Q(sent_at__isnull=True, post__isnull=True),
+                name="unique_pending_notification_without_post",
+            ),
+        ]
+        indexes = [models.Index(fields=["sent_at", "updated"])]
+        verbose_name = 'Уведомление'
+        verbose_name_plural = 'Уведомления'
+
+    def __str__(self):
+        return f"{self.get_kind_display()}: {self.count}"
@@ -0,0 +1,24 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from posts.follows import followed
+from posts.models import Comment, Follow
+from .digest import record, record_comment
+from .models import Notification
+
+
+@receiver(post_save, sender=Comment)
+def comment_created(sender, instance, created, **kwargs):
+    if created and instance.post_id is not None:
+        record_comment(instance)
+
+
+@receiver(post_save, sender=Follow)
+def follow_created(sender, instance, created, **kwargs):
+    if created:
+        record(instance.author, Notification.FOLLOW, instance.user)
+
+
+@receiver(followed)
+def follow_added(sender, user, author, **kwargs):
+    record(author, Notification.FOLLOW, user)
@@ -0,0 +1,110 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.db import IntegrityError
+from django.test import TestCase
+from django.utils import timezone
+
+from posts.models import Comment, Follow, Post
+from ..digest import send_digests
+from ..models import Notification
+
+User = get_user_model()
+
+
+class NotificationTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(
+            username='author', email='author@example.com'
+        )
+        cls.readers = [
+            User.objects.create_user(username=f'reader{number}')
+            for number in range(3)
+        ]
+        cls.post = Post.objects.create(author=cls.author, text='Пост')
+
+    def comment(self, user):
+        return Comment.objects.create(post=self.post, author=user, text='!')
+
+    def age(self, seconds):
+        moment = timezone.now() - timedelta(seconds=seconds)
+        Notification.objects.update(created=moment, updated=moment)
+        Comment.objects.update(created=moment)
+
+    def test_comments_collapse_into_one_row(self):
+        """Комментарии к посту дают одно уведомление, и после первого
+        комментария оно не переписывается."""
+        self.comment(self.readers[0])
+        for reader in self.readers[1:]:
+            with self.assertNumQueries(2):
+                # Сам комментарий и проверка уведомления
+                self.comment(reader)
+        notification = Notification.objects.get()
+        self.assertEqual(notification.recipient, self.author)
+        self.assertEqual(notification.last_actor, self.readers[0])
+
+    def test_one_pending_follow_notification(self):
+        """Второе неотправленное уведомление о подписчиках создать нельзя."""
+        Follow.objects.create(user=self.readers[0], author=self.author)
+        with self.assertRaises(IntegrityError):
+            Notification.objects.create(
+                recipient=self.author, kind=Notification.FOLLOW
+            )
+
+    def test_own_comment_ignored(self):
+        """Свой комментарий не создает уведомление."""
+        self.comment(self.author)
+        self.assertFalse(Notification.objects.exists())
+
+    def test_digest_waits_for_quiet_period(self):
+        """Письмо не уходит, пока события продолжаются."""
+        self.comment(self.readers[0])
+        self.assertEqual(send_digests(), 0)
+        self.assertEqual(len(mail.outbox), 0)
+
+    def test_digest_waits_for_quiet_comments(self):
+        """Новые комментарии откладывают письмо, хотя строку
+        уведомления не меняют."""
+        self.comment(self.readers[0])
+        self.age(600)
+        self.comment(self.readers[1])
+        self.assertEqual(send_digests(), 0)
+
+    def test_one_email_per_recipient(self):
+        """Все события получателя приходят одним письмом."""
+        self.comment(self.readers[0])
+        self.comment(self.readers[1])
+        Follow.objects.create(user=self.readers[2], author=self.author)
+        self.age(600)
+        self.assertEqual(send_digests(), 1)
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ['author@example.com'])
+        self.assertEqual(
+            mail.outbox[0].body.splitlines(),
+            [
+                'Пост «Пост»: новых комментариев — 2, последний от reader1.',
+                'Новых подписчиков — 1, последний: reader2.',
+            ],
+        )
+        self.assertFalse(
+            Notification.objects.filter(sent_at__isnull=True).exists()
+        )
+        self.assertEqual(send_digests(), 0)
+
+    def test_new_events_after_digest_start_new_row(self):
+        """После отправки события копятся в новом уведомлении."""
+        self.comment(self.readers[0])
+        self.age(600)
+        send_digests()
+        self.comment(self.readers[1])
+        self.assertEqual(Notification.objects.count(), 2)
+        pending = Notification.objects.filter(sent_at__isnull=True)
+        self.assertEqual(pending.get().last_actor, self.readers[1])
+        moment = timezone.now() - timedelta(seconds=400)
+        Comment.objects.filter(author=self.readers[1]).update(created=moment)
+        pending.update(created=moment, updated=moment)
+        self.assertEqual(send_digests(), 1)
+        self.assertIn('новых комментариев — 1,', mail.outbox[-1].body)
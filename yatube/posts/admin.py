@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import Comment, Follow, Group, Post
+from .models import Comment, Follow, Group, GroupStats, Post
 
 
 class PostAdmin(admin.ModelAdmin):
@@ -10,12 +10,17 @@ class PostAdmin(admin.ModelAdmin):
         "pub_date",
         "author",
         "group",
+        "deleted_at",
     )
     list_editable = ("group",)
     search_fields = ("text",)
-    list_filter = ("pub_date",)
+    list_filter = ("pub_date", "deleted_at")
     empty_value_display = "-пусто-"
 
+    def get_queryset(self, request):
+        # В админке видны и удаленные посты
+        return Post.all_objects.all()
+
 
 class GroupAdmin(admin.ModelAdmin):
     list_display = ("title", "description")
@@ -54,3 +59,16 @@ class FollowAdmin(admin.ModelAdmin):
 
 
 admin.site.register(Follow, FollowAdmin)
+
+
+class GroupStatsAdmin(admin.ModelAdmin):
+    list_display = (
+        "group",
+        "posts",
+        "authors",
+        "last_post_at",
+    )
+    empty_value_display = "-пусто-"
+
+
+admin.site.register(GroupStats, GroupStatsAdmin)
@@ -6,3 +6,6 @@ from django.apps import AppConfig
 class PostsConfig(AppConfig):
     name = "posts"
     verbose_name = "Управление постами"
+
+    def ready(self):
+        from . import signals  # noqa: F401
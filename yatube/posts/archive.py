@@ -0,0 +1,85 @@
+"""Перенос старых постов из горячих таблиц в архивные.
+
+Ленты, профили и индексы работают только с таблицей Post. Она растет
+лишь на посты за последние ARCHIVE_AFTER_MONTHS месяцев, а архивные
+посты открываются только по постоянной ссылке.
+"""
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import ArchivedComment, ArchivedPost, Comment, Post
+
+
+def archive_comments(post_ids):
+    """Переносит в архив комментарии постов. Возвращает их число."""
+    comments = list(
+        Comment.objects.select_for_update().filter(post_id__in=post_ids)
+    )
+    ArchivedComment.objects.bulk_create(
+        ArchivedComment(
+            id=comment.pk,
+            post_id=comment.post_id,
+            author_id=comment.author_id,
+            text=comment.text,
+            created=comment.created,
+        )
+        for comment in comments
+    )
+    Comment.objects.filter(
+        pk__in=[comment.pk for comment in comments]
+    ).delete()
+    return len(comments)
+
+
+def archive_batch(before, batch):
+    with transaction.atomic():
+        # Блокировка строк постов задерживает новые комментарии к ним
+        # (проверка внешнего ключа ждет ее) до конца переноса, а после
+        # удаления поста такие комментарии отклоняются
+        posts = list(
+            Post.all_objects.select_for_update()
+            .filter(pub_date__lt=before).order_by("pk")[:batch]
+        )
+        if not posts:
+            return 0
+        ids = [post.pk for post in posts]
+        ArchivedPost.objects.bulk_create(
+            ArchivedPost(
+                id=post.pk,
+                text=post.text,
+                pub_date=post.pub_date,
+                author_id=post.author_id,
+                group_id=post.group_id,
+                image=post.image.name,
+                deleted_at=post.deleted_at,
+            )
+            for post in posts
+        )
+        for post in posts:
+            # Архивный пост держит свою ссылку на файл картинки: ссылку
+            # исходного поста отпустит его удаление
+            retain = getattr(post.image.storage, "retain", None)
+            if post.image and retain is not None:
+                retain(post.image.name)
+        # Комментарии удаляются первыми: иначе удаление поста обнулит
+        # у них ссылку на пост (on_delete=SET_NULL), и они потеряются.
+        # Удаляются ровно перенесенные строки; если за это время
+        # появились новые, переносятся и они, пока у постов не останется
+        # ни одного комментария
+        while archive_comments(ids):
+            pass
+        Post.all_objects.filter(pk__in=ids).delete()
+    return len(ids)
+
+
+def archive_posts(months, batch=500):
+    """Архивирует посты старше months месяцев. Возвращает их число."""
+    before = timezone.now() - timedelta(days=30 * months)
+    archived = 0
+    while True:
+        done = archive_batch(before, batch)
+        if not done:
+            return archived
+        archived += done
@@ -0,0 +1,57 @@
+"""Подписка и отписка одним запросом к базе.
+
+follow — это INSERT, который пропускает уже существующую пару благодаря
+ограничению unique_following: INSERT OR IGNORE в SQLite, INSERT … ON
+CONFLICT DO NOTHING в PostgreSQL. unfollow — это один DELETE. Оба можно
+повторять, и одновременные запросы не мешают друг другу. Нет ни проверки
+перед записью, которую параллельный запрос может опередить, ни
+IntegrityError.
+
+Сигналы post_save/post_delete при этом не посылаются, поэтому о новой
+подписке сообщает сигнал followed (им пользуются уведомления).
+"""
+from django.db import connections, router
+from django.dispatch import Signal
+from django.utils import timezone
+
+from .models import Follow
+
+followed = Signal(providing_args=["user", "author"])
+
+
+def follow(user, author):
+    """Подписывает user на author. True, если подписка новая."""
+    if user.pk is None or user.pk == author.pk:
+        return False
+    connection = connections[router.db_for_write(Follow)]
+    meta = Follow._meta
+    qn = connection.ops.quote_name
+    columns = [meta.get_field(name) for name in ("user", "author", "created")]
+    sql = "{insert} {table} ({columns}) VALUES (%s, %s, %s){suffix}".format(
+        insert=connection.ops.insert_statement(ignore_conflicts=True),
+        table=qn(meta.db_table),
+        columns=", ".join(qn(field.column) for field in columns),
+        suffix=connection.ops.ignore_conflicts_suffix_sql(
+            ignore_conflicts=True
+        ),
+    )
+    created = columns[2].get_db_prep_save(timezone.now(), connection)
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [user.pk, author.pk, created])
+        inserted = cursor.rowcount == 1
+    if inserted:
+        followed.send(sender=Follow, user=user, author=author)
+    return inserted
+
+
+def unfollow(user, author):
+    """Отписывает user от author. True, если подписка была.
+
+    У Follow нет зависимых моделей и обработчиков удаления, поэтому
+    queryset.delete() выполняется одним DELETE без предварительной
+    выборки.
+    """
+    deleted, _ = Follow.objects.filter(
+        user_id=user.pk, author_id=author.pk
+    ).delete()
+    return deleted > 0
@@ -1,7 +1,26 @@
 from django import forms
+from django.conf import settings
+from django.core.files.uploadedfile import UploadedFile
+from django.template.defaultfilters import filesizeformat
+
+from .group_choices import cached_groups
+from .images import check_image, make_placeholder, normalize_image
 from .models import Post, Comment, Follow
 
 
+class CachedGroupChoices(forms.models.ModelChoiceIterator):
+    """Варианты поля group из кэша групп вместо запроса к базе."""
+
+    def __iter__(self):
+        if self.field.empty_label is not None:
+            yield ("", self.field.empty_label)
+        for group in cached_groups():
+            yield self.choice(group)
+
+    def __len__(self):
+        return len(cached_groups()) + (self.field.empty_label is not None)
+
+
 class PostForm(forms.ModelForm):
     class Meta:
         model = Post
@@ -11,6 +30,37 @@ class PostForm(forms.ModelForm):
             "text": "Текст нового поста",
         }
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        group = self.fields["group"]
+        group.iterator = CachedGroupChoices
+        group.widget.choices = group.choices
+        # Обрезанный обработчиком загрузки файл не разбираем как картинку
+        self.oversized = {
+            name for name, file in self.files.items()
+            if getattr(file, "oversized", False)
+        }
+        if self.oversized:
+            self.files = self.files.copy()
+            for name in self.oversized:
+                del self.files[name]
+
+    def clean_image(self):
+        image = self.cleaned_data.get("image")
+        if "image" in self.oversized:
+            raise forms.ValidationError(
+                f"Файл больше {filesizeformat(settings.FILE_UPLOAD_MAX_SIZE)}."
+            )
+        if image is False:
+            # Картинку удалили — заглушка тоже не нужна
+            self.instance.placeholder = ""
+        if not isinstance(image, UploadedFile):
+            return image
+        check_image(image)
+        image = normalize_image(image)
+        self.instance.placeholder = make_placeholder(image)
+        return image
+
 
 class CommentForm(forms.ModelForm):
     class Meta:
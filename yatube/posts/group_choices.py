@@ -0,0 +1,42 @@
+"""Список групп для форм и страниц создания поста.
+
+Группы меняются редко, а нужны каждой форме поста, поэтому список
+хранится в памяти процесса вместе с номером версии. Сама версия лежит в
+общем кэше: сохранение или удаление группы меняет ее (см. signals.py), и
+каждый воркер при следующем обращении перечитывает группы из базы.
+Проверка версии — одно чтение из кэша вместо запроса к базе.
+"""
+from uuid import uuid4
+
+from django.core.cache import cache
+
+from .models import Group
+
+VERSION_KEY = "posts:groups:version"
+
+# (версия, группы); присваивается целиком, поэтому потоки видят
+# согласованную пару
+_cached = (None, ())
+
+
+def current_version():
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, uuid4().hex, None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def cached_groups():
+    """Все группы как кортеж, из базы — только после смены версии."""
+    global _cached
+    version = current_version()
+    cached_version, groups = _cached
+    if version is None or version != cached_version:
+        groups = tuple(Group.objects.all())
+        _cached = (version, groups)
+    return groups
+
+
+def invalidate():
+    cache.set(VERSION_KEY, uuid4().hex, None)
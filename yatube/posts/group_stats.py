@@ -0,0 +1,98 @@
+"""Инкрементальное обновление статистики групп (GroupStats).
+
+Каждая функция меняет счетчики относительными UPDATE в одной
+транзакции, поэтому одновременные публикации не теряют друг друга.
+Если счетчики разошлись с данными (например, после массовых правок через
+queryset.update, которые не посылают сигналов), их пересчитывает
+python manage.py rebuild_group_stats.
+"""
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Max
+from django.db.models.functions import Coalesce, Greatest
+
+from .models import GroupAuthor, GroupStats, Post
+
+
+def add_post(group_id, author_id, pub_date):
+    with transaction.atomic():
+        GroupStats.objects.get_or_create(group_id=group_id)
+        new_author = 0
+        if author_id is not None:
+            authors = GroupAuthor.objects.filter(
+                group_id=group_id, author_id=author_id
+            )
+            if not authors.update(posts=F("posts") + 1):
+                try:
+                    with transaction.atomic():
+                        GroupAuthor.objects.create(
+                            group_id=group_id, author_id=author_id, posts=1
+                        )
+                except IntegrityError:
+                    authors.update(posts=F("posts") + 1)
+                else:
+                    new_author = 1
+        GroupStats.objects.filter(group_id=group_id).update(
+            posts=F("posts") + 1,
+            authors=F("authors") + new_author,
+            last_post_at=Greatest(
+                Coalesce("last_post_at", pub_date), pub_date
+            ),
+        )
+
+
+def remove_post(group_id, author_id, pub_date):
+    with transaction.atomic():
+        stats = GroupStats.objects.select_for_update().filter(
+            group_id=group_id
+        ).first()
+        if stats is None:
+            return
+        stats.posts = max(stats.posts - 1, 0)
+        if author_id is not None:
+            authors = GroupAuthor.objects.filter(
+                group_id=group_id, author_id=author_id
+            )
+            authors.update(posts=F("posts") - 1)
+            if authors.filter(posts=0).delete()[0]:
+                stats.authors = max(stats.authors - 1, 0)
+        if stats.last_post_at is not None and pub_date >= stats.last_post_at:
+            # Ушел самый свежий пост — берем следующий по дате
+            stats.last_post_at = Post.objects.filter(
+                group_id=group_id
+            ).aggregate(latest=Max("pub_date"))["latest"]
+        stats.save()
+
+
+def rebuild():
+    """Пересчитывает статистику всех групп по таблице постов."""
+    with transaction.atomic():
+        GroupAuthor.objects.all().delete()
+        GroupStats.objects.all().delete()
+        rows = (
+            Post.objects.filter(group__isnull=False)
+            .values("group_id", "author_id")
+            .annotate(posts=Count("pk"), latest=Max("pub_date"))
+            .order_by()
+        )
+        stats = {}
+        authors = []
+        for row in rows:
+            group_stats = stats.setdefault(
+                row["group_id"], GroupStats(group_id=row["group_id"])
+            )
+            group_stats.posts += row["posts"]
+            if row["author_id"] is not None:
+                group_stats.authors += 1
+                authors.append(GroupAuthor(
+                    group_id=row["group_id"],
+                    author_id=row["author_id"],
+                    posts=row["posts"],
+                ))
+            if (
+                group_stats.last_post_at is None
+                or row["latest"] > group_stats.last_post_at
+            ):
+                group_stats.last_post_at = row["latest"]
+        GroupStats.objects.bulk_create(stats.values())
+        GroupAuthor.objects.bulk_create(authors)
+    return len(stats)
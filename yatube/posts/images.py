@@ -0,0 +1,89 @@
+"""Проверка и нормализация загруженных картинок.
+
+Размеры проверяются по заголовку файла, без декодирования пикселей,
+поэтому «бомба» из сжатой картинки огромного размера отклоняется сразу.
+Декодируются только картинки не больше IMAGE_MAX_PIXELS, так что память
+на нормализацию ограничена: IMAGE_MAX_PIXELS * 4 байта.
+"""
+import base64
+import io
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import TemporaryUploadedFile
+from PIL import Image, ImageOps
+
+# Форматы, из которых убираются метаданные. GIF хранится как есть:
+# пересохранение потеряло бы анимацию, а EXIF в нем не бывает.
+NORMALIZED_FORMATS = {"JPEG", "PNG", "WEBP"}
+METADATA_KEYS = {"exif", "comment", "XML:com.adobe.xmp", "xmp"}
+ORIENTATION = 0x0112
+# Заглушка повторяет кадрирование превью 960x339 из post_list.html
+PLACEHOLDER_SIZE = (32, 11)
+
+
+def check_image(file):
+    """Проверяет размеры картинки по заголовку."""
+    file.seek(0)
+    with Image.open(file) as image:
+        width, height = image.size
+    file.seek(0)
+    if width * height > settings.IMAGE_MAX_PIXELS:
+        raise ValidationError(
+            f"Картинка {width}×{height} слишком большая: допускается не "
+            f"больше {settings.IMAGE_MAX_PIXELS // 1_000_000} Мпикс."
+        )
+
+
+def normalize_image(file):
+    """Поворачивает картинку по EXIF и убирает метаданные (GPS и т.п.).
+
+    Возвращает новый временный файл или исходный, если менять нечего.
+    """
+    file.seek(0)
+    with Image.open(file) as image:
+        if image.format not in NORMALIZED_FORMATS:
+            file.seek(0)
+            return file
+        orientation = image.getexif().get(ORIENTATION, 1)
+        if orientation == 1 and not METADATA_KEYS & image.info.keys():
+            file.seek(0)
+            return file
+        options = {"exif": b""}
+        if image.info.get("icc_profile"):
+            options["icc_profile"] = image.info["icc_profile"]
+        if orientation == 1:
+            normalized = image
+            if image.format == "JPEG":
+                # Без поворота таблицы квантования сохраняются как были
+                options["quality"] = "keep"
+        else:
+            normalized = ImageOps.exif_transpose(image)
+            if image.format == "JPEG":
+                options["quality"] = 90
+        result = TemporaryUploadedFile(
+            file.name, file.content_type, 0, None
+        )
+        normalized.save(result, format=image.format, **options)
+    result.size = result.tell()
+    result.seek(0)
+    return result
+
+
+def make_placeholder(file):
+    """Крошечное размытое превью картинки в виде data URI (~300-600 байт).
+
+    Карточка показывает его фоном, пока браузер лениво грузит картинку.
+    """
+    file.seek(0)
+    with Image.open(file) as image:
+        # JPEG декодируется сразу в уменьшенном масштабе
+        image.draft("RGB", (PLACEHOLDER_SIZE[0] * 4, PLACEHOLDER_SIZE[1] * 4))
+        preview = ImageOps.fit(
+            ImageOps.exif_transpose(image).convert("RGB"), PLACEHOLDER_SIZE
+        )
+    file.seek(0)
+    buffer = io.BytesIO()
+    preview.save(buffer, "JPEG", quality=40)
+    encoded = base64.b64encode(buffer.getvalue()).decode("ascii")
+    return f"data:image/jpeg;base64,{encoded}"
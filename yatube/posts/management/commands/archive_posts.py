@@ -0,0 +1,22 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from posts.archive import archive_posts
+
+
+class Command(BaseCommand):
+    help = "Переносит старые посты с комментариями в архивные таблицы."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--months", type=int, default=settings.ARCHIVE_AFTER_MONTHS,
+            help="Архивировать посты старше стольких месяцев.",
+        )
+        parser.add_argument(
+            "--batch", type=int, default=500,
+            help="Сколько постов переносить за одну транзакцию.",
+        )
+
+    def handle(self, *args, **options):
+        archived = archive_posts(options["months"], options["batch"])
+        self.stdout.write(f"Перенесено в архив постов: {archived}")
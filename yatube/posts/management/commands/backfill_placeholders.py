@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from posts.models import Post
+from posts.tasks import make_thumbnail
+
+
+class Command(BaseCommand):
+    help = (
+        "Ставит в очередь превью и заглушки для постов с картинкой, "
+        "у которых заглушки еще нет."
+    )
+
+    def handle(self, *args, **options):
+        post_ids = (
+            Post.objects.exclude(image="")
+            .filter(placeholder="")
+            .values_list("pk", flat=True)
+            .iterator()
+        )
+        queued = 0
+        for post_id in post_ids:
+            make_thumbnail.delay(post_id)
+            queued += 1
+        self.stdout.write(f"Поставлено в очередь постов: {queued}")
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from posts.group_stats import rebuild
+
+
+class Command(BaseCommand):
+    help = "Пересчитывает статистику групп по таблице постов."
+
+    def handle(self, *args, **options):
+        groups = rebuild()
+        self.stdout.write(f"Пересчитано групп: {groups}")
@@ -0,0 +1,79 @@
+# Generated by Django 2.2.16 on 2026-10-19 08:28
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def fill_group_stats(apps, schema_editor):
+    """Статистика для групп, в которых уже есть посты."""
+    Post = apps.get_model('posts', 'Post')
+    GroupStats = apps.get_model('posts', 'GroupStats')
+    GroupAuthor = apps.get_model('posts', 'GroupAuthor')
+    rows = (
+        Post.objects.filter(group__isnull=False)
+        .values('group_id', 'author_id')
+        .annotate(count=models.Count('pk'), latest=models.Max('pub_date'))
+        .order_by()
+    )
+    stats = {}
+    for row in rows:
+        group_stats = stats.setdefault(
+            row['group_id'], GroupStats(group_id=row['group_id'])
+        )
+        group_stats.posts += row['count']
+        if row['author_id'] is not None:
+            group_stats.authors += 1
+            GroupAuthor.objects.create(
+                group_id=row['group_id'],
+                author_id=row['author_id'],
+                posts=row['count'],
+            )
+        if (
+            group_stats.last_post_at is None
+            or row['latest'] > group_stats.last_post_at
+        ):
+            group_stats.last_post_at = row['latest']
+    GroupStats.objects.bulk_create(stats.values())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('posts', '0006_auto_20230422_1707'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GroupStats',
+            fields=[
+                ('group', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='posts.Group', verbose_name='Группа')),
+                ('posts', models.PositiveIntegerField(default=0, verbose_name='Постов')),
+                ('authors', models.PositiveIntegerField(default=0, verbose_name='Авторов')),
+                ('last_post_at', models.DateTimeField(null=True, verbose_name='Последний пост')),
+            ],
+            options={
+                'verbose_name': 'статистика группы',
+                'verbose_name_plural': 'статистика групп',
+            },
+        ),
+        migrations.CreateModel(
+            name='GroupAuthor',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('posts', models.PositiveIntegerField(default=0, verbose_name='Постов')),
+                ('author', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='Автор')),
+                ('group', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='group_authors', to='posts.Group', verbose_name='Группа')),
+            ],
+            options={
+                'verbose_name': 'автор группы',
+                'verbose_name_plural': 'авторы групп',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='groupauthor',
+            constraint=models.UniqueConstraint(fields=('group', 'author'), name='unique_group_author'),
+        ),
+        migrations.RunPython(fill_group_stats, migrations.RunPython.noop),
+    ]
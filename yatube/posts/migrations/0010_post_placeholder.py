@@ -0,0 +1,18 @@
+# Generated by Django 2.2.16 on 2026-10-19 08:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0009_auto_20261019_0835'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='placeholder',
+            field=models.TextField(blank=True, editable=False, help_text='data URI, показывается, пока грузится картинка', verbose_name='Размытое превью картинки'),
+        ),
+    ]
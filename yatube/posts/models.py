@@ -1,5 +1,5 @@
 from django.contrib.auth import get_user_model
-from django.db import models
+from django.db import models, transaction
 from posts.validators import validate_not_empty
 
 User = get_user_model()
@@ -20,6 +20,13 @@ class Group(models.Model):
         return self.title
 
 
+class PostManager(models.Manager):
+    """Посты без удаленных: их видят ленты, профили и группы."""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
+
 class Post(models.Model):
     text = models.TextField('Текст записи', help_text='Текст вашей записи')
     pub_date = models.DateTimeField(
@@ -49,15 +56,39 @@ class Post(models.Model):
         upload_to='posts/',
         blank=True
     )
+    placeholder = models.TextField(
+        'Размытое превью картинки',
+        blank=True,
+        editable=False,
+        help_text='data URI, показывается, пока грузится картинка',
+    )
+    deleted_at = models.DateTimeField('Удален', null=True, blank=True)
+
+    objects = PostManager()
+    all_objects = models.Manager()
 
     class Meta:
         ordering = ["-pub_date"]
+        indexes = [
+            # Ленты читают только неудаленные посты по дате
+            models.Index(
+                fields=["-pub_date"],
+                name="post_live_pub_date_idx",
+                condition=models.Q(deleted_at__isnull=True),
+            ),
+        ]
         verbose_name = 'Пост'
         verbose_name_plural = 'Посты'
 
     def __str__(self):
         return self.text[:CUT_TEXT]
 
+    def save(self, *args, **kwargs):
+        # Новая картинка сохраняется в хранилище (и получает ссылку в
+        # Blob) внутри записи поста: при ошибке откатится и ссылка
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
 
 class Comment(models.Model):
     post = models.ForeignKey(
@@ -105,6 +136,13 @@ class Follow(models.Model):
         on_delete=models.CASCADE, null=True,
         verbose_name='Отслеживается',
     )
+    # У подписок, оформленных до появления поля, дата неизвестна (NULL):
+    # сводки активности (activity/rollups.py) их не учитывают
+    created = models.DateTimeField(
+        auto_now_add=True,
+        null=True,
+        verbose_name='Дата подписки',
+    )
 
     class Meta:
         constraints = [
@@ -122,3 +160,126 @@ class Follow(models.Model):
 
     def __str__(self):
         return self.author
+
+
+class GroupStats(models.Model):
+    """Сводка по группе для каталога групп.
+
+    Поддерживается сигналами при создании, переносе между группами и
+    удалении постов (см. posts/group_stats.py), поэтому каталог не считает
+    посты каждой группы на лету.
+    """
+
+    group = models.OneToOneField(
+        Group,
+        related_name="stats",
+        on_delete=models.CASCADE,
+        primary_key=True,
+        verbose_name='Группа',
+    )
+    posts = models.PositiveIntegerField('Постов', default=0)
+    authors = models.PositiveIntegerField('Авторов', default=0)
+    last_post_at = models.DateTimeField('Последний пост', null=True)
+
+    class Meta:
+        verbose_name = 'статистика группы'
+        verbose_name_plural = 'статистика групп'
+
+    def __str__(self):
+        return f"{self.group_id}: {self.posts}"
+
+
+class GroupAuthor(models.Model):
+    """Сколько постов автор опубликовал в группе."""
+
+    group = models.ForeignKey(
+        Group,
+        related_name="group_authors",
+        on_delete=models.CASCADE,
+        verbose_name='Группа',
+    )
+    author = models.ForeignKey(
+        User,
+        related_name="+",
+        on_delete=models.CASCADE,
+        verbose_name='Автор',
+    )
+    posts = models.PositiveIntegerField('Постов', default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["group", "author"],
+                name="unique_group_author"
+            ),
+        ]
+        verbose_name = 'автор группы'
+        verbose_name_plural = 'авторы групп'
+
+    def __str__(self):
+        return f"{self.group_id}/{self.author_id}: {self.posts}"
+
+
+class ArchivedPost(models.Model):
+    """Старый пост, перенесенный из горячей таблицы командой archive_posts.
+
+    id совпадает с id исходного поста, поэтому постоянные ссылки на пост
+    продолжают работать.
+    """
+
+    id = models.IntegerField(primary_key=True)
+    text = models.TextField('Текст записи')
+    pub_date = models.DateTimeField('Дата публикации')
+    author = models.ForeignKey(
+        User,
+        null=True,
+        on_delete=models.CASCADE,
+        related_name="archived_posts",
+        verbose_name='Автор'
+    )
+    group = models.ForeignKey(
+        Group,
+        null=True,
+        on_delete=models.SET_NULL,
+        related_name="+",
+        verbose_name='Сообщество',
+    )
+    image = models.ImageField('Картинка', upload_to='posts/', blank=True)
+    deleted_at = models.DateTimeField('Удален', null=True, blank=True)
+    archived_at = models.DateTimeField('В архиве с', auto_now_add=True)
+
+    class Meta:
+        verbose_name = 'Архивный пост'
+        verbose_name_plural = 'Архивные посты'
+
+    def __str__(self):
+        return self.text[:CUT_TEXT]
+
+
+class ArchivedComment(models.Model):
+    """Комментарий архивного поста."""
+
+    id = models.IntegerField(primary_key=True)
+    post = models.ForeignKey(
+        ArchivedPost,
+        related_name="comments",
+        on_delete=models.CASCADE,
+        verbose_name='Пост',
+    )
+    author = models.ForeignKey(
+        User,
+        null=True,
+        on_delete=models.CASCADE,
+        related_name="+",
+        verbose_name='Автор комментария',
+    )
+    text = models.TextField('Комментарий')
+    created = models.DateTimeField('Дата публикации')
+
+    class Meta:
+        ordering = ['-created']
+        verbose_name = 'Архивный комментарий'
+        verbose_name_plural = 'Архивные комментарии'
+
+    def __str__(self):
+        return self.text[:CUT_TEXT]
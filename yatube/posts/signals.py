@@ -0,0 +1,120 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from core.pubsub import get_broker
+from . import group_choices, group_stats
+from .models import ArchivedPost, Group, Post
+from .tasks import make_thumbnail
+
+
+def author_channel(author_id):
+    """Канал событий о новых постах автора."""
+    return f"posts:author:{author_id}"
+
+
+@receiver(post_save, sender=Post)
+def publish_new_post(sender, instance, created, **kwargs):
+    """Сообщает подписчикам автора о новом посте после коммита."""
+    if not created or instance.author_id is None:
+        return
+    channel = author_channel(instance.author_id)
+    message = {"id": instance.pk, "author": instance.author_id}
+    transaction.on_commit(lambda: get_broker().publish(channel, message))
+
+
+@receiver(post_save, sender=Post)
+def schedule_thumbnail(sender, instance, update_fields=None, **kwargs):
+    """Превью картинки строится в фоне, а не в запросе читателя."""
+    if update_fields is not None and "image" not in update_fields:
+        return
+    if instance.image:
+        make_thumbnail.delay(instance.pk)
+
+
+# Поля, от которых зависят обработчики post_save ниже
+TRACKED_FIELDS = frozenset(("group", "group_id", "deleted_at", "image"))
+
+
+@receiver(pre_save, sender=Post)
+def remember_saved_state(sender, instance, update_fields=None, **kwargs):
+    """Запоминает группу, в которой пост учтен сейчас, и его картинку.
+
+    При правке группу и картинку могут сменить, а удаленный пост
+    не учитывается ни в какой группе. Сохранение только других полей
+    (update_fields) их не меняет, и лишний SELECT не нужен.
+    """
+    instance._saved_group_id = None
+    instance._saved_image = ""
+    if instance.pk is None:
+        return
+    if update_fields is not None and not TRACKED_FIELDS & update_fields:
+        instance._saved_group_id = counted_group(instance)
+        return
+    saved = (
+        Post.all_objects.filter(pk=instance.pk)
+        .values_list("group_id", "deleted_at", "image")
+        .first()
+    )
+    if saved is not None:
+        group_id, deleted_at, instance._saved_image = saved
+        if deleted_at is None:
+            instance._saved_group_id = group_id
+
+
+def release_image(storage, name):
+    """Отпускает файл картинки после коммита транзакции."""
+    if name:
+        transaction.on_commit(lambda: storage.delete(name))
+
+
+def counted_group(post):
+    return post.group_id if post.deleted_at is None else None
+
+
+@receiver(post_save, sender=Post)
+def count_post_in_group(sender, instance, **kwargs):
+    old_group_id = getattr(instance, "_saved_group_id", None)
+    new_group_id = counted_group(instance)
+    if old_group_id == new_group_id:
+        return
+    if old_group_id is not None:
+        group_stats.remove_post(
+            old_group_id, instance.author_id, instance.pub_date
+        )
+    if new_group_id is not None:
+        group_stats.add_post(
+            new_group_id, instance.author_id, instance.pub_date
+        )
+
+
+@receiver(post_delete, sender=Post)
+def uncount_post_in_group(sender, instance, **kwargs):
+    if counted_group(instance) is not None:
+        group_stats.remove_post(
+            instance.group_id, instance.author_id, instance.pub_date
+        )
+
+
+@receiver(post_save, sender=Post)
+def release_replaced_image(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and "image" not in update_fields:
+        return
+    old_image = getattr(instance, "_saved_image", "")
+    if old_image and old_image != instance.image.name:
+        release_image(instance.image.storage, old_image)
+
+
+@receiver(post_delete, sender=Post)
+@receiver(post_delete, sender=ArchivedPost)
+def release_deleted_image(sender, instance, **kwargs):
+    release_image(instance.image.storage, instance.image.name)
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def invalidate_group_choices(sender, **kwargs):
+    # Сразу — чтобы этот процесс видел изменение, и после коммита — чтобы
+    # другие воркеры не закэшировали список до коммита
+    group_choices.invalidate()
+    transaction.on_commit(group_choices.invalidate)
@@ -0,0 +1,30 @@
+from sorl.thumbnail import get_thumbnail
+
+from tasks.registry import task
+from .images import make_placeholder
+from .models import Post
+
+# Размер и параметры превью из шаблонов post_list.html и post_detail.html
+THUMBNAIL_GEOMETRY = "960x339"
+THUMBNAIL_OPTIONS = {"crop": "center", "upscale": True}
+
+
+@task(max_attempts=5)
+def make_thumbnail(post_id):
+    """Готовит превью картинки поста, чтобы его не строил первый читатель.
+
+    Заодно строит размытую заглушку для постов, созданных не через форму
+    (например, в админке). Пока строится превью, автор может сменить
+    картинку, поэтому заглушка записывается, только если картинка
+    осталась прежней: save() здесь перезаписал бы поле поверх правки.
+    """
+    post = Post.objects.filter(pk=post_id).only("image", "placeholder").first()
+    if post is None or not post.image:
+        return
+    get_thumbnail(post.image, THUMBNAIL_GEOMETRY, **THUMBNAIL_OPTIONS)
+    if not post.placeholder:
+        with post.image.open() as image:
+            placeholder = make_placeholder(image)
+        Post.objects.filter(
+            pk=post_id, image=post.image.name, placeholder=""
+        ).update(placeholder=placeholder)
@@ -0,0 +1,133 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from ..archive import archive_posts
+from ..models import (ArchivedComment, ArchivedPost, Comment, Group,
+                      GroupStats, Post)
+
+User = get_user_model()
+
+
+class SoftDeleteTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='author')
+        cls.other = User.objects.create_user(username='other')
+        cls.group = Group.objects.create(
+            title='Группа', slug='group', description='Описание'
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.post = Post.objects.create(
+            author=self.author, group=self.group, text='Пост'
+        )
+
+    def delete(self, user):
+        self.client.force_login(user)
+        return self.client.post(
+            reverse('posts:post_delete', args=(self.post.pk,))
+        )
+
+    def test_author_deletes_post(self):
+        """Автор удаляет пост: он пропадает из лент, но остается в базе."""
+        self.assertRedirects(
+            self.delete(self.author),
+            reverse('posts:profile', args=('author',)),
+        )
+        self.assertFalse(Post.objects.exists())
+        self.assertTrue(Post.all_objects.filter(pk=self.post.pk).exists())
+        self.assertEqual(GroupStats.objects.get(group=self.group).posts, 0)
+        self.assertNotContains(self.client.get(reverse('posts:index')), 'Пост')
+        response = self.client.get(
+            reverse('posts:post_detail', args=(self.post.pk,))
+        )
+        self.assertEqual(response.status_code, 404)
+
+    def test_other_user_cannot_delete(self):
+        """Чужой пост удалить нельзя."""
+        self.delete(self.other)
+        self.assertTrue(Post.objects.filter(pk=self.post.pk).exists())
+
+
+class ArchiveTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='author')
+        cls.reader = User.objects.create_user(username='reader')
+
+    def setUp(self):
+        cache.clear()
+        self.old = Post.objects.create(author=self.author, text='Старый')
+        Post.objects.filter(pk=self.old.pk).update(
+            pub_date=timezone.now() - timedelta(days=400)
+        )
+        self.comment = Comment.objects.create(
+            post=self.old, author=self.reader, text='Комментарий'
+        )
+        self.fresh = Post.objects.create(author=self.author, text='Новый')
+
+    def test_old_posts_moved_with_comments(self):
+        """Старые посты с комментариями переезжают в архив."""
+        self.assertEqual(archive_posts(months=12), 1)
+        self.assertEqual(list(Post.all_objects.all()), [self.fresh])
+        self.assertFalse(Comment.objects.exists())
+        archived = ArchivedPost.objects.get()
+        self.assertEqual(archived.pk, self.old.pk)
+        self.assertEqual(
+            ArchivedComment.objects.get().post_id, archived.pk
+        )
+
+    def test_late_comment_archived(self):
+        """Комментарий, появившийся во время переноса, тоже попадает
+        в архив, а не остается без поста."""
+        bulk_create = ArchivedComment.objects.bulk_create
+        late = []
+
+        def comment_meanwhile(objs, *args, **kwargs):
+            created = bulk_create(objs, *args, **kwargs)
+            if not late:
+                late.append(Comment.objects.create(
+                    post=self.old, author=self.reader, text='Поздний'
+                ))
+            return created
+
+        with mock.patch.object(ArchivedComment.objects, 'bulk_create',
+                               side_effect=comment_meanwhile):
+            archive_posts(months=12)
+        self.assertEqual(
+            sorted(
+                ArchivedComment.objects.filter(post=self.old.pk)
+                .values_list('text', flat=True)
+            ),
+            ['Комментарий', 'Поздний'],
+        )
+        self.assertFalse(Comment.objects.filter(pk=late[0].pk).exists())
+        self.assertFalse(Comment.objects.filter(post__isnull=True).exists())
+
+    def test_permalink_falls_back_to_archive(self):
+        """Постоянная ссылка на архивный пост продолжает работать."""
+        archive_posts(months=12)
+        url = reverse('posts:post_detail', args=(self.old.pk,))
+        response = self.client.get(url)
+        self.assertContains(response, 'Старый')
+        self.assertContains(response, 'Комментарий')
+        response = self.client.get(reverse('posts:index'))
+        self.assertNotContains(response, 'Старый')
+
+    def test_deleted_archived_post_not_shown(self):
+        """Удаленный пост после архивации по ссылке не открывается."""
+        Post.objects.filter(pk=self.old.pk).update(deleted_at=timezone.now())
+        archive_posts(months=12)
+        response = self.client.get(
+            reverse('posts:post_detail', args=(self.old.pk,))
+        )
+        self.assertEqual(response.status_code, 404)
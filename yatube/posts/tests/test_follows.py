@@ -0,0 +1,112 @@
+import threading
+
+from django.contrib.auth import get_user_model
+from django.db import OperationalError, connections
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+
+from notifications.models import Notification
+from ..follows import follow, unfollow
+from ..models import Follow
+
+User = get_user_model()
+
+
+class FollowServiceTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.reader = User.objects.create_user(username='reader')
+        cls.author = User.objects.create_user(username='author')
+
+    def test_follow_is_idempotent(self):
+        """Повторная подписка — один запрос без ошибок и дублей."""
+        self.assertTrue(follow(self.reader, self.author))
+        with self.assertNumQueries(1):
+            self.assertFalse(follow(self.reader, self.author))
+        self.assertEqual(Follow.objects.count(), 1)
+        self.assertEqual(
+            Notification.objects.get(recipient=self.author).count, 1
+        )
+
+    def test_unfollow_single_statement(self):
+        """Отписка — один DELETE, повторная ничего не делает."""
+        follow(self.reader, self.author)
+        with self.assertNumQueries(1):
+            self.assertTrue(unfollow(self.reader, self.author))
+        with self.assertNumQueries(1):
+            self.assertFalse(unfollow(self.reader, self.author))
+        self.assertFalse(Follow.objects.exists())
+
+    def test_self_follow_ignored(self):
+        """На себя подписаться нельзя, запроса к базе нет."""
+        with self.assertNumQueries(0):
+            self.assertFalse(follow(self.author, self.author))
+
+    def test_views_use_service(self):
+        """Кнопки профиля подписывают и отписывают."""
+        self.client.force_login(self.reader)
+        for name, exists in (
+            ('posts:profile_follow', True),
+            ('posts:profile_follow', True),
+            ('posts:profile_unfollow', False),
+        ):
+            self.client.get(reverse(name, args=[self.author.username]))
+            self.assertEqual(Follow.objects.filter(
+                user=self.reader, author=self.author
+            ).exists(), exists)
+
+
+def retry_locked(func, *args):
+    """Повторяет запрос, отклоненный блокировкой таблицы.
+
+    Тестовая SQLite в памяти с общим кэшем не ждет блокировку, а сразу
+    отвечает «table is locked»; такой запрос не выполнен вовсе.
+    """
+    while True:
+        try:
+            return func(*args)
+        except OperationalError as error:
+            if 'locked' not in str(error):
+                raise
+
+
+class FollowConcurrencyTests(TransactionTestCase):
+    THREADS = 8
+    ROUNDS = 20
+
+    def test_parallel_follow_and_unfollow(self):
+        """Одновременные подписки и отписки не падают и не плодят дубли."""
+        reader = User.objects.create_user(username='reader')
+        author = User.objects.create_user(username='author')
+        barrier = threading.Barrier(self.THREADS)
+        errors = []
+        created = []
+
+        def hammer(number):
+            try:
+                barrier.wait()
+                for _ in range(self.ROUNDS):
+                    created.append(retry_locked(follow, reader, author))
+                    if number % 2:
+                        retry_locked(unfollow, reader, author)
+            except Exception as error:
+                errors.append(error)
+            finally:
+                connections.close_all()
+
+        threads = [
+            threading.Thread(target=hammer, args=(number,))
+            for number in range(self.THREADS)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertLessEqual(Follow.objects.count(), 1)
+        follow(reader, author)
+        self.assertEqual(Follow.objects.count(), 1)
+        # Каждая новая подписка записана, каждая отписка — не больше одной
+        unfollows = self.THREADS // 2 * self.ROUNDS
+        self.assertLessEqual(created.count(True), unfollows + 1)
@@ -1,3 +1,4 @@
+import hashlib
 import shutil
 import tempfile
 from http import HTTPStatus
@@ -7,6 +8,7 @@ from django.core.files.uploadedfile import SimpleUploadedFile
 from django.contrib.auth import REDIRECT_FIELD_NAME, get_user_model
 from django.test import Client, TestCase, override_settings
 from django.urls import reverse
+from core.storage import blob_name
 from posts.models import Comment, Group, Post
 
 User = get_user_model()
@@ -14,6 +16,13 @@ User = get_user_model()
 TEMP_MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
 
 
+def content_address(directory, content, extension):
+    """Имя, под которым хранилище сохраняет файл с таким содержимым."""
+    return blob_name(
+        directory, hashlib.sha256(content).hexdigest(), extension
+    )
+
+
 @override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT)
 class PostFormTests(TestCase):
     @classmethod
@@ -88,7 +97,7 @@ class PostFormTests(TestCase):
             (post.author, self.post.author),
             (post.text, self.post.text),
             (post.group, self.group),
-            (post.image, f'posts/{image}'),
+            (post.image, content_address('posts', bytes_image, '.gif')),
         )
         for new_post, expected in check_post_fields:
             with self.subTest(new_post=expected):
@@ -0,0 +1,45 @@
+from django.core.cache import cache
+from django.test import TestCase
+
+from ..forms import PostForm
+from ..group_choices import cached_groups
+from ..models import Group
+
+
+class GroupChoicesTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.group = Group.objects.create(
+            title='Котики', slug='cats', description='Про котиков'
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_choices_without_queries(self):
+        """Повторная отрисовка поля group не обращается к базе."""
+        str(PostForm()['group'])
+        with self.assertNumQueries(0):
+            html = str(PostForm()['group'])
+            self.assertEqual(cached_groups(), (self.group,))
+        self.assertIn(f'<option value="{self.group.pk}">Котики</option>',
+                      html)
+
+    def test_group_changes_invalidate(self):
+        """Создание, изменение и удаление группы видны в форме сразу."""
+        cached_groups()
+        dogs = Group.objects.create(title='Собаки', slug='dogs')
+        self.assertIn('Собаки', str(PostForm()['group']))
+        dogs.title = 'Псы'
+        dogs.save()
+        self.assertIn('Псы', str(PostForm()['group']))
+        dogs.delete()
+        self.assertEqual(cached_groups(), (self.group,))
+
+    def test_valid_choice_still_checked(self):
+        """Выбор группы проверяется по базе, как и раньше."""
+        form = PostForm({'text': 'Текст', 'group': self.group.pk})
+        self.assertTrue(form.is_valid())
+        form = PostForm({'text': 'Текст', 'group': self.group.pk + 100})
+        self.assertFalse(form.is_valid())
@@ -0,0 +1,111 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from ..group_stats import rebuild
+from ..models import Group, GroupAuthor, GroupStats, Post
+
+User = get_user_model()
+
+
+class GroupStatsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.first = User.objects.create_user(username='first')
+        cls.second = User.objects.create_user(username='second')
+        cls.group = Group.objects.create(
+            title='Группа', slug='group', description='Описание'
+        )
+        cls.other = Group.objects.create(
+            title='Другая', slug='other', description='Описание'
+        )
+
+    def stats(self, group):
+        return GroupStats.objects.filter(group=group).values_list(
+            'posts', 'authors', 'last_post_at'
+        ).first()
+
+    def test_new_posts_counted(self):
+        """Новые посты увеличивают счетчики группы."""
+        Post.objects.create(author=self.first, group=self.group, text='1')
+        Post.objects.create(author=self.first, group=self.group, text='2')
+        last = Post.objects.create(
+            author=self.second, group=self.group, text='3'
+        )
+        self.assertEqual(
+            self.stats(self.group), (3, 2, last.pub_date)
+        )
+
+    def test_group_change_moves_post(self):
+        """Смена группы при правке переносит пост между счетчиками."""
+        first = Post.objects.create(
+            author=self.first, group=self.group, text='1'
+        )
+        post = Post.objects.create(
+            author=self.second, group=self.group, text='2'
+        )
+        post.group = self.other
+        post.save()
+        self.assertEqual(self.stats(self.group), (1, 1, first.pub_date))
+        self.assertEqual(self.stats(self.other), (1, 1, post.pub_date))
+
+    def test_update_of_other_fields_skips_lookup(self):
+        """Сохранение полей, не влияющих на счетчики, не читает пост
+        заново и не трогает статистику."""
+        post = Post.objects.create(
+            author=self.first, group=self.group, text='1'
+        )
+        with CaptureQueriesContext(connection) as queries:
+            post.text = '2'
+            post.save(update_fields=['text'])
+        self.assertFalse([
+            query for query in queries
+            if query['sql'].startswith('SELECT')
+            or 'stats' in query['sql']
+        ])
+        self.assertEqual(self.stats(self.group)[:2], (1, 1))
+
+    def test_edit_in_form_moves_post(self):
+        """post_edit с новой группой обновляет статистику."""
+        post = Post.objects.create(
+            author=self.first, group=self.group, text='1'
+        )
+        self.client.force_login(self.first)
+        self.client.post(
+            reverse('posts:post_edit', args=(post.pk,)),
+            {'text': 'Правка', 'group': self.other.pk},
+        )
+        self.assertEqual(self.stats(self.group), (0, 0, None))
+        self.assertEqual(self.stats(self.other)[:2], (1, 1))
+
+    def test_delete_uncounts_post(self):
+        """Удаление поста уменьшает счетчики и убирает автора."""
+        post = Post.objects.create(
+            author=self.first, group=self.group, text='1'
+        )
+        post.delete()
+        self.assertEqual(self.stats(self.group), (0, 0, None))
+        self.assertFalse(GroupAuthor.objects.exists())
+
+    def test_rebuild_matches_incremental(self):
+        """Пересчет с нуля дает те же числа."""
+        Post.objects.create(author=self.first, group=self.group, text='1')
+        Post.objects.create(author=self.second, group=self.other, text='2')
+        expected = {group: self.stats(group) for group in (
+            self.group, self.other
+        )}
+        GroupStats.objects.update(posts=0)
+        rebuild()
+        for group, stats in expected.items():
+            self.assertEqual(self.stats(group), stats)
+
+    def test_group_index_without_counts(self):
+        """Каталог групп не считает посты: запрос числа групп и страницы."""
+        Post.objects.create(author=self.first, group=self.group, text='1')
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('posts:group_index'))
+        self.assertContains(response, 'Постов: 1')
+        self.assertContains(response, 'Постов: 0')
@@ -0,0 +1,88 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.template.loader import render_to_string
+from django.test import TestCase
+from django.urls import reverse
+
+from ..models import Follow, Group, Post
+from ..views import LENGTH, POST_CARD_TEMPLATE, only_for_template
+
+User = get_user_model()
+
+
+class TemplateFieldsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(
+            username='Author', first_name='Имя', last_name='Фамилия'
+        )
+        cls.follower = User.objects.create_user(username='Follower')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        Post.objects.bulk_create(
+            [Post(
+                author=cls.user,
+                text=f'Тестовая запись {number}',
+                group=cls.group
+            ) for number in range(LENGTH)]
+        )
+        Follow.objects.create(user=cls.follower, author=cls.user)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_post_card_reads_only_declared_fields(self):
+        """Карточка поста не обращается к отложенным полям."""
+        posts = list(only_for_template(Post.objects.all()))
+        with self.assertNumQueries(0):
+            for post in posts:
+                render_to_string(
+                    POST_CARD_TEMPLATE,
+                    {'post': post, 'display_group_link': True}
+                )
+
+    def test_list_views_query_count(self):
+        """Списки постов загружаются фиксированным числом запросов."""
+        urls = (
+            (reverse('posts:index'), 2),
+            (reverse('posts:group_list', args=(self.group.slug,)), 2),
+            (reverse('posts:profile', args=(self.user.username,)), 2),
+        )
+        for url, queries in urls:
+            with self.subTest(url=url):
+                with self.assertNumQueries(queries):
+                    self.client.get(url)
+
+    def test_follow_index_query_count(self):
+        """Лента подписок загружается фиксированным числом запросов."""
+        self.client.force_login(self.follower)
+        # Сессия, пользователь, число постов, страница и рекомендации
+        with self.assertNumQueries(5):
+            self.client.get(reverse('posts:follow_index'))
+
+    def test_profile_query_count(self):
+        """Профиль читателя: автор, счетчик и подписка одним запросом."""
+        self.client.force_login(self.follower)
+        url = reverse('posts:profile', args=(self.user.username,))
+        # Сессия, пользователь, автор со счетчиком и подпиской, страница
+        # и рекомендации
+        with self.assertNumQueries(5):
+            response = self.client.get(url)
+        self.assertEqual(response.context['count'], LENGTH)
+        self.assertTrue(response.context['following'])
+        self.assertTrue(response.context['non_author'])
+        self.assertContains(response, 'Отписаться')
+
+    def test_own_profile_has_no_follow_button(self):
+        """Автор не видит кнопку подписки на себя."""
+        self.client.force_login(self.user)
+        response = self.client.get(
+            reverse('posts:profile', args=(self.user.username,))
+        )
+        self.assertFalse(response.context['non_author'])
+        self.assertFalse(response.context['following'])
+        self.assertNotContains(response, 'Подписаться')
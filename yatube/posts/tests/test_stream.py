@@ -0,0 +1,88 @@
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase, TransactionTestCase
+from django.test import override_settings
+from django.urls import reverse
+
+from core.pubsub import get_broker
+from ..models import Follow, Post
+from ..signals import author_channel
+
+User = get_user_model()
+
+
+@override_settings(SSE_STREAM_SECONDS=1, SSE_HEARTBEAT_SECONDS=0.05)
+class FollowStreamTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='Author')
+        cls.other = User.objects.create_user(username='Other')
+        cls.follower = User.objects.create_user(username='Follower')
+        Follow.objects.create(user=cls.follower, author=cls.author)
+        cls.old_post = Post.objects.create(author=cls.author, text='Старый')
+
+    def setUp(self):
+        self.client = Client()
+        self.client.force_login(self.follower)
+
+    def test_stream_sends_new_post_event(self):
+        """Подписчик получает событие о новом посте автора."""
+        response = self.client.get(reverse('posts:follow_stream'))
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        stream = iter(response.streaming_content)
+        self.assertEqual(next(stream), b'retry: 5000\n\n')
+        get_broker().publish(author_channel(self.other.pk), {'id': 1})
+        get_broker().publish(author_channel(self.author.pk), {'id': 42})
+        event = next(stream)
+        self.assertEqual(event, b'id: 42\nevent: post\ndata: {"id": 42}\n\n')
+        response.close()
+
+    def test_stream_replays_missed_posts(self):
+        """После переподключения приходят посты, пропущенные клиентом."""
+        new_post = Post.objects.create(author=self.author, text='Новый')
+        response = self.client.get(
+            reverse('posts:follow_stream'),
+            HTTP_LAST_EVENT_ID=str(self.old_post.pk),
+        )
+        stream = iter(response.streaming_content)
+        next(stream)
+        self.assertIn(f'id: {new_post.pk}\n'.encode(), next(stream))
+        self.assertEqual(next(stream), b': keep-alive\n\n')
+        response.close()
+
+    @override_settings(SSE_MAX_STREAMS=1)
+    def test_streams_limited_per_process(self):
+        """Сверх SSE_MAX_STREAMS поток не открывается, а слот
+        освобождается при закрытии ответа, даже не начатого."""
+        url = reverse('posts:follow_stream')
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.client.get(url).status_code, 204)
+        response.close()
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        response.close()
+
+    def test_cards_only_new_followed_posts(self):
+        """Подгружаются только новые карточки избранных авторов."""
+        new_post = Post.objects.create(author=self.author, text='Новый')
+        Post.objects.create(author=self.other, text='Чужой')
+        response = self.client.get(
+            reverse('posts:follow_cards'), {'after': self.old_post.pk}
+        )
+        self.assertEqual(list(response.context['posts']), [new_post])
+
+
+class PublishNewPostTests(TransactionTestCase):
+    def test_new_post_published_after_commit(self):
+        """Новый пост публикуется в канал автора."""
+        author = User.objects.create_user(username='Author')
+        channel = author_channel(author.pk)
+        with get_broker().subscribe([channel]) as events:
+            post = Post.objects.create(author=author, text='Текст')
+            post.save()
+            self.assertEqual(
+                events.get(timeout=1),
+                (channel, {'id': post.pk, 'author': author.pk})
+            )
+            self.assertIsNone(events.get(timeout=0))
@@ -0,0 +1,109 @@
+import io
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from tasks.models import Task
+from tasks.worker import run_pending
+from .. import tasks
+from ..models import Post
+
+TEMP_MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+
+User = get_user_model()
+
+SMALL_GIF = (
+    b'\x47\x49\x46\x38\x39\x61\x02\x00'
+    b'\x01\x00\x80\x00\x00\x00\x00\x00'
+    b'\xFF\xFF\xFF\x21\xF9\x04\x00\x00'
+    b'\x00\x00\x00\x2C\x00\x00\x00\x00'
+    b'\x02\x00\x01\x00\x00\x02\x02\x0C'
+    b'\x0A\x00\x3B'
+)
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT)
+class ThumbnailTaskTests(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
+
+    def test_thumbnail_built_by_worker(self):
+        """Превью картинки нового поста строит фоновая задача."""
+        user = User.objects.create_user(username='Author')
+        Post.objects.create(
+            author=user,
+            text='Пост с картинкой',
+            image=SimpleUploadedFile('small.gif', SMALL_GIF, 'image/gif'),
+        )
+        self.assertEqual(
+            Task.objects.get().name, 'posts.tasks.make_thumbnail'
+        )
+        self.assertEqual(run_pending(), (1, 0))
+        thumbnails = [
+            name
+            for root, dirs, files in os.walk(
+                os.path.join(TEMP_MEDIA_ROOT, 'cache')
+            )
+            for name in files
+        ]
+        self.assertEqual(len(thumbnails), 1)
+
+    def test_post_without_image_not_queued(self):
+        """Для поста без картинки задача не создается."""
+        user = User.objects.create_user(username='Author')
+        Post.objects.create(author=user, text='Пост без картинки')
+        self.assertFalse(Task.objects.exists())
+
+    def test_placeholder_not_written_over_new_image(self):
+        """Если картинку сменили, пока строилось превью, заглушка старой
+        картинки не записывается."""
+        user = User.objects.create_user(username='Author')
+        post = Post.objects.create(
+            author=user,
+            text='Пост с картинкой',
+            image=SimpleUploadedFile('small.gif', SMALL_GIF, 'image/gif'),
+        )
+        old_name = post.image.name
+        # Другое содержимое, иначе у картинки будет то же имя в хранилище
+        new_image = SimpleUploadedFile(
+            'new.gif', SMALL_GIF.replace(b'\x0C', b'\x0D'), 'image/gif'
+        )
+
+        def replace_image(*args, **kwargs):
+            post.image = new_image
+            post.save()
+
+        with mock.patch.object(tasks, 'get_thumbnail', replace_image):
+            tasks.make_thumbnail.func(post.pk)
+        post.refresh_from_db()
+        self.assertNotEqual(post.image.name, old_name)
+        self.assertEqual(post.placeholder, '')
+        self.assertTrue(post.image.storage.exists(post.image.name))
+
+    def test_backfill_queues_posts_without_placeholder(self):
+        """Команда ставит в очередь только посты с картинкой без
+        заглушки."""
+        user = User.objects.create_user(username='Author')
+        Post.objects.bulk_create([
+            Post(author=user, text='Без заглушки', image='posts/a.gif'),
+            Post(
+                author=user, text='С заглушкой', image='posts/b.gif',
+                placeholder='data:image/jpeg;base64,',
+            ),
+            Post(author=user, text='Без картинки'),
+        ])
+        call_command('backfill_placeholders', stdout=io.StringIO())
+        task = Task.objects.get()
+        self.assertEqual(task.name, 'posts.tasks.make_thumbnail')
+        self.assertIn(
+            str(Post.objects.get(text='Без заглушки').pk), task.arguments
+        )
@@ -0,0 +1,115 @@
+import io
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from PIL import Image
+
+from core.uploads import BoundedUploadHandler
+from ..models import Post
+
+TEMP_MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+
+User = get_user_model()
+
+
+def image_file(name, size=(4, 2), image_format='JPEG', **options):
+    buffer = io.BytesIO()
+    Image.new('RGB', size, (255, 0, 0)).save(buffer, image_format, **options)
+    return SimpleUploadedFile(name, buffer.getvalue(), 'image/jpeg')
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT)
+class ImageUploadTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='author')
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def upload(self, image):
+        return self.client.post(
+            reverse('posts:post_create'), {'text': 'Пост', 'image': image}
+        )
+
+    @override_settings(FILE_UPLOAD_MAX_SIZE=100)
+    def test_oversized_upload_rejected(self):
+        """Файл больше лимита отклоняется с понятной ошибкой."""
+        response = self.upload(image_file('big.jpg', size=(200, 200)))
+        self.assertFormError(
+            response, 'form', 'image', 'Файл больше 100\xa0байт.'
+        )
+        self.assertFalse(Post.objects.exists())
+
+    @override_settings(FILE_UPLOAD_MAX_SIZE=100)
+    def test_oversized_file_reports_written_size(self):
+        """Размер обрезанного файла — число записанных байт, а не
+        полученных."""
+        handler = BoundedUploadHandler()
+        handler.new_file('image', 'big.jpg', 'image/jpeg', 250)
+        for start in range(0, 250, 60):
+            handler.receive_data_chunk(b'x' * 60, start)
+        file = handler.file_complete(300)
+        self.assertTrue(file.oversized)
+        self.assertEqual(file.size, 60)
+        file.seek(0)
+        self.assertEqual(len(file.read()), 60)
+        file.close()
+
+    @override_settings(
+        FILE_UPLOAD_MAX_SIZE=100, DATA_UPLOAD_MAX_MEMORY_SIZE=100
+    )
+    def test_request_over_body_limit_rejected(self):
+        """Запрос больше полей формы и файла отклоняется до чтения."""
+        response = self.upload(image_file('big.jpg', size=(200, 200)))
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Post.objects.exists())
+
+    @override_settings(IMAGE_MAX_PIXELS=1000)
+    def test_too_many_pixels_rejected(self):
+        """Картинка со слишком большим числом пикселей отклоняется."""
+        response = self.upload(
+            image_file('wide.png', size=(100, 100), image_format='PNG')
+        )
+        self.assertIn('image', response.context['form'].errors)
+        self.assertFalse(Post.objects.exists())
+
+    def test_orientation_applied_and_exif_stripped(self):
+        """Картинка поворачивается по EXIF, а метаданные удаляются."""
+        exif = Image.Exif()
+        exif[0x0112] = 6  # повернуть на 90° по часовой стрелке
+        self.upload(image_file('photo.jpg', exif=exif.tobytes()))
+        post = Post.objects.get()
+        with post.image.open() as stored, Image.open(stored) as image:
+            self.assertEqual(image.size, (2, 4))
+            self.assertNotIn('exif', image.info)
+
+    def test_clean_image_stored_as_is(self):
+        """Картинка без метаданных не пересохраняется."""
+        upload = image_file('clean.png', image_format='PNG')
+        content = upload.read()
+        upload.seek(0)
+        self.upload(upload)
+        with Post.objects.get().image.open() as stored:
+            self.assertEqual(stored.read(), content)
+
+    def test_placeholder_stored_and_inlined(self):
+        """Заглушка строится при загрузке и встраивается в карточку."""
+        self.upload(image_file('photo.jpg', size=(960, 339)))
+        placeholder = Post.objects.get().placeholder
+        self.assertTrue(placeholder.startswith('data:image/jpeg;base64,'))
+        self.assertLess(len(placeholder), 1000)
+        response = self.client.get(reverse('posts:index'))
+        self.assertContains(response, 'loading="lazy"')
+        self.assertContains(response, placeholder)
@@ -137,7 +137,7 @@ class PostViewsTests(TestCase):
         self.assertEqual(post.pub_date, self.post.pub_date)
         self.assertEqual(post.author, self.user)
         self.assertEqual(post.group, self.group)
-        self.assertEqual(post.image, f'posts/{self.image}')
+        self.assertEqual(post.image, self.post.image.name)
 
     def test_index_page_show_correct_context(self):
         """Шаблон index сформирован с правильным контекстом."""
@@ -365,3 +365,35 @@ class PostViewsTests(TestCase):
         self.assertRedirects(
             response, f"/auth/login/?next=/posts/{self.post.pk}/comment/"
         )
+
+
+class PostDetailStreamingTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='Author')
+        cls.post = Post.objects.create(author=cls.user, text='Длинный пост')
+        Comment.objects.bulk_create(
+            Comment(post=cls.post, author=cls.user, text=f'Комментарий {i}')
+            for i in range(5)
+        )
+        cls.url = reverse('posts:post_detail', args=[cls.post.pk])
+
+    @override_settings(POST_DETAIL_STREAM_COMMENTS=2)
+    def test_many_comments_streamed(self):
+        """Пост с многими комментариями отдается потоком, пост — первым."""
+        response = self.client.get(self.url)
+        self.assertTrue(response.streaming)
+        chunks = [chunk.decode() for chunk in response.streaming_content]
+        self.assertIn('Длинный пост', chunks[0])
+        self.assertNotIn('Комментарий', chunks[0])
+        page = ''.join(chunks)
+        for i in range(5):
+            self.assertIn(f'Комментарий {i}', page)
+        self.assertIn('</html>', chunks[-1])
+
+    def test_few_comments_rendered_at_once(self):
+        """Немногие комментарии рендерятся обычным ответом."""
+        response = self.client.get(self.url)
+        self.assertFalse(response.streaming)
+        self.assertEqual(len(response.context['comments']), 5)
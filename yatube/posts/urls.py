@@ -6,17 +6,26 @@ app_name = "posts"
 
 urlpatterns = [
     path("", views.index, name="index"),
+    path("group/", views.group_index, name="group_index"),
     path("group/<slug:slug>/", views.group_posts, name="group_list"),
     path("profile/<str:username>/", views.profile, name="profile"),
     path("posts/<int:post_id>/", views.post_detail, name="post_detail"),
     path("create/", views.post_create, name="post_create"),
     path("posts/<int:post_id>/edit/", views.post_edit, name="post_edit"),
+    path(
+        "posts/<int:post_id>/delete/",
+        views.post_delete,
+        name="post_delete",
+    ),
     path(
         'posts/<int:post_id>/comment/',
         views.add_comment,
         name='add_comment'
     ),
+    path('popular/', views.popular, name='popular'),
     path('follow/', views.follow_index, name='follow_index'),
+    path('follow/stream/', views.follow_stream, name='follow_stream'),
+    path('follow/cards/', views.follow_cards, name='follow_cards'),
     path(
         'profile/<str:username>/follow/',
         views.profile_follow,
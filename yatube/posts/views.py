@@ -1,20 +1,63 @@
+import json
+import time
+from itertools import chain, islice
 
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.decorators import login_required
 from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import (Count, Exists, F, IntegerField, OuterRef, Q,
+                              Subquery)
+from django.db.models.functions import Coalesce
+from django.http import HttpResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
+from django.utils import timezone
+from django.utils.http import urlencode
 from django.views.decorators.cache import cache_page
+
+from core.pubsub import get_broker
+from core.ratelimit import ratelimit
+from core.routers import read_only
+from core.streaming import StreamSlots, stream_render
+from recommendations.engine import recommended_authors
+from . import follows
 from .forms import PostForm, CommentForm
-from .models import Comment, Follow, Group, Post, User
+from .group_choices import cached_groups
+from .models import ArchivedPost, Comment, Follow, Group, Post, User
+from .signals import author_channel
 
 MAGIC_NUM: int = 30
 LENGTH: int = 10
+POST_CARD_TEMPLATE: str = "posts/includes/post_list.html"
+# Колонки, которые читает каждый шаблон со списком постов. Остальные поля
+# (пароль автора, описание группы и т.п.) из базы не загружаются.
+TEMPLATE_FIELDS = {
+    POST_CARD_TEMPLATE: (
+        "text",
+        "pub_date",
+        "image",
+        "placeholder",
+        "author__username",
+        "author__first_name",
+        "author__last_name",
+        "group__slug",
+    ),
+}
 User = get_user_model()
 
 
+def only_for_template(posts, template=POST_CARD_TEMPLATE):
+    """Ограничивает выборку постов полями, которые нужны шаблону."""
+    return posts.select_related("author", "group").only(
+        *TEMPLATE_FIELDS[template]
+    )
+
+
+@read_only
 @cache_page(20)
 def index(request):
-    posts = Post.objects.select_related('author', 'group')
+    posts = only_for_template(Post.objects.all())
     paginator = Paginator(posts, LENGTH)
     page_number = request.GET.get("page")
     page_obj = paginator.get_page(page_number)
@@ -25,9 +68,26 @@ def index(request):
     return render(request, template, context)
 
 
+@read_only
+def group_index(request):
+    # Счетчики берутся из GroupStats одним JOIN, без COUNT по постам
+    groups = Group.objects.select_related("stats").order_by(
+        F("stats__last_post_at").desc(nulls_last=True), "title"
+    )
+    paginator = Paginator(groups, LENGTH)
+    page_number = request.GET.get("page")
+    page_obj = paginator.get_page(page_number)
+    context = {
+        "page_obj": page_obj,
+    }
+    template = "posts/group_index.html"
+    return render(request, template, context)
+
+
+@read_only
 def group_posts(request, slug):
     group = get_object_or_404(Group, slug=slug)
-    posts = group.posts.select_related('author')
+    posts = only_for_template(group.posts.all())
     paginator = Paginator(posts, LENGTH)
     page_number = request.GET.get("page")
     page_obj = paginator.get_page(page_number)
@@ -40,42 +100,68 @@ def group_posts(request, slug):
     return render(request, template, context)
 
 
+@read_only
 def profile(request, username):
-    user = get_object_or_404(User, username=username)
-    posts = user.posts.select_related('group')
-    count = posts.count()
-    paginator = Paginator(posts, LENGTH)
-    page_number = request.GET.get("page")
-    page_obj = paginator.get_page(page_number)
+    # Автор, число его постов и подписка на него — одним запросом
+    posts_count = (
+        Post.objects.filter(author=OuterRef("pk"))
+        .order_by().values("author").annotate(count=Count("pk"))
+        .values("count")
+    )
+    authors = User.objects.only("username", "first_name", "last_name")
+    authors = authors.annotate(
+        posts_count=Coalesce(
+            Subquery(posts_count, output_field=IntegerField()), 0
+        )
+    )
+    if request.user.is_authenticated:
+        authors = authors.annotate(is_following=Exists(Follow.objects.filter(
+            user=request.user, author=OuterRef("pk")
+        )))
+    user = get_object_or_404(authors, username=username)
+    count = user.posts_count
+    following = getattr(user, "is_following", False)
+    paginator = Paginator(
+        only_for_template(Post.objects.filter(author=user)), LENGTH
+    )
+    # Число постов уже известно: пагинатор не считает их второй раз
+    paginator.count = count
+    page_obj = paginator.get_page(request.GET.get("page"))
+    non_author = request.user != user
     if request.user.is_authenticated:
-        following = Follow.objects.filter(
-            user__exact=request.user, author__exact=user
-        ).exists()
-        if request.user != user.username:
-            non_author = True
-        else:
-            non_author = False
+        recommended = recommended_authors(request.user)
     else:
-        following = False
-        non_author = False
+        recommended = ()
     context = {
         "page_obj": page_obj,
         "count": count,
+        "posts_count": count,
         "author": user,
         "following": following,
         "non_author": non_author,
+        "recommended": recommended,
     }
     template = "posts/profile.html"
     return render(request, template, context)
 
 
+@read_only
 def post_detail(request, post_id):
-    post = get_object_or_404(Post, pk=post_id)
+    try:
+        post = Post.objects.get(pk=post_id)
+    except Post.DoesNotExist:
+        return archived_post_detail(request, post_id)
     pub_date = post.pub_date
     post_title = post.text[:MAGIC_NUM]
     author = post.author
     author_posts = author.posts.all().count()
-    comments = Comment.objects.filter(post_id__exact=post.pk)
+    comments = (
+        Comment.objects.filter(post_id__exact=post.pk)
+        .select_related("author").iterator()
+    )
+    # Одним запросом: хватит ли комментариев на потоковый рендер
+    limit = settings.POST_DETAIL_STREAM_COMMENTS
+    first = list(islice(comments, limit + 1))
     context = {
         "post": post,
         "post_title": post_title,
@@ -83,23 +169,44 @@ def post_detail(request, post_id):
         "author_posts": author_posts,
         "pub_date": pub_date,
         "form": CommentForm(),
-        "comments": comments,
+        "comments": first,
     }
     template = "posts/post_detail.html"
+    if len(first) <= limit:
+        return render(request, template, context)
+    return stream_render(
+        request, template, context, "comments_slot",
+        chain(first, comments), "posts/includes/comment.html", "comment",
+    )
+
+
+def archived_post_detail(request, post_id):
+    """Постоянная ссылка на пост, перенесенный в архив (только чтение)."""
+    post = get_object_or_404(
+        ArchivedPost.objects.select_related("author", "group"),
+        pk=post_id,
+        deleted_at__isnull=True,
+    )
+    context = {
+        "post": post,
+        "post_title": post.text[:MAGIC_NUM],
+        "comments": post.comments.select_related("author"),
+    }
+    template = "posts/post_archived.html"
     return render(request, template, context)
 
 
+@ratelimit("10/m")
 @login_required
 def post_create(request):
-    form = PostForm(request.POST,
+    form = PostForm(request.POST or None,
                     files=request.FILES or None,)
     if form.is_valid():
         post = form.save(commit=False)
         post.author = request.user
         post.save()
         return redirect(f"/profile/{post.author}/", {"form": form})
-    form = PostForm()
-    groups = Group.objects.all()
+    groups = cached_groups()
     template = "posts/create_post.html"
     context = {"form": form, "groups": groups}
     return render(request, template, context)
@@ -110,7 +217,7 @@ def post_edit(request, post_id):
     is_edit = True
     post = get_object_or_404(Post, pk=post_id)
     author = post.author
-    groups = Group.objects.all()
+    groups = cached_groups()
     form = PostForm(
         request.POST or None,
         files=request.FILES or None,
@@ -131,6 +238,17 @@ def post_edit(request, post_id):
     return render(request, template, context)
 
 
+@login_required
+def post_delete(request, post_id):
+    post = get_object_or_404(Post, pk=post_id)
+    if post.author != request.user or request.method != "POST":
+        return redirect("posts:post_detail", post_id)
+    post.deleted_at = timezone.now()
+    post.save(update_fields=["deleted_at"])
+    return redirect("posts:profile", request.user.username)
+
+
+@ratelimit("20/m")
 @login_required
 def add_comment(request, post_id):
     post = get_object_or_404(Post, pk=post_id)
@@ -143,10 +261,49 @@ def add_comment(request, post_id):
     return redirect('posts:post_detail', post_id=post_id)
 
 
+@read_only
+def popular(request):
+    # Порядок берется из заранее посчитанного рейтинга (ranking/engine.py),
+    # страница читается по индексу без агрегатов по комментариям. Страницы
+    # листаются по ключу (рейтинг и id последнего поста), а не по номеру:
+    # ни COUNT(*), ни OFFSET по всем постам с рейтингом
+    posts = (
+        only_for_template(Post.objects.filter(score__isnull=False))
+        .annotate(rating=F("score__score"))
+        .order_by("-rating", "-pk")
+    )
+    try:
+        score = float(request.GET["score"])
+        after = int(request.GET["after"])
+    except (KeyError, ValueError):
+        score = after = None
+    if after is not None:
+        posts = posts.filter(
+            Q(rating__lt=score) | Q(rating=score, pk__lt=after)
+        )
+    posts = list(posts[:LENGTH + 1])
+    next_page = None
+    if len(posts) > LENGTH:
+        posts = posts[:LENGTH]
+        last = posts[-1]
+        next_page = urlencode({"score": repr(last.rating), "after": last.pk})
+    context = {
+        "posts": posts,
+        "next_page": next_page,
+        "first_page": after is not None,
+        "popular": True,
+    }
+    template = "posts/popular.html"
+    return render(request, template, context)
+
+
+@read_only
 @login_required
 def follow_index(request):
     follower_user = request.user
-    posts = Post.objects.filter(author__following__user=follower_user)
+    posts = only_for_template(
+        Post.objects.filter(author__following__user=follower_user)
+    )
     template = "posts/follow.html"
     paginator = Paginator(posts, LENGTH)
     page_number = request.GET.get("page")
@@ -154,25 +311,106 @@ def follow_index(request):
     context = {
         "page_obj": page_obj,
         "posts": posts,
+        "recommended": recommended_authors(follower_user),
+        "poll_seconds": settings.FOLLOW_POLL_SECONDS,
     }
     return render(request, template, context)
 
 
+follow_streams = StreamSlots("SSE_MAX_STREAMS")
+
+
+def post_event(post_id):
+    return (
+        f"id: {post_id}\nevent: post\n"
+        f"data: {json.dumps({'id': post_id})}\n\n"
+    )
+
+
+def post_events(author_ids, missed=()):
+    """События server-sent events о новых постах авторов.
+
+    Поток закрывается через SSE_STREAM_SECONDS, браузер переподключается
+    сам и присылает Last-Event-ID, так что посты между соединениями не
+    теряются.
+    """
+    channels = [author_channel(author_id) for author_id in author_ids]
+    # Поток долго держит воркер, соединение с базой ему больше не нужно
+    for connection in connections.all():
+        if not connection.in_atomic_block:
+            connection.close()
+    deadline = time.monotonic() + settings.SSE_STREAM_SECONDS
+    with get_broker().subscribe(channels) as subscription:
+        yield "retry: 5000\n\n"
+        for post_id in missed:
+            yield post_event(post_id)
+        remaining = settings.SSE_STREAM_SECONDS
+        while remaining > 0:
+            event = subscription.get(
+                timeout=min(settings.SSE_HEARTBEAT_SECONDS, remaining)
+            )
+            if event is None:
+                yield ": keep-alive\n\n"
+            else:
+                yield post_event(event[1]["id"])
+            remaining = deadline - time.monotonic()
+
+
+@login_required
+def follow_stream(request):
+    """Поток новых постов избранных авторов.
+
+    Если все SSE_MAX_STREAMS потоков процесса заняты, отвечает 204:
+    браузер не переподключается, и страница опрашивает follow_cards.
+    """
+    author_ids = list(
+        Follow.objects.filter(user=request.user).values_list(
+            "author_id", flat=True
+        )
+    )
+    last_id = request.META.get("HTTP_LAST_EVENT_ID", "")
+    missed = []
+    if last_id.isdigit():
+        missed = list(
+            Post.objects.filter(author_id__in=author_ids, pk__gt=last_id)
+            .order_by("pk")
+            .values_list("pk", flat=True)[:LENGTH]
+        )
+    stream = follow_streams.open(post_events(author_ids, missed))
+    if stream is None:
+        return HttpResponse(status=204)
+    response = StreamingHttpResponse(
+        stream, content_type="text/event-stream"
+    )
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+@read_only
+@login_required
+def follow_cards(request):
+    after = request.GET.get("after", "")
+    posts = only_for_template(
+        Post.objects.filter(
+            author__following__user=request.user,
+            pk__gt=int(after) if after.isdigit() else 0,
+        )
+    )[:LENGTH]
+    template = "posts/includes/post_cards.html"
+    return render(request, template, {"posts": posts})
+
+
+@ratelimit("30/m", methods=("GET", "POST"))
 @login_required
 def profile_follow(request, username):
-    author = get_object_or_404(User, username=username)
-    following_user = request.user
-    if following_user != author and following_user != author.follower:
-        Follow.objects.get_or_create(user=following_user, author=author)
+    author = get_object_or_404(User.objects.only("pk"), username=username)
+    follows.follow(request.user, author)
     return redirect('posts:profile', username)
 
 
 @login_required
 def profile_unfollow(request, username):
-    author = get_object_or_404(User, username=username)
-    user = request.user
-    if Follow.objects.filter(user=user, author=author).exists():
-        Follow.objects.filter(user=user, author=author).delete()
-        return redirect("posts:profile", username=username)
-    else:
-        return redirect("posts:profile", username=username)
+    author = get_object_or_404(User.objects.only("pk"), username=username)
+    follows.unfollow(request.user, author)
+    return redirect("posts:profile", username=username)
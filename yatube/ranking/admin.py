@@ -0,0 +1,11 @@
+from django.contrib import admin
+
+from .models import PostScore
+
+
+class PostScoreAdmin(admin.ModelAdmin):
+    list_display = ("post", "score", "comments")
+    empty_value_display = "-пусто-"
+
+
+admin.site.register(PostScore, PostScoreAdmin)
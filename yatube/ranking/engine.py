@@ -0,0 +1,152 @@
+"""Инкрементальный пересчет рейтинга популярных постов.
+
+Вклад каждого события затухает экспоненциально с периодом полураспада
+TRENDING_HALF_LIFE_HOURS. Вместо того чтобы уменьшать все рейтинги с
+течением времени, вклад события масштабируется вверх от фиксированной
+эпохи: w * e^(λ(t - EPOCH)). Относительный порядок постов от этого не
+меняется, а рейтинг поста обновляется только при новых событиях.
+Числа хранятся в логарифмах, чтобы экспонента не переполнялась.
+
+События:
+- публикация поста, вес 1 + ln(1 + число подписчиков автора);
+- комментарий, вес 1 — чем больше свежих комментариев, тем выше пост.
+
+После смены TRENDING_HALF_LIFE_HOURS рейтинг нужно пересобрать:
+python manage.py rank_posts --rebuild.
+"""
+import math
+from collections import defaultdict
+from datetime import datetime
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from core.models import Cursor
+from posts.models import Comment, Post, User
+from .models import PostScore
+
+EPOCH = datetime(2020, 1, 1, tzinfo=timezone.utc)
+POSTS_CURSOR = "ranking:posts"
+COMMENTS_CURSOR = "ranking:comments"
+
+
+def log_weight(moment, weight=1):
+    """Логарифм вклада события с весом weight в момент moment."""
+    rate = math.log(2) / (settings.TRENDING_HALF_LIFE_HOURS * 3600)
+    return rate * (moment - EPOCH).total_seconds() + math.log(weight)
+
+
+def log_add(a, b):
+    """ln(e^a + e^b) без переполнения."""
+    high, low = max(a, b), min(a, b)
+    return high + math.log1p(math.exp(low - high))
+
+
+def initial_scores(post_ids):
+    """Рейтинги постов без комментариев: вклад самой публикации."""
+    posts = Post.objects.filter(pk__in=post_ids).values_list(
+        "pk", "author_id", "pub_date"
+    )
+    posts = list(posts)
+    followers = dict(
+        User.objects.filter(pk__in={author for _, author, _ in posts})
+        .annotate(followers=Count("following"))
+        .values_list("pk", "followers")
+    )
+    return [
+        PostScore(
+            post_id=pk,
+            score=log_weight(
+                pub_date, 1 + math.log1p(followers.get(author, 0))
+            ),
+        )
+        for pk, author, pub_date in posts
+    ]
+
+
+def score_new_posts(batch):
+    with transaction.atomic():
+        cursor = Cursor.acquire(POSTS_CURSOR)
+        post_ids = list(
+            Post.objects.filter(pk__gt=cursor.position)
+            .order_by("pk")
+            .values_list("pk", flat=True)[:batch]
+        )
+        if not post_ids:
+            return 0
+        # Пост мог получить рейтинг раньше — вместе с первым комментарием
+        PostScore.objects.bulk_create(
+            initial_scores(post_ids), ignore_conflicts=True
+        )
+        cursor.position = post_ids[-1]
+        cursor.save(update_fields=["position"])
+    return len(post_ids)
+
+
+def score_new_comments(batch):
+    with transaction.atomic():
+        cursor = Cursor.acquire(COMMENTS_CURSOR)
+        comments = list(
+            Comment.objects.filter(pk__gt=cursor.position)
+            .order_by("pk")
+            .values_list("pk", "post_id", "created")[:batch]
+        )
+        if not comments:
+            return 0
+        events = defaultdict(list)
+        for _, post_id, created in comments:
+            if post_id is not None:
+                events[post_id].append(log_weight(created))
+        scores = PostScore.objects.in_bulk(list(events))
+        missing = set(events) - set(scores)
+        if missing:
+            PostScore.objects.bulk_create(
+                initial_scores(missing), ignore_conflicts=True
+            )
+            scores = PostScore.objects.in_bulk(list(events))
+        for post_id, terms in events.items():
+            score = scores.get(post_id)
+            if score is None:
+                # Пост удален (мягко) до пересчета: рейтинг ему не нужен,
+                # а курсор должен пройти дальше его комментариев
+                continue
+            for term in terms:
+                score.score = log_add(score.score, term)
+            score.comments += len(terms)
+        PostScore.objects.bulk_update(
+            scores.values(), ["score", "comments"]
+        )
+        cursor.position = comments[-1][0]
+        cursor.save(update_fields=["position"])
+    return len(comments)
+
+
+def update_scores(batch=1000):
+    """Учитывает новые посты и комментарии.
+
+    Возвращает пару (учтено постов, учтено комментариев).
+    """
+    posts = comments = 0
+    while True:
+        done = score_new_posts(batch)
+        if not done:
+            break
+        posts += done
+    while True:
+        done = score_new_comments(batch)
+        if not done:
+            break
+        comments += done
+    return posts, comments
+
+
+def rebuild():
+    """Пересчитывает рейтинг с нуля."""
+    with transaction.atomic():
+        PostScore.objects.all().delete()
+        Cursor.objects.filter(
+            name__in=(POSTS_CURSOR, COMMENTS_CURSOR)
+        ).delete()
+    return update_scores()
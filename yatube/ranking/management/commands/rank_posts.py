@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from ranking.engine import rebuild, update_scores
+
+
+class Command(BaseCommand):
+    help = (
+        "Пересчитывает рейтинг популярных постов по новым событиям "
+        "(запускать по cron)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rebuild", action="store_true",
+            help="Пересчитать рейтинг всех постов с нуля.",
+        )
+
+    def handle(self, *args, **options):
+        posts, comments = rebuild() if options["rebuild"] else update_scores()
+        self.stdout.write(
+            f"Учтено постов: {posts}, комментариев: {comments}"
+        )
@@ -0,0 +1,31 @@
+from django.db import models
+
+from posts.models import Post
+
+
+class PostScore(models.Model):
+    """Рейтинг поста для вкладки «Популярное».
+
+    score хранится в логарифмической шкале относительно фиксированной
+    эпохи (см. ranking/engine.py): затухание одинаково для всех постов,
+    поэтому порядок по score не меняется со временем и список читается
+    прямо по индексу.
+    """
+
+    post = models.OneToOneField(
+        Post,
+        related_name="score",
+        on_delete=models.CASCADE,
+        primary_key=True,
+        verbose_name='Пост',
+    )
+    score = models.FloatField('Рейтинг', db_index=True)
+    comments = models.PositiveIntegerField('Учтено комментариев', default=0)
+
+    class Meta:
+        ordering = ["-score"]
+        verbose_name = 'Рейтинг поста'
+        verbose_name_plural = 'Рейтинги постов'
+
+    def __str__(self):
+        return f"{self.post_id}: {self.score:.2f}"
@@ -0,0 +1,127 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from posts.models import Comment, Follow, Post
+from posts.views import LENGTH
+from ..engine import rebuild, update_scores
+from ..models import PostScore
+
+User = get_user_model()
+
+
+class RankingTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='author')
+        cls.reader = User.objects.create_user(username='reader')
+        cls.quiet = Post.objects.create(author=cls.author, text='Тихий')
+        cls.discussed = Post.objects.create(author=cls.author, text='Спор')
+
+    def comment(self, post, ago=timedelta()):
+        comment = Comment.objects.create(
+            post=post, author=self.reader, text='!'
+        )
+        Comment.objects.filter(pk=comment.pk).update(
+            created=timezone.now() - ago
+        )
+
+    def ranked(self):
+        return list(PostScore.objects.values_list('post_id', flat=True))
+
+    def test_comments_raise_post(self):
+        """Пост с комментариями выше поста без них."""
+        Post.objects.filter(pk=self.discussed.pk).update(
+            pub_date=timezone.now() - timedelta(hours=1)
+        )
+        self.comment(self.discussed)
+        self.comment(self.discussed)
+        self.assertEqual(update_scores(), (2, 2))
+        self.assertEqual(self.ranked(), [self.discussed.pk, self.quiet.pk])
+
+    def test_old_comments_decay(self):
+        """Старые комментарии весят меньше свежих."""
+        for _ in range(3):
+            self.comment(self.quiet, ago=timedelta(days=3))
+        self.comment(self.discussed)
+        update_scores()
+        self.assertEqual(self.ranked()[0], self.discussed.pk)
+
+    def test_followers_boost_new_posts(self):
+        """Посты автора с подписчиками стартуют выше."""
+        star = User.objects.create_user(username='star')
+        Follow.objects.create(user=self.reader, author=star)
+        Post.objects.filter(pk__in=[self.quiet.pk, self.discussed.pk]).update(
+            pub_date=timezone.now()
+        )
+        post = Post.objects.create(author=star, text='Звезда')
+        Post.objects.filter(pk=post.pk).update(pub_date=timezone.now())
+        update_scores()
+        self.assertEqual(self.ranked()[0], post.pk)
+
+    def test_comment_on_deleted_post_skipped(self):
+        """Комментарий к посту, удаленному до пересчета, не останавливает
+        рейтинг."""
+        self.comment(self.quiet)
+        Post.all_objects.filter(pk=self.quiet.pk).update(
+            deleted_at=timezone.now()
+        )
+        self.assertEqual(update_scores(), (1, 1))
+        self.assertEqual(self.ranked(), [self.discussed.pk])
+        self.comment(self.discussed)
+        self.assertEqual(update_scores(), (0, 1))
+
+    def test_update_is_incremental(self):
+        """Повторный запуск учитывает только новые события."""
+        self.comment(self.quiet)
+        update_scores()
+        self.assertEqual(update_scores(), (0, 0))
+        self.comment(self.quiet)
+        self.assertEqual(update_scores(), (0, 1))
+        self.assertEqual(PostScore.objects.get(pk=self.quiet.pk).comments, 2)
+        score = PostScore.objects.get(pk=self.quiet.pk).score
+        rebuild()
+        self.assertAlmostEqual(
+            PostScore.objects.get(pk=self.quiet.pk).score, score
+        )
+
+    def test_popular_page(self):
+        """Вкладка «Популярное» выводит посты в порядке рейтинга."""
+        self.comment(self.quiet)
+        update_scores()
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('posts:popular'))
+        self.assertEqual(
+            [post.pk for post in response.context['posts']],
+            [self.quiet.pk, self.discussed.pk],
+        )
+        self.assertIsNone(response.context['next_page'])
+
+    def test_popular_pages_by_key(self):
+        """Следующая страница продолжает список после последнего поста
+        предыдущей, в том числе при равном рейтинге."""
+        PostScore.objects.bulk_create(
+            PostScore(post=post, score=1.5)
+            for post in Post.objects.bulk_create(
+                Post(author=self.author, text=str(number))
+                for number in range(LENGTH + 2)
+            )
+        )
+        seen = []
+        query = ''
+        while query is not None:
+            response = self.client.get(f"{reverse('posts:popular')}?{query}")
+            seen.extend(post.pk for post in response.context['posts'])
+            query = response.context['next_page']
+        self.assertEqual(len(seen), LENGTH + 2)
+        self.assertEqual(
+            seen,
+            list(
+                PostScore.objects.order_by('-score', '-post_id')
+                .values_list('post_id', flat=True)
+            ),
+        )
@@ -0,0 +1,12 @@
+from django.contrib import admin
+
+from .models import Recommendation
+
+
+class RecommendationAdmin(admin.ModelAdmin):
+    list_display = ("pk", "user", "author", "score", "rank")
+    search_fields = ("user__username",)
+    empty_value_display = "-пусто-"
+
+
+admin.site.register(Recommendation, RecommendationAdmin)
@@ -0,0 +1,45 @@
+import random
+import time
+from array import array
+
+from core.benchmark import BenchmarkResult, scenario
+from .engine import FollowGraph
+
+SAMPLE_USERS = 1000
+
+
+def random_graph(users, edges, seed=0):
+    """Граф подписок, где немногие авторы собирают большинство читателей."""
+    generator = random.Random(seed)
+    sources, targets = array("i"), array("i")
+    for _ in range(edges):
+        sources.append(generator.randrange(1, users + 1))
+        # Распределение Парето: у первых id больше всего подписчиков
+        author = int(generator.paretovariate(1.2)) % users + 1
+        targets.append(author)
+    return sources, targets
+
+
+@scenario("recommendations")
+def follow_recommendations(options):
+    """Построение графа подписок и рекомендации для SAMPLE_USERS случайных
+    пользователей; полное время пересчета экстраполируется."""
+    for users, edges in ((10000, 100000), (100000, 1000000),
+                         (200000, 3000000)):
+        sources, targets = random_graph(users, edges)
+        started = time.perf_counter()
+        graph = FollowGraph(sources, targets)
+        built = time.perf_counter() - started
+        sample = random.Random(1).sample(range(1, users + 1), SAMPLE_USERS)
+        timings = []
+        started = time.perf_counter()
+        for user in sample:
+            moment = time.perf_counter()
+            graph.recommend(user, 10)
+            timings.append(time.perf_counter() - moment)
+        result = BenchmarkResult(timings, time.perf_counter() - started)
+        result.extra = {
+            "граф": f"{built:.1f}с",
+            "все_пользователи": f"{result.mean_ms * users / 1000:.0f}с",
+        }
+        yield f"{edges} подписок, {users} пользователей", result
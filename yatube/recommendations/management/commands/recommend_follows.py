@@ -0,0 +1,23 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from recommendations.engine import update_recommendations
+
+
+class Command(BaseCommand):
+    help = (
+        "Пересчитывает рекомендации «на кого подписаться» "
+        "(запускать по cron)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch", type=int, default=1000,
+            help="Сколько пользователей сохранять за одну транзакцию.",
+        )
+
+    def handle(self, *args, **options):
+        users = update_recommendations(
+            settings.RECOMMENDATIONS_TOP, batch=options["batch"]
+        )
+        self.stdout.write(f"Пересчитано пользователей: {users}")
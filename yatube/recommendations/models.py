@@ -0,0 +1,42 @@
+from django.contrib.auth import get_user_model
+from django.db import models
+
+User = get_user_model()
+
+
+class Recommendation(models.Model):
+    """Автор, на которого стоит подписаться пользователю.
+
+    Таблица пересчитывается командой recommend_follows и хранит лучшие
+    RECOMMENDATIONS_TOP авторов для каждого пользователя.
+    """
+
+    user = models.ForeignKey(
+        User,
+        related_name="recommendations",
+        on_delete=models.CASCADE,
+        verbose_name='Пользователь',
+    )
+    author = models.ForeignKey(
+        User,
+        related_name="+",
+        on_delete=models.CASCADE,
+        verbose_name='Рекомендуемый автор',
+    )
+    score = models.FloatField('Оценка')
+    rank = models.PositiveSmallIntegerField('Место')
+
+    class Meta:
+        ordering = ["user", "rank"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "author"],
+                name="unique_recommendation"
+            ),
+        ]
+        indexes = [models.Index(fields=["user", "rank"])]
+        verbose_name = 'Рекомендация'
+        verbose_name_plural = 'Рекомендации'
+
+    def __str__(self):
+        return f"{self.user_id} -> {self.author_id}"
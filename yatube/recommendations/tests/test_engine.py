@@ -0,0 +1,76 @@
+from array import array
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+
+from posts.models import Follow
+from ..engine import FollowGraph, update_recommendations
+from ..models import Recommendation
+
+User = get_user_model()
+
+
+def graph(*edges):
+    return FollowGraph(
+        array('i', [user for user, _ in edges]),
+        array('i', [author for _, author in edges]),
+    )
+
+
+class FollowGraphTests(SimpleTestCase):
+    def test_adjacency_lists(self):
+        """Списки «кого читает» и «кто читает» строятся по ребрам."""
+        follows = graph((1, 2), (1, 3), (4, 2))
+        self.assertEqual(list(follows.following(1)), [2, 3])
+        self.assertEqual(list(follows.followers(2)), [1, 4])
+        self.assertEqual(list(follows.following(9)), [])
+        self.assertEqual(follows.users(), [1, 4])
+
+    def test_friends_of_friends_first(self):
+        """Друзья друзей выше, а уже прочитанные авторы исключены."""
+        follows = graph((1, 2), (2, 3), (2, 4), (5, 2), (5, 6), (1, 4))
+        # 3: путь через 2 (вес 2) и читатель 2 автора 4 (вес 1)
+        self.assertEqual(follows.recommend(1, 10), [(3, 3), (6, 1)])
+
+    def test_co_follow(self):
+        """Авторы, которых читают те же читатели, что и пользователь."""
+        follows = graph((1, 2), (3, 2), (3, 4))
+        self.assertEqual(follows.recommend(1, 10), [(4, 1)])
+
+
+class RecommendationViewTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.reader, cls.friend, cls.star = [
+            User.objects.create_user(username=name)
+            for name in ('reader', 'friend', 'star')
+        ]
+        Follow.objects.create(user=cls.reader, author=cls.friend)
+        Follow.objects.create(user=cls.friend, author=cls.star)
+
+    def test_recommendations_stored_and_shown(self):
+        """Рекомендации сохраняются и выводятся в ленте подписок."""
+        update_recommendations(top=10)
+        recommendation = Recommendation.objects.get(user=self.reader)
+        self.assertEqual(recommendation.author, self.star)
+        self.client.force_login(self.reader)
+        for url in (reverse('posts:follow_index'),
+                    reverse('posts:profile', args=('friend',))):
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(
+                    [item.author for item in response.context['recommended']],
+                    [self.star],
+                )
+        author = response.context['recommended'][0].author
+        self.assertIn('password', author.get_deferred_fields())
+
+    def test_followed_author_hidden(self):
+        """После подписки автор пропадает из рекомендаций."""
+        update_recommendations(top=10)
+        Follow.objects.create(user=self.reader, author=self.star)
+        self.client.force_login(self.reader)
+        response = self.client.get(reverse('posts:follow_index'))
+        self.assertFalse(response.context['recommended'])
@@ -0,0 +1,11 @@
+from django.apps import AppConfig
+from django.utils.module_loading import autodiscover_modules
+
+
+class TasksConfig(AppConfig):
+    name = "tasks"
+    verbose_name = "Фоновые задачи"
+
+    def ready(self):
+        # Задачи объявляются в модулях tasks.py приложений
+        autodiscover_modules("tasks")
@@ -0,0 +1,35 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from tasks.worker import run_pending
+
+
+class Command(BaseCommand):
+    help = "Воркер фоновых задач."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once", action="store_true",
+            help="Выполнить накопившиеся задачи и выйти.",
+        )
+        parser.add_argument(
+            "--sleep", type=float, default=1,
+            help="Пауза в секундах, когда очередь пуста.",
+        )
+        parser.add_argument(
+            "--batch", type=int, default=100,
+            help="Сколько задач забирать за раз.",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            done, failed = run_pending(options["batch"])
+            if done or failed:
+                self.stdout.write(
+                    f"Выполнено задач: {done}, с ошибкой: {failed}"
+                )
+                continue
+            if options["once"]:
+                return
+            time.sleep(options["sleep"])
@@ -0,0 +1,38 @@
+from django.db import models
+from django.utils import timezone
+
+
+class Task(models.Model):
+    QUEUED = "queued"
+    RUNNING = "running"
+    FAILED = "failed"
+    STATUS_CHOICES = (
+        (QUEUED, "В очереди"),
+        (RUNNING, "Выполняется"),
+        (FAILED, "Ошибка"),
+    )
+
+    name = models.CharField('Задача', max_length=200)
+    arguments = models.TextField('Аргументы', default="{}")
+    status = models.CharField(
+        'Статус', max_length=10, choices=STATUS_CHOICES, default=QUEUED
+    )
+    attempts = models.PositiveIntegerField('Попыток', default=0)
+    max_attempts = models.PositiveIntegerField('Максимум попыток', default=3)
+    run_at = models.DateTimeField(
+        'Запустить после',
+        default=timezone.now,
+        help_text='Для выполняющейся задачи — срок, после которого ее '
+                  'может забрать другой воркер',
+    )
+    last_error = models.TextField('Последняя ошибка', blank=True)
+    created = models.DateTimeField('Создана', auto_now_add=True)
+
+    class Meta:
+        ordering = ["run_at"]
+        indexes = [models.Index(fields=["status", "run_at"])]
+        verbose_name = 'Задача'
+        verbose_name_plural = 'Задачи'
+
+    def __str__(self):
+        return self.name
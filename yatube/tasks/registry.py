@@ -0,0 +1,54 @@
+"""Объявление фоновых задач.
+
+Функция с декоратором task ставится в очередь вызовом ``delay``: в базе
+появляется запись Task, а выполняет ее воркер ``manage.py run_tasks``.
+Аргументы должны сериализоваться в JSON. Запись создается в текущей
+транзакции, поэтому задача не увидит незакоммиченных данных и не
+потеряется при откате.
+"""
+import json
+
+from django.conf import settings
+
+from .models import Task
+
+REGISTRY = {}
+
+
+class TaskFunction:
+    def __init__(self, func, name, max_attempts, retry_delay):
+        self.func = func
+        self.name = name
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+
+    def __call__(self, *args, **kwargs):
+        return self.func(*args, **kwargs)
+
+    def delay(self, *args, **kwargs):
+        """Ставит задачу в очередь. В режиме TASKS_ALWAYS_EAGER
+        выполняет ее сразу."""
+        if settings.TASKS_ALWAYS_EAGER:
+            self.func(*args, **kwargs)
+            return None
+        return Task.objects.create(
+            name=self.name,
+            arguments=json.dumps({"args": args, "kwargs": kwargs}),
+            max_attempts=self.max_attempts,
+        )
+
+
+def task(name=None, max_attempts=3, retry_delay=30):
+    """Регистрирует функцию как фоновую задачу.
+
+    Неудачная попытка повторяется через retry_delay секунд, каждая
+    следующая — вдвое позже, пока не исчерпано max_attempts попыток.
+    """
+    def decorator(func):
+        task_name = name or f"{func.__module__}.{func.__name__}"
+        task_function = TaskFunction(
+            func, task_name, max_attempts, retry_delay
+        )
+        REGISTRY[task_name] = task_function
+        return task_function
+    return decorator
@@ -0,0 +1,92 @@
+from datetime import timedelta
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from ..models import Task
+from ..registry import task
+from ..worker import run_pending
+
+calls = []
+
+
+@task(name='tests.record')
+def record(value, suffix=''):
+    calls.append(f'{value}{suffix}')
+
+
+@task(name='tests.broken', max_attempts=2, retry_delay=10)
+def broken():
+    raise ValueError('сломалось')
+
+
+class TaskQueueTests(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_delay_enqueues_task(self):
+        """delay сохраняет задачу, а не выполняет ее."""
+        record.delay(1, suffix='!')
+        self.assertEqual(calls, [])
+        self.assertEqual(Task.objects.get().name, 'tests.record')
+
+    def test_worker_runs_and_removes_task(self):
+        """Воркер выполняет задачу и удаляет ее из очереди."""
+        record.delay(1, suffix='!')
+        self.assertEqual(run_pending(), (1, 0))
+        self.assertEqual(calls, ['1!'])
+        self.assertFalse(Task.objects.exists())
+
+    def test_future_task_waits(self):
+        """Задача с отложенным запуском ждет своего времени."""
+        task = record.delay(1)
+        Task.objects.filter(pk=task.pk).update(
+            run_at=timezone.now() + timedelta(minutes=1)
+        )
+        self.assertEqual(run_pending(), (0, 0))
+
+    def test_failed_task_retried_with_backoff(self):
+        """Упавшая задача повторяется позже, затем помечается ошибкой."""
+        task = broken.delay()
+        self.assertEqual(run_pending(), (0, 1))
+        task.refresh_from_db()
+        self.assertEqual(task.status, Task.QUEUED)
+        self.assertEqual(task.attempts, 1)
+        self.assertGreater(task.run_at, timezone.now())
+        self.assertIn('сломалось', task.last_error)
+        Task.objects.filter(pk=task.pk).update(run_at=timezone.now())
+        self.assertEqual(run_pending(), (0, 1))
+        task.refresh_from_db()
+        self.assertEqual(task.status, Task.FAILED)
+        self.assertEqual(run_pending(), (0, 0))
+
+    def test_running_task_not_taken_twice(self):
+        """Задачу, которую выполняет другой воркер, никто не забирает."""
+        task = record.delay(1)
+        Task.objects.filter(pk=task.pk).update(
+            status=Task.RUNNING,
+            run_at=timezone.now() + timedelta(minutes=5),
+        )
+        self.assertEqual(run_pending(), (0, 0))
+        Task.objects.filter(pk=task.pk).update(run_at=timezone.now())
+        self.assertEqual(run_pending(), (1, 0))
+
+    def test_abandoned_task_fails_after_max_attempts(self):
+        """Задачу, воркер которой пропадал на каждой попытке, больше не
+        забирают, а помечают ошибкой."""
+        task = record.delay(1)
+        Task.objects.filter(pk=task.pk).update(
+            status=Task.RUNNING, attempts=task.max_attempts,
+            run_at=timezone.now(),
+        )
+        self.assertEqual(run_pending(), (0, 1))
+        task.refresh_from_db()
+        self.assertEqual(task.status, Task.FAILED)
+        self.assertEqual(calls, [])
+
+    @override_settings(TASKS_ALWAYS_EAGER=True)
+    def test_eager_mode(self):
+        """В режиме TASKS_ALWAYS_EAGER задача выполняется сразу."""
+        record.delay(2)
+        self.assertEqual(calls, ['2'])
+        self.assertFalse(Task.objects.exists())
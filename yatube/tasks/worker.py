@@ -0,0 +1,93 @@
+import json
+import logging
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import F, Value
+from django.db.models.functions import Concat
+from django.utils import timezone
+
+from .models import Task
+from .registry import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+ABANDONED = "\nВоркер не завершил последнюю попытку до конца аренды.\n"
+
+
+def claim(task):
+    """Забирает задачу себе одним условным UPDATE.
+
+    Если задачу уже забрал другой воркер, строка не обновится. На время
+    выполнения run_at сдвигается на TASKS_LEASE_SECONDS: задачу упавшего
+    воркера после этого срока заберет другой, если попытки не исчерпаны.
+    """
+    lease = timezone.now() + timedelta(seconds=settings.TASKS_LEASE_SECONDS)
+    return Task.objects.filter(
+        pk=task.pk,
+        status=task.status,
+        attempts=task.attempts,
+        attempts__lt=F("max_attempts"),
+    ).update(status=Task.RUNNING, attempts=F("attempts") + 1, run_at=lease)
+
+
+def execute(task):
+    task_function = REGISTRY.get(task.name)
+    try:
+        if task_function is None:
+            raise LookupError(f"Задача {task.name} не зарегистрирована")
+        arguments = json.loads(task.arguments)
+        task_function(*arguments["args"], **arguments["kwargs"])
+    except Exception:
+        attempts = task.attempts + 1
+        error = traceback.format_exc()
+        logger.warning("Задача %s #%s упала", task.name, task.pk)
+        if task_function is None or attempts >= task.max_attempts:
+            status, run_at = Task.FAILED, timezone.now()
+        else:
+            delay = task_function.retry_delay * 2 ** (attempts - 1)
+            status = Task.QUEUED
+            run_at = timezone.now() + timedelta(seconds=delay)
+        Task.objects.filter(pk=task.pk).update(
+            status=status, run_at=run_at, last_error=error
+        )
+        return False
+    Task.objects.filter(pk=task.pk).delete()
+    return True
+
+
+def fail_abandoned():
+    """Помечает ошибкой задачи, чей воркер пропал на последней попытке.
+
+    Такая задача падает, не доходя до обработки ошибки в execute (воркер
+    убит, кончилась память), и без этого ее забирали бы снова и снова.
+    """
+    return Task.objects.filter(
+        status=Task.RUNNING,
+        run_at__lte=timezone.now(),
+        attempts__gte=F("max_attempts"),
+    ).update(
+        status=Task.FAILED,
+        last_error=Concat(F("last_error"), Value(ABANDONED)),
+    )
+
+
+def run_pending(limit=100):
+    """Выполняет до limit задач, срок которых наступил.
+
+    Возвращает пару (выполнено, с ошибкой).
+    """
+    done = 0
+    failed = fail_abandoned()
+    tasks = Task.objects.filter(
+        status__in=(Task.QUEUED, Task.RUNNING), run_at__lte=timezone.now()
+    )[:limit]
+    for task in tasks:
+        if not claim(task):
+            continue
+        if execute(task):
+            done += 1
+        else:
+            failed += 1
+    return done, failed
@@ -10,6 +10,8 @@ from django.contrib.auth.views import (
 )
 from django.urls import path
 
+from core.ratelimit import ratelimit
+
 from . import views
 
 app_name = "users"
@@ -22,7 +24,11 @@ urlpatterns = [
     ),
     # Полный адрес страницы регистрации - auth/signup/,
     # но префикс auth/ обрабатывется в головном urls.py
-    path("signup/", views.SignUp.as_view(), name="signup"),
+    path(
+        "signup/",
+        ratelimit("5/h")(views.SignUp.as_view()),
+        name="signup",
+    ),
     # Путь на вход пользователя
     path(
         "login/",
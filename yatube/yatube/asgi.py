@@ -0,0 +1,21 @@
+"""ASGI config for yatube project.
+
+Точка входа для ASGI-серверов (uvicorn, daphne, hypercorn):
+``uvicorn yatube.asgi:application``. Представления Django выполняются в
+пуле потоков core.asgi.AsgiHandler.
+"""
+
+import os
+
+from django.core.wsgi import get_wsgi_application
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "yatube.settings")
+
+django_application = get_wsgi_application()
+
+from core.asgi import AsgiHandler  # noqa: E402
+from core.warmup import warm_templates  # noqa: E402
+
+application = AsgiHandler(django_application)
+
+warm_templates()
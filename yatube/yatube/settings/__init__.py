@@ -0,0 +1,12 @@
+"""Настройки проекта.
+
+Профиль выбирается переменной окружения DJANGO_ENV: ``dev`` (по умолчанию)
+или ``prod``. Профиль можно указать и напрямую через
+DJANGO_SETTINGS_MODULE=yatube.settings.prod.
+"""
+import os
+
+if os.environ.get("DJANGO_ENV", "dev") == "prod":
+    from .prod import *  # noqa: F401,F403
+else:
+    from .dev import *  # noqa: F401,F403
@@ -0,0 +1,302 @@
+"""
+Django settings for yatube project.
+
+Общие настройки для всех окружений. Профили dev и prod дополняют их,
+значения, которые отличаются между серверами, берутся из переменных
+окружения.
+
+For more information on this file, see
+https://docs.djangoproject.com/en/2.2/topics/settings/
+
+For the full list of settings and their values, see
+https://docs.djangoproject.com/en/2.2/ref/settings/
+"""
+
+import os
+
+# Build paths inside the project like this: os.path.join(BASE_DIR, ...)
+BASE_DIR = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+
+
+def env_bool(name, default=False):
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.lower() in ("1", "true", "yes", "on")
+
+
+def env_int(name, default):
+    return int(os.environ.get(name, default))
+
+
+def env_list(name, default=()):
+    value = os.environ.get(name)
+    if value is None:
+        return list(default)
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def env_database(prefix, default_name):
+    """Описание базы из переменных PREFIX_ENGINE, PREFIX_NAME и т.д."""
+    return {
+        "ENGINE": os.environ.get(
+            f"{prefix}_ENGINE", "django.db.backends.sqlite3"
+        ),
+        "NAME": os.environ.get(f"{prefix}_NAME", default_name),
+        "USER": os.environ.get(f"{prefix}_USER", ""),
+        "PASSWORD": os.environ.get(f"{prefix}_PASSWORD", ""),
+        "HOST": os.environ.get(f"{prefix}_HOST", ""),
+        "PORT": os.environ.get(f"{prefix}_PORT", ""),
+        "CONN_MAX_AGE": env_int("DB_CONN_MAX_AGE", 0),
+    }
+
+
+# SECURITY WARNING: keep the secret key used in production secret!
+SECRET_KEY = os.environ.get("SECRET_KEY")
+
+# SECURITY WARNING: don't run with debug turned on in production!
+DEBUG = False
+
+ALLOWED_HOSTS = env_list("ALLOWED_HOSTS", (
+    'www.Rimir.pythonanywhere.com',
+    'Rimir.pythonanywhere.com',
+    'localhost',
+    '127.0.0.1',
+    '[::1]',
+    'testserver',
+))
+
+
+# Application definition
+# Практичнее регистрировать через конфиг: ведь тогда в apps.py можно будет
+# в любой момент добавить дополнительные настройки приложения. При регистрации
+# через имя такой возможности не будет.
+INSTALLED_APPS = [
+    "core.apps.CoreConfig",  # Регистрация приложения core
+    "posts.apps.PostsConfig",  # Регистрация приложения posts
+    "users.apps.UsersConfig",  # Регистрация приложения users
+    "about.apps.AboutConfig",  # Регистрация приложения about(статичные страницы)
+    "tasks.apps.TasksConfig",  # Фоновые задачи
+    "notifications.apps.NotificationsConfig",  # Уведомления по почте
+    "ranking.apps.RankingConfig",  # Рейтинг популярных постов
+    "recommendations.apps.RecommendationsConfig",  # На кого подписаться
+    "activity.apps.ActivityConfig",  # Статистика авторов
+    "django.contrib.admin",
+    "django.contrib.auth",  # Приложение для регистрация и авторизация пользователей
+    "django.contrib.contenttypes",
+    "django.contrib.sessions",
+    "django.contrib.messages",
+    "django.contrib.staticfiles",
+    'sorl.thumbnail',
+]
+
+MIDDLEWARE = [
+    "django.middleware.security.SecurityMiddleware",
+    "core.staticfiles.StaticFilesMiddleware",
+    "core.compression.CompressionMiddleware",
+    "core.middleware.ReplicaRoutingMiddleware",
+    "django.contrib.sessions.middleware.SessionMiddleware",
+    "django.middleware.common.CommonMiddleware",
+    "django.middleware.csrf.CsrfViewMiddleware",
+    "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "core.ratelimit.RateLimitMiddleware",
+    "django.contrib.messages.middleware.MessageMiddleware",
+    "django.middleware.clickjacking.XFrameOptionsMiddleware",
+]
+
+ROOT_URLCONF = "yatube.urls"
+
+TEMPLATES_DIR = os.path.join(BASE_DIR, "templates")
+
+TEMPLATES = [
+    {
+        # Шаблонизатор (DTL pr Jinja2)
+        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        # Добавлено: Искать шаблоны на уровне проекта
+        "DIRS": [TEMPLATES_DIR],
+        # Оставляем True: шаблоны встроенных приложений (например, админки)
+        # нужно искать в директориях приложений
+        "APP_DIRS": True,
+        "OPTIONS": {
+            "context_processors": [
+                "django.template.context_processors.debug",
+                "django.template.context_processors.request",
+                "django.contrib.auth.context_processors.auth",
+                "django.contrib.messages.context_processors.messages",
+                # Добавлен контекст-процессор
+                # Найди в корне проекта папку core/, в ней - папку context_processors/,
+                # там - файл year.py, а в этом файле - функцию year().
+                "core.context_processors.year.year",
+            ],
+        },
+    },
+]
+
+WSGI_APPLICATION = "yatube.wsgi.application"
+
+
+# Database
+# https://docs.djangoproject.com/en/2.2/ref/settings/#databases
+
+DATABASES = {
+    "default": env_database("DB", os.path.join(BASE_DIR, "db.sqlite3")),
+    # По умолчанию — локальная реплика для проверки маршрутизации чтения
+    "replica": env_database(
+        "DB_REPLICA", os.path.join(BASE_DIR, "db_replica.sqlite3")
+    ),
+}
+
+DATABASE_ROUTERS = ["core.routers.PrimaryReplicaRouter"]
+# Алиасы из DATABASES, в которые уходит чтение представлений read_only.
+# Пустой список — все запросы идут в основную базу.
+REPLICA_DATABASES = env_list("DB_REPLICAS")
+# Сколько секунд после записи пользователь читает из основной базы
+PRIMARY_PIN_SECONDS = env_int("PRIMARY_PIN_SECONDS", 10)
+# Пул постоянных соединений воркера (см. core/db.py): число потоков,
+# порог заполненности для предупреждения и проверка живости соединений
+DB_POOL_SIZE = env_int("DB_POOL_SIZE", 10)
+DB_POOL_WARN_SATURATION = 0.8
+DB_HEALTH_CHECKS = env_bool("DB_HEALTH_CHECKS")
+DB_HEALTH_CHECK_INTERVAL = env_int("DB_HEALTH_CHECK_INTERVAL", 30)
+
+
+# Password validation
+# https://docs.djangoproject.com/en/2.2/ref/settings/#auth-password-validators
+
+AUTH_PASSWORD_VALIDATORS = [
+    {
+        "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator",
+    },
+    {
+        "NAME": "django.contrib.auth.password_validation.MinimumLengthValidator",
+    },
+    {
+        "NAME": "django.contrib.auth.password_validation.CommonPasswordValidator",
+    },
+    {
+        "NAME": "django.contrib.auth.password_validation.NumericPasswordValidator",
+    },
+]
+
+
+# Internationalization
+# https://docs.djangoproject.com/en/2.2/topics/i18n/
+
+LANGUAGE_CODE = "ru"
+
+TIME_ZONE = "UTC"
+
+USE_I18N = True
+
+USE_L10N = True
+
+USE_TZ = True
+
+
+# Static files (CSS, JavaScript, Images)
+# https://docs.djangoproject.com/en/2.2/howto/static-files/
+MEDIA_URL = '/media/'
+MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+# Загрузки хранятся по хэшу содержимого (см. core/storage.py). Бэкенд
+# core.storage.S3Backend принимает bucket, base_url и endpoint_url
+DEFAULT_FILE_STORAGE = "core.storage.ContentAddressedStorage"
+MEDIA_BLOB_BACKEND = "core.storage.FileSystemBackend"
+MEDIA_BLOB_OPTIONS = {}
+# Загрузки пишутся во временный файл и обрезаются после
+# FILE_UPLOAD_MAX_SIZE байт (см. core/uploads.py); картинки больше
+# IMAGE_MAX_PIXELS отклоняются по заголовку (см. posts/images.py)
+FILE_UPLOAD_HANDLERS = ["core.uploads.BoundedUploadHandler"]
+FILE_UPLOAD_MAX_SIZE = 10 * 1024 * 1024
+IMAGE_MAX_PIXELS = 16_000_000
+# Превью sorl-thumbnail сохраняются под своими именами
+THUMBNAIL_STORAGE = "django.core.files.storage.FileSystemStorage"
+STATIC_URL = "/static/"
+
+STATICFILES_DIRS = [os.path.join(BASE_DIR, "static")]
+# Сюда собирает статику collectstatic; оттуда ее раздает
+# core.staticfiles.StaticFilesMiddleware. Файлы с хэшем в имени кэшируются
+# браузером на STATIC_MAX_AGE секунд
+STATIC_ROOT = os.path.join(BASE_DIR, "collected_static")
+STATIC_MAX_AGE = 365 * 24 * 60 * 60
+# какие страницы надо показывать пользователю после входа в аккаунт и при выходе из него
+# Значение по умолчанию: '/accounts/login/'
+# Это адрес, на который Django будет перенаправлять пользователей для авторизации.
+# Это особенно важно при использовании декоратора @login_required
+LOGIN_URL = "users:login"
+# Значение по умолчанию: '/accounts/profile/'
+# Здесь указывается, куда перенаправить пользователя после успешной авторизации
+LOGIN_REDIRECT_URL = "posts:index"
+# Значение по умолчанию: '/auth/logout/'
+# Адрес, на который будет направлен пользователь после выхода из системы.
+# Можно оставить штатный, а можно раскомментировать строку
+# LOGOUT_REDIRECT_URL = 'posts:index' — и при выходе из аккаунта пользователи
+# будут перенаправляться на главную страницу проекта.
+# LOGOUT_REDIRECT_URL = 'posts:index'
+LIMIT_POSTS: int = 10
+CUT_TEXT: int = 15
+
+# Подключите к проекту модуль filebased.EmailBackend:
+# он будет сохранять текст отправленных электронных писем в файлы в отдельную директорию
+# подключаем движок filebased.EmailBackend
+EMAIL_BACKEND = "django.core.mail.backends.filebased.EmailBackend"
+# указываем директорию, в которую будут складываться файлы писем
+EMAIL_FILE_PATH = os.path.join(BASE_DIR, "sent_emails")
+# Сводные письма с уведомлениями (см. notifications/digest.py): сколько
+# секунд ждать затишья в событиях и сколько максимум копить события
+NOTIFICATIONS_QUIET_SECONDS = 300
+NOTIFICATIONS_MAX_DELAY_SECONDS = 3600
+PER_PAGE_COUNT = 10
+CSRF_FAILURE_VIEW = 'core.views.csrf_failure'
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    # Общие части страниц, одинаковые для всех пользователей (шапка сайта):
+    # в памяти процесса, без похода в общий кэш
+    'chrome': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'chrome',
+    },
+}
+# Период полураспада вклада событий в рейтинг популярных постов, часы
+TRENDING_HALF_LIFE_HOURS = 12
+# Сколько рекомендаций «на кого подписаться» хранить для пользователя
+RECOMMENDATIONS_TOP = 10
+# Статистика авторов (см. activity/rollups.py): сколько дней хранить
+# часовые сводки и за сколько дней показывать дневные
+ACTIVITY_HOURLY_RETENTION_DAYS = 14
+ACTIVITY_STATS_DAYS = 30
+# Посты старше стольких месяцев команда archive_posts переносит в архив
+ARCHIVE_AFTER_MONTHS = 12
+# Страница поста с комментариями больше этого числа отдается потоком:
+# шапка и пост уходят клиенту до отрисовки комментариев (core/streaming.py)
+POST_DETAIL_STREAM_COMMENTS = 100
+# Сжатие ответов (см. core/compression.py): уровень gzip и минимальный
+# размер ответа в байтах
+GZIP_LEVEL = 6
+GZIP_MIN_LENGTH = 1024
+# Лимиты частоты запросов на запись (см. core/ratelimit.py). RATELIMITS
+# переопределяет лимиты из декораторов по имени маршрута, None отключает.
+# RATELIMIT_PROXY_COUNT — сколько доверенных прокси перед приложением:
+# IP клиента берется из X-Forwarded-For, а не из REMOTE_ADDR.
+# RATELIMIT_CACHE — кэш со счетчиками, его incr должен быть атомарным
+RATELIMIT_STORE = "core.ratelimit.CacheBucketStore"
+RATELIMIT_CACHE = "default"
+RATELIMITS = {}
+RATELIMIT_PROXY_COUNT = env_int("RATELIMIT_PROXY_COUNT", 0)
+# Брокер событий (см. core/pubsub.py) и параметры потока новых постов:
+# сколько секунд держать соединение и как часто слать keep-alive.
+# Каждый поток держит поток воркера, поэтому их не больше SSE_MAX_STREAMS
+# на процесс; остальные страницы раз в FOLLOW_POLL_SECONDS опрашивают
+# новые карточки
+PUBSUB_BACKEND = "core.pubsub.LocalBroker"
+SSE_STREAM_SECONDS = 55
+SSE_HEARTBEAT_SECONDS = 15
+SSE_MAX_STREAMS = env_int("SSE_MAX_STREAMS", 2)
+FOLLOW_POLL_SECONDS = 30
+# Фоновые задачи (см. tasks/registry.py): выполнять сразу, без очереди,
+# и сколько секунд задача закреплена за воркером
+TASKS_ALWAYS_EAGER = env_bool("TASKS_ALWAYS_EAGER")
+TASKS_LEASE_SECONDS = 300
@@ -0,0 +1,19 @@
+"""Настройки для разработки: отладка и debug toolbar."""
+import os
+
+from .base import *  # noqa: F401,F403
+from .base import INSTALLED_APPS, MIDDLEWARE, env_bool
+
+SECRET_KEY = os.environ.get(
+    "SECRET_KEY", "hf3g0^###z_4a&t2hfd!hiioksx4p&sbvfo)#)9nut8(wgf!=&"
+)
+
+DEBUG = env_bool("DEBUG", True)
+
+INSTALLED_APPS = INSTALLED_APPS + ['debug_toolbar']
+
+MIDDLEWARE = MIDDLEWARE + ['debug_toolbar.middleware.DebugToolbarMiddleware']
+
+INTERNAL_IPS = [
+    '127.0.0.1',
+]
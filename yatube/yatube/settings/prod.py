@@ -0,0 +1,91 @@
+"""Настройки боевого окружения.
+
+Без отладочных инструментов: DEBUG выключен, connection.queries не
+копится. Шаблоны компилируются один раз и хранятся в кэширующем
+загрузчике, соединения с базой живут между запросами и проверяются перед
+повторным использованием, кэш общий для всех воркеров. Статика собирается
+с хэшами в именах и отдается самим приложением.
+"""
+import copy
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+from .base import *  # noqa: F401,F403
+from .base import (
+    BASE_DIR, CACHES, DATABASES, TEMPLATES, env_bool, env_int,
+)
+
+SECRET_KEY = os.environ.get("SECRET_KEY")
+if not SECRET_KEY:
+    raise ImproperlyConfigured("Задайте переменную окружения SECRET_KEY.")
+
+DEBUG = False
+
+# Копии, а не правка на месте: иначе изменились бы и объекты модуля base
+DATABASES = copy.deepcopy(DATABASES)
+for database in DATABASES.values():
+    database["CONN_MAX_AGE"] = env_int("DB_CONN_MAX_AGE", 600)
+
+DB_POOL_SIZE = env_int("DB_POOL_SIZE", 8)
+DB_HEALTH_CHECKS = env_bool("DB_HEALTH_CHECKS", True)
+
+TEMPLATES = copy.deepcopy(TEMPLATES)
+TEMPLATES[0]["APP_DIRS"] = False
+TEMPLATES[0]["OPTIONS"]["loaders"] = [
+    ("django.template.loaders.cached.Loader", [
+        "django.template.loaders.filesystem.Loader",
+        "django.template.loaders.app_directories.Loader",
+    ]),
+]
+TEMPLATES[0]["OPTIONS"]["context_processors"].remove(
+    "django.template.context_processors.debug"
+)
+
+# Имена статики с хэшем содержимого и сжатые копии (см. core/staticfiles.py):
+# перед запуском выполните collectstatic
+STATICFILES_STORAGE = "core.staticfiles.CompressedManifestStaticFilesStorage"
+
+# Общий для воркеров кэш: по умолчанию файловый, для нескольких серверов
+# задайте, например, memcached через CACHE_BACKEND и CACHE_LOCATION.
+CACHES = {
+    "default": {
+        "BACKEND": os.environ.get(
+            "CACHE_BACKEND",
+            "django.core.cache.backends.filebased.FileBasedCache",
+        ),
+        "LOCATION": os.environ.get(
+            "CACHE_LOCATION", os.path.join(BASE_DIR, "cache")
+        ),
+    },
+    "chrome": CACHES["chrome"],
+}
+
+# Счетчики лимитов частоты (см. core/ratelimit.py) нужны в кэше с
+# атомарным incr, иначе одновременные запросы проходят сверх лимита.
+# Файловый кэш и кэш в базе увеличивают счетчик чтением и записью, поэтому
+# при таком общем кэше счетчики лежат в памяти процесса: лимит считается
+# каждым воркером отдельно. Общие счетчики — RATELIMIT_CACHE_BACKEND
+# (например, memcached) и RATELIMIT_CACHE_LOCATION.
+ATOMIC_CACHE_BACKENDS = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.memcached.MemcachedCache",
+    "django.core.cache.backends.memcached.PyLibMCCache",
+    "django_redis.cache.RedisCache",
+)
+if CACHES["default"]["BACKEND"] in ATOMIC_CACHE_BACKENDS:
+    RATELIMIT_CACHE = "default"
+else:
+    RATELIMIT_CACHE = "ratelimit"
+    CACHES["ratelimit"] = {
+        "BACKEND": os.environ.get(
+            "RATELIMIT_CACHE_BACKEND",
+            "django.core.cache.backends.locmem.LocMemCache",
+        ),
+        "LOCATION": os.environ.get("RATELIMIT_CACHE_LOCATION", "ratelimit"),
+    }
+if CACHES[RATELIMIT_CACHE]["BACKEND"] not in ATOMIC_CACHE_BACKENDS:
+    raise ImproperlyConfigured(
+        "RATELIMIT_CACHE_BACKEND должен увеличивать счетчики атомарно: "
+        + ", ".join(ATOMIC_CACHE_BACKENDS)
+    )
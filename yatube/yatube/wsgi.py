@@ -15,3 +15,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "yatube.settings")
 
 application = get_wsgi_application()
+
+# Шаблоны компилируются при старте воркера, а не на первых запросах
+from core.warmup import warm_templates  # noqa: E402
+
+warm_templates()